@@ -0,0 +1,81 @@
+"""Benchmark the per-await overhead of context changes in coroutines.
+
+Compares awaiting a coroutine, that sets and resets a bare ContextVar, with
+awaiting coroutines decorated by a frozen context change, and with coroutines
+using `with context(...)` and `async with context(...)`.
+
+The decorator validates and freezes the change once, when the function is
+decorated. A `with` or `async with` block creates (and validates) a new
+ContextChange every time it is entered, which is most of its cost; entering
+it asynchronously only adds awaiting __aenter__ and __aexit__. Use decorators
+(or `context.compile`) on hot coroutines.
+
+Usage: python benchmarks/bench_async_context.py [NUMBER_OF_AWAITS]
+"""
+import asyncio
+import sys
+from contextvars import ContextVar
+from time import perf_counter
+
+from loggingex.context import context
+
+VARIABLE = ContextVar("bench")
+
+
+async def bare_contextvar():
+    token = VARIABLE.set({"component": "db"})
+    try:
+        return 1
+    finally:
+        VARIABLE.reset(token)
+
+
+@context.compile(component="db")
+async def decorated():
+    return 1
+
+
+async def sync_with():
+    with context(component="db"):
+        return 1
+
+
+async def async_with():
+    async with context(component="db"):
+        return 1
+
+
+async def measure(coroutine_function, number: int) -> float:
+    start = perf_counter()
+    for _ in range(number):
+        await coroutine_function()
+    return perf_counter() - start
+
+
+async def run_all(number: int):
+    baseline = await measure(bare_contextvar, number)
+    print("bare ContextVar: %.3f us/await" % (baseline / number * 1e6))
+    for name, func in (
+        ("decorator", decorated),
+        ("with", sync_with),
+        ("async with", async_with),
+    ):
+        elapsed = await measure(func, number)
+        overhead = elapsed - baseline
+        print(
+            "%s: %.3f us/await (%.3f us over bare ContextVar)"
+            % (name, elapsed / number * 1e6, overhead / number * 1e6)
+        )
+
+
+def main(number: int = 200000):
+    print("awaits per run: %d" % number)
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(run_all(number))
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
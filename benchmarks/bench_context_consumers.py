@@ -0,0 +1,57 @@
+"""Benchmark context changes, when nothing consumes the context.
+
+A batch worker logs at WARNING, with a LoggingContextFilter registered as a
+consumer of DEBUG records, within a job context of 30 variables. Compares
+`with context(...)` and frozen context changes with consumer tracking
+disabled (changes are applied) and enabled (changes are deferred).
+
+Usage: python benchmarks/bench_context_consumers.py [NUMBER_OF_CHANGES]
+"""
+import logging
+import sys
+from time import perf_counter
+
+from loggingex.context import LoggingContextFilter, consumers, context
+
+log = logging.getLogger("worker")
+frozen = context.compile(job="bench", item=1)
+
+
+def with_context(number: int):
+    for index in range(number):
+        with context(job="bench", item=index):
+            log.debug("processing item")
+
+
+def with_frozen(number: int):
+    start, stop = frozen.start, frozen.stop
+    for _ in range(number):
+        token = start()
+        log.debug("processing item")
+        stop(token)
+
+
+JOB_CONTEXT = {"job_%d" % i: "value %d" % i for i in range(30)}
+
+
+def main(number: int = 1000000):
+    log.setLevel(logging.WARNING)
+    context_filter = LoggingContextFilter()
+    log.addFilter(context_filter)
+    consumers.register_consumer(context_filter, log, logging.DEBUG)
+    print("context changes per run: %d" % number)
+    for name, func in (("with context", with_context), ("frozen", with_frozen)):
+        for tracking in (False, True):
+            consumers.enable_tracking(tracking)
+            with context(**JOB_CONTEXT):
+                start = perf_counter()
+                func(number)
+                elapsed = perf_counter() - start
+            print(
+                "%s (tracking %s): %.3f us/change"
+                % (name, "on" if tracking else "off", elapsed / number * 1e6)
+            )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,86 @@
+"""Benchmark ContextExporter and ContextImporter against JSON.
+
+Simulates requests, that send TASKS tasks each to a task queue, with their
+logging context (request info, a few headers, user and tracing identifiers).
+Every task carries the exported context, that the consumer restores as a
+ContextChange:
+
+* json - json.dumps of the context, json.loads and ContextChange;
+* export - ContextExporter and ContextImporter.
+
+Reports the time per task (export and import) and the payload size. Run with
+TASKS=1 to measure contexts, that are exported only once.
+
+Usage: python benchmarks/bench_context_export.py [REQUESTS] [TASKS]
+"""
+import json
+import sys
+from time import perf_counter
+
+from loggingex.context import ContextChange, ContextExporter, ContextImporter
+
+
+def make_context(num: int) -> dict:
+    return {
+        "request_method": "POST",
+        "request_scheme": "https",
+        "request_path_info": "/api/v1/orders/%d/items" % num,
+        "request_query_string": "expand=product&limit=50",
+        "request_server_name": "api.example.com",
+        "request_server_port": "443",
+        "header_user_agent": "Mozilla/5.0 (X11; Linux x86_64) Firefox/115.0",
+        "header_accept": "application/json",
+        "header_x_request_id": "9f1c0d6e3b2a4f5e8d7c6b5a%08x" % num,
+        "user_id": 184467 + num,
+        "tenant": "acme",
+        "trace_id": "4bf92f3577b34da6a3ce929d%08x" % num,
+        "span_id": "00f067aa0ba902b7",
+        "sampled": True,
+        "retry": 0,
+    }
+
+
+def json_export(context: dict) -> str:
+    return json.dumps(context)
+
+
+def json_import(data: str) -> ContextChange:
+    return ContextChange(context_update=json.loads(data))
+
+
+def run(name: str, export, load, contexts: list, tasks: int):
+    payloads = []
+    start = perf_counter()
+    for context in contexts:
+        for _ in range(tasks):
+            payloads.append(export(context))
+    exported = perf_counter() - start
+    start = perf_counter()
+    for payload in payloads:
+        load(payload)
+    imported = perf_counter() - start
+
+    change = load(export(contexts[0]))
+    assert change.context_update == contexts[0]
+    number = len(payloads)
+    print(
+        "%s: export %.2f us, import %.2f us per task, %d bytes"
+        % (
+            name,
+            exported / number * 1e6,
+            imported / number * 1e6,
+            len(payloads[0].encode("utf-8")),
+        )
+    )
+
+
+def main(requests: int = 10000, tasks: int = 10):
+    print("requests: %d, tasks per request: %d" % (requests, tasks))
+    contexts = [make_context(i) for i in range(requests)]
+    run("json", json_export, json_import, contexts, tasks)
+    exporter, importer = ContextExporter(), ContextImporter()
+    run("export", exporter.export, importer.load, contexts, tasks)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,66 @@
+"""Benchmark the per-record cost of LoggingContextFilter.
+
+Compares the current filter (with the per-context injection plan cache)
+against the original implementation, that walked the whole context and
+called setattr for every variable, on every record.
+
+Every call gets a fresh record (the filter skips records, that already have
+the context injected). Records are created in batches, outside of the timed
+loop, so only the filter calls are measured.
+
+Usage: python benchmarks/bench_context_filter.py [NUMBER_OF_RECORDS]
+"""
+import sys
+from logging import DEBUG, LogRecord
+from time import perf_counter
+
+from loggingex.context import ContextStore, LoggingContextFilter, context
+from loggingex.context.filter import IGNORED_VARIABLE_NAMES
+
+CONTEXT_SIZES = (1, 10, 30)
+BATCH_SIZE = 1000
+
+
+class UncachedLoggingContextFilter:
+    """The original LoggingContextFilter implementation."""
+
+    def filter(self, record):  # noqa: A003
+        context = ContextStore().get()
+        for name, value in context.items():
+            if name not in IGNORED_VARIABLE_NAMES:
+                setattr(record, name, value)
+        return 1
+
+
+def make_record() -> LogRecord:
+    return LogRecord("bench", DEBUG, "bench.py", 1, "message %d", (1,), None)
+
+
+def bench(context_filter, number: int) -> float:
+    filter_record = context_filter.filter
+    total = 0.0
+    for start in range(0, number, BATCH_SIZE):
+        count = min(BATCH_SIZE, number - start)
+        records = [make_record() for _ in range(count)]
+        began = perf_counter()
+        for record in records:
+            filter_record(record)
+        total += perf_counter() - began
+    return total
+
+
+def main(number: int = 200000):
+    print("records per run: %d" % number)
+    for size in CONTEXT_SIZES:
+        variables = {"variable_%d" % i: "value %d" % i for i in range(size)}
+        with context(**variables):
+            before = bench(UncachedLoggingContextFilter(), number)
+            after = bench(LoggingContextFilter(), number)
+        print(
+            "%3d variables: before %.3f us/record, after %.3f us/record"
+            % (size, before / number * 1e6, after / number * 1e6)
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
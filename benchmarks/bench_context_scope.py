@@ -0,0 +1,54 @@
+"""Benchmark per-iteration context rebinding in tight loops.
+
+Compares entering and exiting `with context(current_line=...)` for every
+item with rebinding the variable in a single `context.scope()`, and with
+`context.iterate`.
+
+Usage: python benchmarks/bench_context_scope.py [NUMBER_OF_ITERATIONS]
+"""
+import sys
+from operator import itemgetter
+from time import perf_counter
+
+from loggingex.context import context
+
+
+def with_context(number: int):
+    for index in range(number):
+        with context(current_line=index + 1):
+            pass
+
+
+def with_scope(number: int):
+    with context.scope() as scope:
+        for index in range(number):
+            scope.set(current_line=index + 1)
+
+
+def with_iterate(number: int):
+    items = enumerate(range(number), 1)
+    for _ in context.iterate(items, current_line=itemgetter(0)):
+        pass
+
+
+def measure(func, number: int) -> float:
+    start = perf_counter()
+    with context(current_file="bench.txt", user="bench", request_id="1"):
+        func(number)
+    return perf_counter() - start
+
+
+def main(number: int = 1000000):
+    print("iterations per run: %d" % number)
+    baseline = measure(with_context, number)
+    print("with context(...): %.3f us/iteration" % (baseline / number * 1e6))
+    for name, func in (("scope.set", with_scope), ("iterate", with_iterate)):
+        elapsed = measure(func, number)
+        print(
+            "%s: %.3f us/iteration (%.1fx faster)"
+            % (name, elapsed / number * 1e6, baseline / elapsed)
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
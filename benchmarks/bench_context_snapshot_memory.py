@@ -0,0 +1,52 @@
+"""Benchmark memory retained by log records for both context filter modes.
+
+Creates records the same way a MemoryHandler or QueueHandler would retain
+them, and reports how many bytes each retained record costs, when context
+variables are injected as separate attributes, and when a single shared
+ContextSnapshot is injected instead.
+
+Usage: python benchmarks/bench_context_snapshot_memory.py [NUMBER_OF_RECORDS]
+"""
+import sys
+import tracemalloc
+from logging import DEBUG, LogRecord
+
+from loggingex.context import LoggingContextFilter, context
+
+CONTEXT_SIZES = (5, 30)
+
+
+def retained_bytes_per_record(context_filter, number: int) -> float:
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        records = []
+        for i in range(number):
+            record = LogRecord("bench", DEBUG, "b.py", 1, "msg %d", (i,), None)
+            context_filter.filter(record)
+            records.append(record)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (after - before) / number
+
+
+def main(number: int = 10000):
+    print("retained records: %d" % number)
+    for size in CONTEXT_SIZES:
+        variables = {"variable_%d" % i: "value %d" % i for i in range(size)}
+        with context(**variables):
+            attributes = retained_bytes_per_record(
+                LoggingContextFilter(), number
+            )
+            snapshot = retained_bytes_per_record(
+                LoggingContextFilter(snapshot_attribute="context"), number
+            )
+        print(
+            "%3d variables: attributes %.0f bytes/record, "
+            "snapshot %.0f bytes/record" % (size, attributes, snapshot)
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,62 @@
+"""Benchmark per-task overhead of ContextThreadPoolExecutor.
+
+Submits no-op tasks (within a logging context of 20 variables) to:
+
+* a bare ThreadPoolExecutor;
+* a ThreadPoolExecutor, with each task wrapped in contextvars.copy_context;
+* ContextThreadPoolExecutor.
+
+Reports the time needed to submit the tasks and to run all of them.
+
+Usage: python benchmarks/bench_executor.py [NUMBER]
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextvars import copy_context
+from time import perf_counter
+
+from loggingex.context import ContextThreadPoolExecutor, context
+
+VARIABLES = {"var%02d" % i: "value-%d" % i for i in range(20)}
+
+
+def task():
+    pass
+
+
+def submit_plain(executor, number: int) -> list:
+    return [executor.submit(task) for _ in range(number)]
+
+
+def submit_copy_context(executor, number: int) -> list:
+    return [executor.submit(copy_context().run, task) for _ in range(number)]
+
+
+def run(name: str, executor_class, submit, number: int):
+    with executor_class(max_workers=4) as executor:
+        with context(**VARIABLES):
+            start = perf_counter()
+            futures = submit(executor, number)
+            submitted = perf_counter() - start
+            wait(futures)
+            elapsed = perf_counter() - start
+    print(
+        "%s: submit %.2f us per task, total %.2f us per task"
+        % (name, submitted / number * 1e6, elapsed / number * 1e6)
+    )
+
+
+def main(number: int = 100000):
+    print("tasks: %d" % number)
+    run("ThreadPoolExecutor", ThreadPoolExecutor, submit_plain, number)
+    run("copy_context", ThreadPoolExecutor, submit_copy_context, number)
+    run(
+        "ContextThreadPoolExecutor",
+        ContextThreadPoolExecutor,
+        submit_plain,
+        number,
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,104 @@
+"""Benchmark the per-resume overhead of context changes in generators.
+
+Runs a three stage generator pipeline over a stream of items, with plain
+generators, with generators decorated by a context change (which run in their
+own Context), and with a naive wrapper, that starts and stops the change
+around every resume.
+
+Usage: python benchmarks/bench_generator_context.py [NUMBER_OF_ITEMS]
+"""
+import sys
+from functools import wraps
+from time import perf_counter
+
+from loggingex.context import context
+
+
+class NaiveContextGenerator:
+    """Generator wrapper, that starts and stops the change on every resume."""
+
+    def __init__(self, change, gen):
+        self.change = change
+        self.gen = gen
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        token = self.change.start()
+        try:
+            return next(self.gen)
+        finally:
+            self.change.stop(token)
+
+
+def naive_context(**kwargs):
+    change = context(**kwargs).freeze()
+
+    def decorator(func):
+        return wraps(func)(lambda *a: NaiveContextGenerator(change, func(*a)))
+
+    return decorator
+
+
+def plain(**kwargs):
+    return lambda func: func
+
+
+def parse(items):
+    for item in items:
+        yield item * 2
+
+
+def keep(items):
+    for item in items:
+        if item % 3:
+            yield item
+
+
+def render(items):
+    for item in items:
+        yield item + 1
+
+
+def make_pipeline(decorator):
+    stages = (
+        decorator(stage="parse")(parse),
+        decorator(stage="filter")(keep),
+        decorator(stage="format")(render),
+    )
+
+    def pipeline(items):
+        for stage in stages:
+            items = stage(items)
+        return items
+
+    return pipeline
+
+
+def measure(pipeline, number: int) -> float:
+    start = perf_counter()
+    with context(request_id="bench", user="bench"):
+        for _ in pipeline(range(number)):
+            pass
+    return perf_counter() - start
+
+
+def main(number: int = 1000000):
+    print("items per run: %d" % number)
+    baseline = measure(make_pipeline(plain), number)
+    print("plain generators: %.3f us/item" % (baseline / number * 1e6))
+    for name, decorator in (
+        ("decorated", context),
+        ("naive start/stop", naive_context),
+    ):
+        elapsed = measure(make_pipeline(decorator), number)
+        overhead = elapsed - baseline
+        print(
+            "%s: %.3f us/item (%.3f us over plain generators)"
+            % (name, elapsed / number * 1e6, overhead / number * 1e6)
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,66 @@
+"""Benchmark JsonFormatter against json.dumps of the record dictionary.
+
+Formats records, that were injected with a logging context of 10 variables:
+
+* with json.dumps(record.__dict__, default=str);
+* with JsonFormatter (using the default encoder);
+* with JsonFormatter.format_batch, in batches of 100 records.
+
+Usage: python benchmarks/bench_json_formatter.py [NUMBER]
+"""
+import json
+import logging
+import sys
+from time import perf_counter
+
+from loggingex.context import LoggingContextFilter, context
+from loggingex.formatters import JsonFormatter
+
+BATCH = 100
+VARIABLES = {"var%d" % i: "value-%d" % i for i in range(10)}
+
+
+def make_records(number: int) -> list:
+    log_filter = LoggingContextFilter()
+    records = []
+    with context(**VARIABLES):
+        for i in range(number):
+            record = logging.LogRecord(
+                "bench", logging.INFO, __file__, 1, "item %d", (i,), None
+            )
+            log_filter.filter(record)
+            records.append(record)
+    return records
+
+
+def dumps_record_dict(record: logging.LogRecord) -> str:
+    record.message = record.getMessage()
+    return json.dumps(record.__dict__, default=str)
+
+
+def report(name: str, number: int, elapsed: float):
+    print("%s: %.0f records/s" % (name, number / elapsed))
+
+
+def main(number: int = 100000):
+    records = make_records(number)
+
+    start = perf_counter()
+    for record in records:
+        dumps_record_dict(record)
+    report("json.dumps(record.__dict__)", number, perf_counter() - start)
+
+    formatter = JsonFormatter()
+    start = perf_counter()
+    for record in records:
+        formatter.format(record)
+    report("JsonFormatter.format", number, perf_counter() - start)
+
+    start = perf_counter()
+    for i in range(0, number, BATCH):
+        formatter.format_batch(records[i:i + BATCH])
+    report("JsonFormatter.format_batch", number, perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
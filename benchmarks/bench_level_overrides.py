@@ -0,0 +1,43 @@
+"""Benchmark rejected DEBUG calls of a logger with context level overrides.
+
+The logger level is WARNING, and a rule enables DEBUG records for a single
+tenant. Compares `log.debug` calls of a plain logger with calls of a logger
+with the overrides installed, within a context of another tenant (the calls
+are rejected by isEnabledFor in both cases).
+
+Usage: python benchmarks/bench_level_overrides.py [NUMBER_OF_CALLS]
+"""
+import logging
+import sys
+from time import perf_counter
+
+from loggingex.context import ContextLevelOverrides, context
+
+
+def measure(log: logging.Logger, number: int) -> float:
+    start = perf_counter()
+    with context(tenant="other", request_id="1"):
+        for _ in range(number):
+            log.debug("rejected %s", "record")
+    return perf_counter() - start
+
+
+def main(number: int = 1000000):
+    plain = logging.getLogger("plain")
+    plain.setLevel(logging.WARNING)
+    overridden = logging.getLogger("overridden")
+    overridden.setLevel(logging.WARNING)
+    ContextLevelOverrides({("tenant", "acme"): "DEBUG"}).install(overridden)
+
+    print("calls per run: %d" % number)
+    baseline = measure(plain, number)
+    print("plain logger: %.3f us/call" % (baseline / number * 1e6))
+    elapsed = measure(overridden, number)
+    print(
+        "overridden logger: %.3f us/call (%.3f us over plain logger)"
+        % (elapsed / number * 1e6, (elapsed - baseline) / number * 1e6)
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
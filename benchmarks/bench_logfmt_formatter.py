@@ -0,0 +1,64 @@
+"""Benchmark LogfmtFormatter against re-rendering the context per record.
+
+Formats records, that were injected with a logging context of 20 variables:
+
+* with a logging.Formatter, that has all 20 variables in its format string;
+* with a formatter, that renders the context key=value pairs per record;
+* with LogfmtFormatter, that renders the context once per snapshot.
+
+Usage: python benchmarks/bench_logfmt_formatter.py [NUMBER]
+"""
+import logging
+import sys
+from time import perf_counter
+
+from loggingex.context import LoggingContextFilter, context
+from loggingex.formatters import LogfmtFormatter
+
+FIELDS = {"level": "levelname", "msg": "message"}
+VARIABLES = {"var%02d" % i: "value %d" % i for i in range(20)}
+
+
+class UncachedLogfmtFormatter(LogfmtFormatter):
+    def get_context_segment(self, record: logging.LogRecord) -> str:
+        return self.render_context(record._loggingex_context)
+
+
+def make_records(number: int) -> list:
+    log_filter = LoggingContextFilter()
+    records = []
+    with context(**VARIABLES):
+        for i in range(number):
+            record = logging.LogRecord(
+                "bench", logging.INFO, __file__, 1, "item %d", (i,), None
+            )
+            log_filter.filter(record)
+            records.append(record)
+    return records
+
+
+def run(name: str, formatter: logging.Formatter, records: list):
+    start = perf_counter()
+    for record in records:
+        formatter.format(record)
+    elapsed = perf_counter() - start
+    print(
+        "%s: %.0f records/s, %.2f us per record"
+        % (name, len(records) / elapsed, elapsed / len(records) * 1e6)
+    )
+
+
+def main(number: int = 1000000):
+    print("context variables: %d, records: %d" % (len(VARIABLES), number))
+    records = make_records(number)
+
+    fmt = "level=%(levelname)s msg=%(message)s " + " ".join(
+        "%s=%%(%s)s" % (name, name) for name in VARIABLES
+    )
+    run("logging.Formatter", logging.Formatter(fmt), records)
+    run("uncached logfmt", UncachedLogfmtFormatter(FIELDS), records)
+    run("LogfmtFormatter", LogfmtFormatter(FIELDS), records)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
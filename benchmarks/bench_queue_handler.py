@@ -0,0 +1,97 @@
+"""Benchmark throughput and enqueue latency of ContextQueueHandler.
+
+Several request threads log records (within a logging context) through:
+
+* a FileHandler, that is called directly;
+* the standard QueueHandler and QueueListener pair;
+* ContextQueueHandler and ContextQueueListener pair.
+
+Reports the throughput (including the time needed to drain the queue) and the
+median and 99th percentile latency of logging calls in request threads.
+
+Usage: python benchmarks/bench_queue_handler.py [RECORDS_PER_THREAD]
+"""
+import logging
+import os
+import sys
+import tempfile
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
+from threading import Thread
+from time import perf_counter
+
+from loggingex.context import LoggingContextFilter, context
+from loggingex.handlers import ContextQueueHandler, ContextQueueListener
+
+THREADS = 4
+FORMAT = "%(asctime)s %(user)s %(request_id)s %(levelname)s %(message)s"
+
+
+def make_file_handler(path: str) -> logging.Handler:
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter(FORMAT))
+    handler.addFilter(LoggingContextFilter())
+    return handler
+
+
+def request_thread(logger, number: int, num: int, latencies: list):
+    with context(user="user-%d" % num, request_id=num):
+        for i in range(number):
+            start = perf_counter()
+            logger.info("processing item %d", i)
+            latencies.append(perf_counter() - start)
+
+
+def run(name: str, handler, listener, number: int):
+    logger = logging.getLogger("bench.%s" % name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    latencies = []
+    threads = [
+        Thread(target=request_thread, args=(logger, number, i, latencies))
+        for i in range(THREADS)
+    ]
+    if listener:
+        listener.start()
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if listener:
+        listener.stop()
+    elapsed = perf_counter() - start
+    logger.removeHandler(handler)
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(
+        "%s: %.0f records/s, enqueue p50 %.1f us, p99 %.1f us"
+        % (name, len(latencies) / elapsed, p50 * 1e6, p99 * 1e6)
+    )
+
+
+def main(number: int = 20000):
+    print("threads: %d, records per thread: %d" % (THREADS, number))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.log")
+
+        run("direct FileHandler", make_file_handler(path), None, number)
+
+        queue = Queue()
+        target = make_file_handler(path)
+        handler = QueueHandler(queue)
+        handler.addFilter(LoggingContextFilter())
+        run("QueueHandler", handler, QueueListener(queue, target), number)
+
+        queue = Queue(maxsize=THREADS * number)
+        target = make_file_handler(path)
+        handler = ContextQueueHandler(queue)
+        listener = ContextQueueListener(queue, target)
+        run("ContextQueueHandler", handler, listener, number)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,40 @@
+"""Benchmark request id generation.
+
+Generates request ids with:
+
+* str(uuid.uuid4());
+* uuid.uuid4().hex;
+* loggingex.propagation.generate_request_id.
+
+Usage: python benchmarks/bench_request_id.py [NUMBER]
+"""
+import sys
+import uuid
+from timeit import timeit
+
+from loggingex.propagation import generate_request_id
+
+
+def uuid4_str() -> str:
+    return str(uuid.uuid4())
+
+
+def uuid4_hex() -> str:
+    return uuid.uuid4().hex
+
+
+def main(number: int = 1000000):
+    for name, func in (
+        ("str(uuid4())", uuid4_str),
+        ("uuid4().hex", uuid4_hex),
+        ("generate_request_id", generate_request_id),
+    ):
+        elapsed = timeit(func, number=number)
+        print(
+            "%s: %.3f us per id, e.g. %r"
+            % (name, elapsed / number * 1e6, func())
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,67 @@
+"""Benchmark the per-request cost of WSGI request context extraction.
+
+Extracts the logging context from a realistic environ (30 headers, including
+a large cookie and an authorization header) with all headers, with a header
+denylist and with a header allowlist - both with eagerly and with lazily
+calculated request URIs.
+
+Usage: python benchmarks/bench_wsgi_context.py [NUMBER_OF_REQUESTS]
+"""
+import sys
+from functools import partial
+from timeit import timeit
+
+from loggingex.wsgi.util import get_wsgi_request_context
+
+INCLUDE = frozenset({"User-Agent", "X-Request-ID", "X-Forwarded-For"})
+EXCLUDE = frozenset({"Cookie", "Authorization"})
+
+
+def make_environ():
+    environ = {
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "https",
+        "wsgi.multiprocess": False,
+        "wsgi.multithread": True,
+        "wsgi.run_once": False,
+        "REQUEST_METHOD": "GET",
+        "SCRIPT_NAME": "/app",
+        "PATH_INFO": "/api/v1/users/1337/orders",
+        "QUERY_STRING": "page=2&sort=created&filter=a%20b",
+        "SERVER_NAME": "backend",
+        "SERVER_PORT": "8000",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "CONTENT_TYPE": "",
+        "CONTENT_LENGTH": "",
+        "HTTP_HOST": "example.io",
+        "HTTP_USER_AGENT": "Mozilla/5.0 (X11; Linux x86_64) Benchmark/1.0",
+        "HTTP_X_REQUEST_ID": "1a2a3a4a5a6a7a8a",
+        "HTTP_X_FORWARDED_FOR": "111.222.112.221",
+        "HTTP_COOKIE": "; ".join("c%d=%s" % (i, "x" * 64) for i in range(20)),
+        "HTTP_AUTHORIZATION": "Bearer " + "t" * 512,
+    }
+    for i in range(24):
+        environ["HTTP_X_CUSTOM_HEADER_%d" % i] = "value %d" % i
+    return environ
+
+
+def main(number: int = 50000):
+    environ = make_environ()
+    print("requests per run: %d" % number)
+    settings = (
+        ("all headers", {}),
+        ("denylist", {"exclude_headers": EXCLUDE}),
+        ("allowlist", {"include_headers": INCLUDE}),
+    )
+    for name, kwargs in settings:
+        for lazy_uri in (False, True):
+            extract = partial(
+                get_wsgi_request_context, environ, lazy_uri=lazy_uri, **kwargs
+            )
+            elapsed = timeit(extract, number=number) / number
+            mode = "lazy" if lazy_uri else "eager"
+            print("%s (%s uri): %.3f us/request" % (name, mode, elapsed * 1e6))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
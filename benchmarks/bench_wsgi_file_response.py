@@ -0,0 +1,83 @@
+"""Benchmark serving a large file through RequestContextMiddleware.
+
+Serves a file (returned as wsgi.file_wrapper) with the wsgiref reference
+server, from:
+
+* the bare application;
+* the application wrapped in a generator middleware, that re-yields every
+  chunk within a context (the way RequestContextMiddleware used to work);
+* the application wrapped in RequestContextMiddleware.
+
+Usage: python benchmarks/bench_wsgi_file_response.py [SIZE_MB] [REQUESTS]
+"""
+import os
+import sys
+import tempfile
+from threading import Thread
+from time import perf_counter
+from urllib.request import urlopen
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+from loggingex.context import context
+from loggingex.wsgi import RequestContextMiddleware
+from loggingex.wsgi.util import get_wsgi_request_context
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class GeneratorMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        with context(**get_wsgi_request_context(environ)):
+            for chunk in self.app(environ, start_response):
+                yield chunk
+
+
+def make_file_app(path: str):
+    def app(environ, start_response):
+        size = str(os.path.getsize(path))
+        start_response("200 OK", [("Content-Length", size)])
+        return environ["wsgi.file_wrapper"](open(path, "rb"), 65536)
+
+    return app
+
+
+def run(name: str, app, size: int, requests: int):
+    server = make_server("127.0.0.1", 0, app, handler_class=QuietHandler)
+    thread = Thread(target=server.serve_forever, args=(0.01,))
+    thread.start()
+    url = "http://127.0.0.1:%d/" % server.server_port
+    try:
+        start = perf_counter()
+        for _ in range(requests):
+            with urlopen(url) as response:
+                while response.read(1 << 20):
+                    pass
+        elapsed = perf_counter() - start
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+    print("%s: %.0f MB/s" % (name, size * requests / elapsed / (1 << 20)))
+
+
+def main(size_mb: int = 64, requests: int = 10):
+    size = size_mb << 20
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "large.bin")
+        with open(path, "wb") as f:
+            f.write(os.urandom(size))
+        app = make_file_app(path)
+        run("bare application", app, size, requests)
+        run("generator middleware", GeneratorMiddleware(app), size, requests)
+        app = RequestContextMiddleware(app)
+        run("RequestContextMiddleware", app, size, requests)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
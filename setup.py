@@ -2,7 +2,15 @@ import os
 
 import setuptools
 
-PACKAGES = ["loggingex", "loggingex.context", "loggingex.wsgi"]
+PACKAGES = [
+    "loggingex",
+    "loggingex.asgi",
+    "loggingex.context",
+    "loggingex.formatters",
+    "loggingex.handlers",
+    "loggingex.propagation",
+    "loggingex.wsgi",
+]
 
 
 def main():
@@ -0,0 +1,4 @@
+"""Defines various logging utilities for ASGI applications."""
+from .request_context import RequestContextMiddleware
+
+__all__ = ("RequestContextMiddleware",)
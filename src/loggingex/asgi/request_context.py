@@ -0,0 +1,102 @@
+"""Defines an ASGI request context middleware."""
+from typing import Optional
+
+from .util import ASGI_REQUEST_SCOPE_TYPES, get_asgi_request_context
+from ..context import context
+from ..propagation.request_id import (
+    REQUEST_ID_HEADER,
+    REQUEST_ID_NAME,
+    generate_request_id,
+    is_valid_request_id,
+)
+
+
+class RequestContextMiddleware:
+    """ASGI middleware, that adds ASGI scope information to logging context.
+
+    This is the ASGI counterpart of `loggingex.wsgi.RequestContextMiddleware`
+    and is meant to be used together with the `LoggingContextFilter`.
+
+    The whole `await app(scope, receive, send)` call - including all receive
+    and send calls made by the application - runs within a single
+    `loggingex.context.context` scope, where it sets configured information
+    extracted from `scope` argument in the context. Connections, that are not
+    HTTP requests or websockets (such as "lifespan"), are passed through to
+    the application as they are.
+
+    :param app: ASGI application to be wrapped by this middleware.
+    :param headers: Include request headers in the context.
+    :param asgi_info: Include ASGI information in the context.
+    :param trace_context: Parse W3C traceparent and tracestate headers into
+        `trace_id`, `span_id`, `trace_flags` and `trace_state` variables.
+    :param request_id: Set `request_id` variable - to the value of the
+        inbound request id header (if it is valid), or to a new unique id.
+    :param request_id_header: Name of the request id header (None to never
+        reuse inbound request ids).
+    :param echo_request_id: Add the request id header to the response (if
+        the application does not set it).
+    """
+
+    def __init__(
+        self,
+        app,
+        headers: bool = True,
+        asgi_info: bool = False,
+        trace_context: bool = False,
+        request_id: bool = False,
+        request_id_header: Optional[str] = REQUEST_ID_HEADER,
+        echo_request_id: bool = False,
+    ):
+        self.app = app
+        self.headers = headers
+        self.asgi_info = asgi_info
+        self.trace_context = trace_context
+        self.request_id = request_id
+        self.request_id_header = request_id_header
+        self.request_id_header_name = (
+            request_id_header or REQUEST_ID_HEADER
+        ).lower().encode("latin-1")
+        self.echo_request_id = echo_request_id
+
+    def get_request_id(self, scope) -> str:
+        """Return inbound request id, if it is valid, or a new unique id."""
+        if self.request_id_header:
+            name = self.request_id_header_name
+            values = [v for k, v in scope.get("headers", ()) if k == name]
+            if len(values) == 1:
+                request_id = values[0].decode("latin-1")
+                if is_valid_request_id(request_id):
+                    return request_id
+        return generate_request_id()
+
+    def echo_request_id_header(self, send, request_id: str):
+        """Wrap send, so that it adds the request id response header."""
+        header = (self.request_id_header_name, request_id.encode("latin-1"))
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                if all(k.lower() != header[0] for k, _ in headers):
+                    headers.append(header)
+                    message = dict(message, headers=headers)
+            await send(message)
+
+        return send_with_request_id
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ASGI_REQUEST_SCOPE_TYPES:
+            return await self.app(scope, receive, send)
+
+        request_context = get_asgi_request_context(
+            scope,
+            headers=self.headers,
+            asgi_info=self.asgi_info,
+            trace_context=self.trace_context,
+        )
+        if self.request_id:
+            request_id = self.get_request_id(scope)
+            request_context[REQUEST_ID_NAME] = request_id
+            if self.echo_request_id:
+                send = self.echo_request_id_header(send, request_id)
+        async with context(**request_context):
+            return await self.app(scope, receive, send)
@@ -0,0 +1,146 @@
+"""Defines information extraction from ASGI connection scope functions."""
+from functools import lru_cache
+from typing import Any, AnyStr, Mapping, Optional
+
+from ..context.change import ContextType
+from ..propagation.trace_context import get_trace_context
+from ..wsgi.util import unicode
+
+ScopeType = Mapping[AnyStr, Any]
+
+ASGI_REQUEST_SCOPE_TYPES = ("http", "websocket")
+
+
+def get_asgi_info(scope: ScopeType) -> ContextType:
+    """Extract logging context friendly ASGI information.
+
+    The values are added with "asgi_" prefix: "asgi_version",
+    "asgi_spec_version" (both taken from `scope["asgi"]`) and "asgi_type"
+    (connection type, i.e. "http" or "websocket").
+
+    :param scope: ASGI connection scope (as it is passed to ASGI application).
+    :return: A logging context friendly mapping of ASGI information.
+    """
+    asgi = scope.get("asgi") or {}
+    asgi_info = {
+        "asgi_version": unicode(asgi.get("version", "2.0")),
+        "asgi_spec_version": unicode(asgi.get("spec_version", "2.0")),
+        "asgi_type": unicode(scope["type"]),
+    }
+    return asgi_info
+
+
+def get_request_info(scope: ScopeType) -> ContextType:
+    """Extract logging context friendly request and server information.
+
+    The names in the resulting dictionary are the same as the names used by
+    `loggingex.wsgi.util.get_request_info` for the equivalent WSGI values
+    ("request_script_name" is the ASGI "root_path", "request_server_name"
+    and "request_server_port" are taken from "server" and so on), plus the
+    "request_scheme" value. Values, that are missing from the scope, are set
+    to empty strings.
+
+    :param scope: ASGI connection scope (as it is passed to ASGI application).
+    :return: A logging context friendly mapping of request and server
+        information.
+    """
+    server = scope.get("server") or ("", "")
+    request_info = {
+        "request_method": unicode(scope.get("method", "")),
+        "request_scheme": unicode(scope.get("scheme", "")),
+        "request_script_name": unicode(scope.get("root_path", "")),
+        "request_path_info": unicode(scope["path"]),
+        "request_query_string": unicode(scope.get("query_string", b"")),
+        "request_server_name": unicode(server[0]),
+        "request_server_port": unicode(server[1]),
+        "request_server_protocol": "HTTP/%s" % scope.get("http_version", ""),
+    }
+    return request_info
+
+
+@lru_cache(maxsize=512)
+def get_header_context_name(name: bytes) -> Optional[str]:
+    """Return logging context variable name for given raw ASGI header name.
+
+    ASGI header names are lowercase byte strings. They are decoded, "-" is
+    replaced with "_" and "header_" prefix is added, so that the resulting
+    names match the names used by `loggingex.wsgi.util.get_request_headers`.
+
+    :param name: raw ASGI header name.
+    :return: context variable name, or None, if the header name can not be
+        converted into a valid context variable name.
+    """
+    context_name = "header_" + name.decode("latin-1").replace("-", "_")
+    if not context_name.isidentifier():
+        return None
+    return context_name
+
+
+def get_request_headers(scope: ScopeType) -> ContextType:
+    """Extract logging context friendly request headers.
+
+    Headers are decoded straight from the raw `scope["headers"]` pairs.
+    Repeated headers are joined with "," (the same way WSGI servers do it).
+
+    :param scope: ASGI connection scope (as it is passed to ASGI application).
+    :return: A logging context friendly mapping of request headers.
+    """
+    request_headers = {}
+
+    for name, value in scope.get("headers", ()):
+        key = get_header_context_name(bytes(name))
+        if key is None:
+            continue
+        value = value.decode("latin-1")
+        if key in request_headers:
+            value = request_headers[key] + "," + value
+        request_headers[key] = value
+
+    return request_headers
+
+
+def get_request_trace_context(scope: ScopeType) -> ContextType:
+    """Extract trace context from traceparent and tracestate headers.
+
+    See `loggingex.propagation.get_trace_context`.
+
+    :param scope: ASGI connection scope (as it is passed to ASGI application).
+    :return: A logging context friendly mapping of trace context values.
+    """
+    values = {b"traceparent": [], b"tracestate": []}
+    for name, value in scope.get("headers", ()):
+        if name in values:
+            values[name].append(value.decode("latin-1"))
+    traceparent = values[b"traceparent"]
+    return get_trace_context(
+        traceparent[0] if len(traceparent) == 1 else None,
+        ",".join(values[b"tracestate"]),
+    )
+
+
+def get_asgi_request_context(
+    scope: ScopeType,
+    headers: bool = True,
+    asgi_info: bool = False,
+    trace_context: bool = False,
+) -> ContextType:
+    """Extract logging context friendly information from ASGI scope mapping.
+
+    This function wraps `get_request_info`, `get_request_headers` and
+    `get_asgi_info` functions, the same way
+    `loggingex.wsgi.util.get_wsgi_request_context` does.
+
+    :param scope: ASGI connection scope (as it is passed to ASGI application).
+    :param headers: Include request header information in the result.
+    :param asgi_info: Include ASGI information in the result.
+    :param trace_context: Include parsed trace context in the result.
+    :return: A logging context friendly mapping of values.
+    """
+    request_context = get_request_info(scope)
+    if headers:
+        request_context.update(get_request_headers(scope))
+    if asgi_info:
+        request_context.update(get_asgi_info(scope))
+    if trace_context:
+        request_context.update(get_request_trace_context(scope))
+    return request_context
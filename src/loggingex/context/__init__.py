@@ -5,16 +5,37 @@ LoggingContextFilter is class that you need to add to your loggers or handlers.
 The context helper is function that you can use anywhere in your code to quickly
 put value into the logging context.
 """
+from . import consumers
 from .change import ContextChange
 from .exceptions import (
     ContextChangeAlreadyStartedException,
     ContextChangeNotStartedException,
     ContextException,
+    ContextImportException,
     ContextInvalidNameException,
 )
+from .executor import (
+    ContextProcessPoolExecutor,
+    ContextThread,
+    ContextThreadPoolExecutor,
+    with_current_context,
+)
+from .factory import LoggingContextRecordFactory
 from .filter import LoggingContextFilter
+from .frozen import FrozenContextChange
+from .lazy import LazyValue
+from .levels import ContextLevelOverrides
+from .map import ContextMap
+from .scope import ContextScope
 from .shortcuts import context
+from .snapshot import ContextSnapshot
 from .store import ContextStore
+from .transport import (
+    ContextExporter,
+    ContextImporter,
+    export_context,
+    import_context,
+)
 
 
 __all__ = (
@@ -22,11 +43,28 @@ __all__ = (
     "ContextChangeAlreadyStartedException",
     "ContextChangeNotStartedException",
     "ContextException",
+    "ContextImportException",
     "ContextInvalidNameException",
     # internal-ish classes
     "ContextStore",
     "ContextChange",
+    "ContextExporter",
+    "ContextImporter",
+    "ContextMap",
+    "ContextScope",
+    "ContextSnapshot",
+    "FrozenContextChange",
+    "LazyValue",
     # public api
+    "ContextLevelOverrides",
+    "ContextProcessPoolExecutor",
+    "ContextThread",
+    "ContextThreadPoolExecutor",
     "LoggingContextFilter",
+    "LoggingContextRecordFactory",
+    "consumers",
     "context",
+    "export_context",
+    "import_context",
+    "with_current_context",
 )
@@ -1,16 +1,19 @@
 """Defines ContextChange class."""
 from contextvars import Token
-from functools import partial, wraps
-from itertools import chain
-from operator import contains
-from typing import Any, AnyStr, Iterable, Optional, Set
+from functools import partial
+from typing import AbstractSet, Any, AnyStr, Iterable, Optional, Set
 
+from .consumers import DeferredContext, is_consumed
 from .exceptions import (
     ContextChangeAlreadyStartedException,
     ContextChangeNotStartedException,
     ContextInvalidNameException,
 )
+from .frozen import FrozenContextChange
+from .lazy import LazyValue, renew_values
+from .map import ContextMap
 from .store import ContextStore, ContextType
+from .wrappers import ResumedChange, get_resumer
 
 ContextUpdateType = ContextType
 ContextRemoveType = Set[AnyStr]
@@ -18,6 +21,34 @@ ContextVariableUnvalidatedName = Any
 ContextVariableUnvalidatedNames = Iterable[ContextVariableUnvalidatedName]
 
 
+def apply_change(
+    context: ContextType,
+    fresh: bool,
+    remove: AbstractSet[AnyStr],
+    update: ContextUpdateType,
+) -> ContextType:
+    """Return given context with changes applied (see ContextChange.apply).
+
+    :param context: initial context dictionary.
+    :param fresh: ignore given context (and remove).
+    :param remove: names to be removed.
+    :param update: name=value mapping of values to be set.
+    :return: changed context dictionary.
+    """
+    if ContextStore.is_persistent():
+        return ContextMap.from_mapping(context).evolve(
+            fresh, frozenset(remove), dict(update)
+        )
+    if fresh:
+        return dict(update)
+    if remove:
+        context = {k: v for k, v in context.items() if k not in remove}
+    else:
+        context = dict(context)
+    context.update(update)
+    return context
+
+
 class ContextChange:
     """Represents an atomic context change.
 
@@ -27,12 +58,17 @@ class ContextChange:
     Actual context change does not happen until start method is called.
 
     Context is restored, when stop method is called.
+
+    Lazy variables (see LazyValue) are renewed every time a stopped change is
+    started again, so that every scope resolves its own values.
     """
 
     context_fresh = False  # type: bool
     context_remove = None  # type: ContextRemoveType
     context_update = None  # type: ContextUpdateType
     context_restore_token = None  # type: Optional[Token]
+    # set, when the change is stopped (see start)
+    _stopped = False  # type: bool
 
     def __init__(
         self,
@@ -41,16 +77,13 @@ class ContextChange:
         context_update: ContextUpdateType = None,
         context_restore_token: Token = None,
     ):
+        # names are validated here, instead of calling remove and update,
+        # because a change is created for every with and async with block
+        self.validate_context_variable_names(context_remove or ())
+        self.validate_context_variable_names(context_update or {})
         self.context_fresh = context_fresh
-        self.context_remove = set()
-        self.context_update = {}
-
-        self.context_restore_token = None  # needed for validation
-        if context_remove:
-            self.remove(*context_remove)
-        if context_update:
-            self.update(**context_update)
-
+        self.context_remove = set(context_remove or ())
+        self.context_update = dict(context_update or {})
         self.context_restore_token = context_restore_token
 
     def __str__(self) -> str:
@@ -144,7 +177,8 @@ class ContextChange:
         """
         self.can_change(raise_on_fail=True)
         self.validate_context_variable_names(context_remove)
-        self.context_remove.update(context_remove)
+        # replaced, not modified, so that deferred contexts can share it
+        self.context_remove = self.context_remove.union(context_remove)
         return self
 
     def update(self, **context_update) -> "ContextChange":
@@ -155,9 +189,25 @@ class ContextChange:
         """
         self.can_change(raise_on_fail=True)
         self.validate_context_variable_names(context_update.keys())
-        self.context_update.update(context_update)
+        # replaced, not modified, so that deferred contexts can share it
+        update = dict(self.context_update)
+        update.update(context_update)
+        self.context_update = update
         return self
 
+    def lazy(self, **context_update) -> "ContextChange":
+        """Add lazy variable updates to the ContextChange.
+
+        Values are callables without arguments, that are called only when the
+        variable is read by a context consumer (see LazyValue).
+
+        :param context_update: variable value factories.
+        :return: self (so that calls can be chained).
+        """
+        return self.update(
+            **{k: LazyValue(v) for k, v in context_update.items()}
+        )
+
     def apply(self, context: ContextType) -> ContextType:
         """Return given context with changes applied.
 
@@ -166,30 +216,57 @@ class ContextChange:
         context first, then updated will be applied.
 
         Note: context dictionary will not be modified - new dictionary will be
-        constructed instead.
+        constructed instead. If ContextStore is in persistent mode, a new
+        ContextMap, that shares structure with given context, is returned.
+
+        Lazy variables are renewed (as in FrozenContextChange.apply).
 
         :param context: initial context dictionary.
         :return: changed context dictionary.
         """
-        context = context.items()
-        if self.context_fresh:
-            context = []
-        elif self.context_remove:
-            checker = partial(contains, self.context_remove)
-            context = ((k, v) for k, v in context if not checker(k))
-        if self.context_update:
-            context = chain(context, self.context_update.items())
-        return dict(context)
+        return apply_change(
+            context,
+            self.context_fresh,
+            self.context_remove,
+            renew_values(self.context_update),
+        )
 
     def start(self) -> None:
-        """Apply context change to the global logging context store."""
+        """Apply context change to the global logging context store.
+
+        The change is deferred, if nothing consumes the context (see
+        `loggingex.context.consumers`).
+        """
         if self.started:
             raise ContextChangeAlreadyStartedException(
                 "Context change already started"
             )
-        context_store = ContextStore()
-        context = self.apply(context_store.get())
-        self.context_restore_token = context_store.replace(context)
+        update = self.context_update
+        if self._stopped:
+            # lazy values of the previous scope may be resolved already (a
+            # change is usually started once, so it is not scanned then)
+            update = renew_values(update)
+        # remove and update are replaced (and never modified) by later
+        # modifications, so they are shared without copying
+        apply = partial(
+            apply_change,
+            fresh=self.context_fresh,
+            remove=self.context_remove,
+            update=update,
+        )
+        resumer = get_resumer()
+        if resumer is not None:
+            self.context_restore_token = resumer.push(apply)
+            return
+        # the variable is used directly (as in FrozenContextChange), because
+        # with and async with blocks start and stop a change on every use
+        variable = ContextStore.variable()
+        context = variable.get(ContextStore.empty_context())
+        if is_consumed():
+            context = apply(context)
+        else:
+            context = DeferredContext(apply, context)
+        self.context_restore_token = variable.set(context)
 
     def stop(self) -> None:
         """Restore global logging context store to previous state."""
@@ -197,9 +274,13 @@ class ContextChange:
             raise ContextChangeNotStartedException(
                 "Context change has not been started"
             )
-        context_store = ContextStore()
-        context_store.restore(self.context_restore_token)
+        token = self.context_restore_token
+        if isinstance(token, ResumedChange):
+            token.stop()
+        else:
+            ContextStore.variable().reset(token)
         self.context_restore_token = None
+        self._stopped = True
 
     def __enter__(self) -> "ContextChange":
         """Allow ContextChange to be used as context manager.
@@ -224,23 +305,51 @@ class ContextChange:
         self.stop()
         return False
 
-    def __call__(self, func):  # noqa: D202
+    async def __aenter__(self) -> "ContextChange":
+        """Allow ContextChange to be used as asynchronous context manager.
+
+        This simply calls start method and returns self.
+
+        :return: self.
+        """
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+        """Allow ContextChange to be used as asynchronous context manager.
+
+        This simply calls stop method and returns False.
+
+        :param exc_type: Exception type.
+        :param exc_val: Exception value.
+        :param exc_tb: Exception traceback.
+        :return: False
+        """
+        self.stop()
+        return False
+
+    def freeze(self) -> FrozenContextChange:
+        """Return an immutable template of this context change.
+
+        The names were already validated when they were added to this change,
+        so the template is created without validating them again. Changing
+        this ContextChange later does not affect the returned template.
+
+        :return: new FrozenContextChange object.
+        """
+        return FrozenContextChange.from_validated(
+            self.context_fresh, self.context_remove, self.context_update
+        )
+
+    def __call__(self, func):
         """Allow ContextChange to be used as function decorator.
 
+        The change is frozen when the function is decorated, so that calls of
+        the decorated function do not validate or copy it again (and so that
+        the decorated function can be called recursively or concurrently).
+        https://github.com/open-things/loggingex/issues/8
+
         :param func: A callable to decorated.
         :return: Decorated callable.
         """
-
-        @wraps(func)
-        def decorated(*args, **kwargs):
-            # copy self and the apply it
-            # https://github.com/open-things/loggingex/issues/8
-            context_change = ContextChange(
-                context_fresh=self.context_fresh,
-                context_remove=self.context_remove,
-                context_update=self.context_update,
-            )
-            with context_change:
-                return func(*args, **kwargs)
-
-        return decorated
+        return self.freeze()(func)
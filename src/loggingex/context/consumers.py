@@ -0,0 +1,186 @@
+"""Defines an opt-in registry of context consumers, and DeferredContext.
+
+Context changes are only worth applying, when something reads the context.
+When consumer tracking is enabled (see `enable_tracking`), context changes
+are applied eagerly only if at least one registered consumer is active -
+consumers registered without a logger are always active, consumers
+registered with a logger are active while the logger is enabled for their
+level. Otherwise, `ContextChange.start` and `FrozenContextChange.start` store
+a DeferredContext, that applies the change when (and only if) the context is
+read.
+
+Deferring never changes what is read - records, that are emitted while no
+consumer is active (for example, WARNING records of a logger, whose consumer
+reads DEBUG records), and records emitted after a consumer appears, carry
+the same context as they would without tracking. Tracking only decides, which
+work may be left undone.
+
+LoggingContextFilter objects (and therefore LoggingContextRecordFactory
+objects) register themselves as consumers of DEBUG records of the root
+logger, when they are created - register them again with the logger (and
+level) they are attached to. Consumers are referenced weakly, so they are
+unregistered, when they are garbage collected.
+"""
+from collections.abc import Mapping
+from logging import DEBUG, Logger
+from threading import RLock
+from typing import Any, AnyStr, Callable, Dict, Iterator, Optional, Tuple
+from weakref import ref
+
+from .store import ContextType
+
+_tracking = False
+_consumers = {}  # type: Dict[ref, Tuple[Optional[Logger], int]]
+
+# precomputed from _consumers, so that is_consumed does not walk weak refs:
+# True if a consumer without a logger is registered, and (logger, level) of
+# the other consumers
+_always = False
+_checks = ()  # type: Tuple[Tuple[Logger, int], ...]
+
+# deferred contexts are shared by threads (see `loggingex.context.executor`),
+# and each is resolved only once, so a single (reentrant, because parents are
+# resolved first) lock is enough
+_resolve_lock = RLock()
+
+
+def _update_checks() -> None:
+    global _always, _checks
+    entries = list(_consumers.values())
+    _always = any(logger is None for logger, _ in entries)
+    _checks = tuple(entry for entry in entries if entry[0] is not None)
+
+
+def _remove_reference(reference: ref) -> None:
+    _consumers.pop(reference, None)
+    _update_checks()
+
+
+def is_tracking() -> bool:
+    """Return True if consumer tracking is enabled."""
+    return _tracking
+
+
+def enable_tracking(value: bool = True) -> None:
+    """Enable or disable consumer tracking.
+
+    :param value: True to skip context changes, while no registered consumer
+        is active, False to always apply them.
+    """
+    global _tracking
+    _tracking = value
+
+
+def register_consumer(
+    consumer: Any, logger: Optional[Logger] = None, level: int = DEBUG
+) -> None:
+    """Register a context consumer (or change its logger and level).
+
+    :param consumer: object, that reads the context (it must be weakly
+        referable).
+    :param logger: consumer is active only while this logger is enabled for
+        level (always active, if None).
+    :param level: lowest level of records, the consumer reads the context for.
+    """
+    _consumers.pop(ref(consumer), None)
+    _consumers[ref(consumer, _remove_reference)] = (logger, level)
+    _update_checks()
+
+
+def unregister_consumer(consumer: Any) -> None:
+    """Unregister a context consumer (does nothing, if it is not registered).
+
+    :param consumer: registered consumer.
+    """
+    _consumers.pop(ref(consumer), None)
+    _update_checks()
+
+
+def clear_consumers() -> None:
+    """Unregister all context consumers."""
+    _consumers.clear()
+    _update_checks()
+
+
+def is_consumed() -> bool:
+    """Return True if context changes should be applied.
+
+    :return: True if consumer tracking is disabled, or at least one registered
+        consumer is active, False otherwise.
+    """
+    if not _tracking or _always:
+        return True
+    for logger, level in _checks:
+        if logger.isEnabledFor(level):
+            return True
+    return False
+
+
+class DeferredContext(Mapping):
+    """Context, that applies a context change, when it is first read.
+
+    The change is applied only once, even if the context is read by multiple
+    threads at the same time.
+
+    :param apply: function, that applies the change to a context.
+    :param parent: context, the change is applied to.
+    """
+
+    __slots__ = ("_apply", "_parent", "_context")
+
+    def __init__(self, apply: Callable, parent: ContextType):
+        self._apply = apply
+        self._parent = parent
+        self._context = None  # type: Optional[ContextType]
+
+    def resolve(self) -> ContextType:
+        """Return the context with the change applied (applied only once)."""
+        context = self._context
+        if context is None:
+            with _resolve_lock:
+                context = self._context
+                if context is None:
+                    parent = self._parent
+                    if isinstance(parent, DeferredContext):
+                        parent = parent.resolve()
+                    context = self._context = self._apply(parent)
+                    self._apply = self._parent = None
+        return context
+
+    def __getitem__(self, key: AnyStr) -> Any:
+        return self.resolve()[key]
+
+    def get(self, key: AnyStr, default: Any = None) -> Any:
+        return self.resolve().get(key, default)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.resolve()
+
+    def __iter__(self) -> Iterator[AnyStr]:
+        return iter(self.resolve())
+
+    def __len__(self) -> int:
+        return len(self.resolve())
+
+    def keys(self):
+        return self.resolve().keys()
+
+    def values(self):
+        return self.resolve().values()
+
+    def items(self):
+        return self.resolve().items()
+
+    def __eq__(self, other: Any) -> bool:
+        return self.resolve() == other
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return dict, (dict(self.resolve()),)
+
+    def __repr__(self) -> str:
+        return "DeferredContext(%r)" % (self.resolve(),)
@@ -16,3 +16,7 @@ class ContextChangeAlreadyStartedException(ContextException):
 
 class ContextChangeNotStartedException(ContextException):
     pass
+
+
+class ContextImportException(ContextException):
+    pass
@@ -0,0 +1,127 @@
+"""Defines helpers, that propagate the logging context to other threads.
+
+Context variables are not inherited by threads, or by concurrent.futures
+workers, so the logging context would be empty in code, that runs there.
+
+Thread helpers pass the current context to the worker by reference - contexts
+are never modified, so they can be shared without copying. Process pools get
+a plain dictionary with lazy values resolved, that is pickled with the task
+(values, that can not be pickled, are sent as strings).
+"""
+import pickle
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import wraps
+from threading import Thread
+from typing import Any, Callable, Dict, Tuple
+
+from .lazy import resolve_value
+from .store import ContextStore, ContextType
+
+
+def run_in_context(context: ContextType, func: Callable, *args, **kwargs):
+    """Call a function with the logging context replaced.
+
+    :param context: logging context to call the function in.
+    :param func: callable to be called.
+    :return: result of the call.
+    """
+    variable = ContextStore.variable()
+    token = variable.set(context)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        variable.reset(token)
+
+
+def with_current_context(func: Callable) -> Callable:
+    """Return a callable, that calls func in the current logging context.
+
+    Use it to pass callbacks to threads, or other code, that does not
+    propagate the context on its own.
+
+    :param func: callable to be wrapped.
+    :return: wrapped callable.
+    """
+    context = ContextStore().get()
+
+    @wraps(func)
+    def wrapped(*args, **kwargs):
+        return run_in_context(context, func, *args, **kwargs)
+
+    return wrapped
+
+
+def _is_picklable(value: Any) -> bool:
+    try:
+        pickle.dumps(value)
+    except Exception:
+        return False
+    return True
+
+
+def get_portable_context(context: ContextType) -> Dict[str, Any]:
+    """Return a picklable copy of the logging context.
+
+    Values, that can not be pickled (such as locks, or open files), are
+    converted to strings, so that a context variable never prevents a task
+    from being submitted. Values are checked one by one only when pickling
+    the whole context fails.
+
+    :param context: logging context.
+    :return: plain dictionary, with lazy values resolved.
+    """
+    portable = {k: resolve_value(v) for k, v in context.items()}
+    if _is_picklable(portable):
+        return portable
+    return {
+        k: v if _is_picklable(v) else str(v) for k, v in portable.items()
+    }
+
+
+class ContextThread(Thread):
+    """Thread, that runs its target in the logging context of its creator.
+
+    The context is captured when the thread is created (not when it is
+    started).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.logging_context = ContextStore().get()
+
+    def run(self) -> None:
+        run_in_context(self.logging_context, super().run)
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor, that runs tasks in the submitter's context.
+
+    The context snapshot is passed to the worker by reference, so submitting
+    a task costs the same, no matter how large the context is.
+    """
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        variable = ContextStore.variable()
+        context = variable.get(ContextStore.empty_context())
+        return super().submit(run_in_context, context, fn, *args, **kwargs)
+
+
+class ContextProcessPoolExecutor(ProcessPoolExecutor):
+    """ProcessPoolExecutor, that runs tasks in the submitter's context.
+
+    The context is sent to the worker process as a plain dictionary (see
+    `get_portable_context`), that is created once for every context and
+    reused for all the tasks submitted within it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._portable_context = (None, {})  # type: Tuple[Any, Dict]
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        context = ContextStore().get()
+        cached_context, portable = self._portable_context
+        if cached_context is not context:
+            portable = get_portable_context(context)
+            self._portable_context = (context, portable)
+        return super().submit(run_in_context, portable, fn, *args, **kwargs)
@@ -0,0 +1,130 @@
+"""Defines LoggingContextRecordFactory class."""
+from logging import (
+    LogRecord,
+    Logger,
+    getLogRecordFactory,
+    setLogRecordFactory,
+)
+from typing import Callable, Mapping, Optional
+
+from .filter import (
+    IGNORED_VARIABLE_NAMES,
+    INJECTED_CONTEXT_ATTRIBUTE,
+    LoggingContextFilter,
+)
+
+LogRecordFactoryType = Callable[..., LogRecord]
+
+# record attributes, that `extra` must not overwrite
+_PROTECTED_NAMES = frozenset(IGNORED_VARIABLE_NAMES) | {"message", "asctime"}
+
+
+def apply_extra(record: LogRecord, extra: Mapping) -> None:
+    """Set `extra` values as record attributes, like Logger.makeRecord does.
+
+    Unlike Logger.makeRecord, context variables, that were injected into the
+    record when it was created, are overwritten instead of raising KeyError.
+
+    :param record: LogRecord, that was created without the extra values.
+    :param extra: `extra` argument of the logging call.
+    """
+    attributes = record.__dict__
+    context = attributes.get(INJECTED_CONTEXT_ATTRIBUTE, {})
+    for key in extra:
+        if key in _PROTECTED_NAMES or (
+            key in attributes and key not in context
+        ):
+            raise KeyError("Attempt to overwrite %r in LogRecord" % key)
+        attributes[key] = extra[key]
+
+
+def make_record_hook(original: Callable) -> Callable:  # noqa: D202
+    """Return Logger.makeRecord, that sets extra values after the context.
+
+    :param original: Logger.makeRecord to be wrapped.
+    :return: wrapped makeRecord.
+    """
+
+    def makeRecord(  # noqa: N802
+        self,
+        name,
+        level,
+        fn,
+        lno,
+        msg,
+        args,
+        exc_info,
+        func=None,
+        extra=None,
+        sinfo=None,
+    ):
+        record = original(
+            self, name, level, fn, lno, msg, args, exc_info, func, None, sinfo
+        )
+        if extra is not None:
+            apply_extra(record, extra)
+        return record
+
+    makeRecord.original = original
+    return makeRecord
+
+
+class LoggingContextRecordFactory:
+    """Log record factory, that injects current context into new records.
+
+    Filters are called once for every logger and handler they are added to,
+    while the record factory is called exactly once for every record. The
+    injected records are marked, so LoggingContextFilter objects, that are
+    still attached to loggers or handlers, will not inject them again.
+
+    Logger.makeRecord refuses to overwrite record attributes with the values
+    passed in `extra` argument, so `install` also wraps Logger.makeRecord to
+    let `extra` values overwrite context variables of the same name (other
+    record attributes are still protected). Loggers of classes, that override
+    makeRecord, are not covered.
+
+    :param factory: record factory to be chained (defaults to the currently
+        installed record factory).
+    :param snapshot_attribute: passed to LoggingContextFilter.
+    """
+
+    def __init__(
+        self,
+        factory: Optional[LogRecordFactoryType] = None,
+        snapshot_attribute: Optional[str] = None,
+    ):
+        self.factory = factory or getLogRecordFactory()
+        self.context_filter = LoggingContextFilter(snapshot_attribute)
+
+    def __call__(self, *args, **kwargs) -> LogRecord:
+        record = self.factory(*args, **kwargs)
+        self.context_filter.filter(record)
+        return record
+
+    @classmethod
+    def install(
+        cls, snapshot_attribute: Optional[str] = None
+    ) -> "LoggingContextRecordFactory":
+        """Chain to the current record factory and install a new factory.
+
+        :param snapshot_attribute: passed to LoggingContextFilter.
+        :return: installed LoggingContextRecordFactory object.
+        """
+        factory = cls(getLogRecordFactory(), snapshot_attribute)
+        setLogRecordFactory(factory)
+        if not hasattr(Logger.makeRecord, "original"):
+            Logger.makeRecord = make_record_hook(Logger.makeRecord)
+        return factory
+
+    def uninstall(self) -> None:
+        """Restore the chained record factory, if this one is installed.
+
+        Logger.makeRecord is restored, when no other LoggingContextRecordFactory
+        remains installed.
+        """
+        if getLogRecordFactory() is self:
+            setLogRecordFactory(self.factory)
+        original = getattr(Logger.makeRecord, "original", None)
+        installed = getLogRecordFactory()
+        if original and not isinstance(installed, LoggingContextRecordFactory):
+            Logger.makeRecord = original
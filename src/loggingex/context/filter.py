@@ -1,7 +1,11 @@
 """Defines LoggingContextFilter class."""
-from logging import LogRecord
+from logging import DEBUG, LogRecord, getLogger
+from typing import Any, AnyStr, Dict, Optional
 
-from .store import ContextStore
+from .consumers import register_consumer
+from .lazy import resolve_value
+from .snapshot import ContextSnapshot
+from .store import ContextStore, ContextType
 
 IGNORED_VARIABLE_NAMES = (
     "name",
@@ -25,10 +29,65 @@ IGNORED_VARIABLE_NAMES = (
     "processName",
     "process",
 )
+_IGNORED_VARIABLE_NAMES = frozenset(IGNORED_VARIABLE_NAMES)
+
+# records, that already have the context injected, have the injected context
+# stored in this attribute (so that it would not be injected twice)
+INJECTED_CONTEXT_ATTRIBUTE = "_loggingex_context"
 
 
 class LoggingContextFilter:
-    """Logging filter injects current context variables into the log records."""
+    """Logging filter injects current context variables into the log records.
+
+    Contexts are replaced (and never modified) when they change, so the
+    filter caches the variables to be injected for the most recently seen
+    context, and reuses them for as long as that context is current.
+
+    The context is injected into each record only once - records, that
+    already went through a LoggingContextFilter (or were created by
+    LoggingContextRecordFactory), are left as they are.
+
+    By default, every context variable is injected as a separate record
+    attribute. If `snapshot_attribute` is given, a single ContextSnapshot
+    object is injected as that attribute instead. The snapshot is shared by
+    all records emitted within the same context, which saves memory when
+    records are retained (for example, by MemoryHandler or QueueHandler).
+
+    Lazy context variables (see LazyValue) are resolved, when the first record
+    is injected with the context they belong to.
+
+    The filter registers itself as a consumer of DEBUG records of the root
+    logger (see `loggingex.context.consumers`).
+
+    :param snapshot_attribute: inject context as a single ContextSnapshot
+        attribute with this name.
+    """
+
+    def __init__(self, snapshot_attribute: Optional[str] = None):
+        self.snapshot_attribute = snapshot_attribute
+        self._plan = (None, {})
+        register_consumer(self, getLogger(), DEBUG)
+
+    def get_injection_plan(self, context: ContextType) -> Dict[AnyStr, Any]:
+        """Return variables of given context, that should be injected.
+
+        :param context: context to be injected.
+        :return: context variables, that do not overwrite LogRecord fields (or
+            a context snapshot), and the injected context marker.
+        """
+        cached_context, plan = self._plan
+        if cached_context is not context:
+            if self.snapshot_attribute:
+                plan = {self.snapshot_attribute: ContextSnapshot(context)}
+            else:
+                plan = {
+                    name: resolve_value(value)
+                    for name, value in context.items()
+                    if name not in _IGNORED_VARIABLE_NAMES
+                }
+            plan[INJECTED_CONTEXT_ATTRIBUTE] = context
+            self._plan = (context, plan)
+        return plan
 
     def filter(self, record: LogRecord):  # noqa: A003
         """Inject current context variables into the record.
@@ -36,9 +95,7 @@ class LoggingContextFilter:
         :param record: LogRecord to inject context into.
         :return: Always returns 1.
         """
-        context_store = ContextStore()
-        context = context_store.get()
-        for name, value in context.items():
-            if name not in IGNORED_VARIABLE_NAMES:
-                setattr(record, name, value)
+        if INJECTED_CONTEXT_ATTRIBUTE not in record.__dict__:
+            context = ContextStore().get()
+            record.__dict__.update(self.get_injection_plan(context))
         return 1
@@ -0,0 +1,190 @@
+"""Defines FrozenContextChange class."""
+from contextvars import Token
+from functools import wraps
+from types import MappingProxyType
+from typing import AbstractSet, AnyStr, Mapping
+
+from .consumers import DeferredContext, is_consumed
+from .lazy import LazyValue
+from .map import ContextMap
+from .store import ContextStore, ContextType
+from .wrappers import ResumedChange, get_function_wrapper, get_resumer
+
+
+class FrozenContextChange:
+    """Represents an immutable, pre-validated context change template.
+
+    Frozen context changes are created with `ContextChange.freeze` (or with
+    the `context.compile` shortcut). Variable names are validated once, when
+    the template is created, and the removes and updates are never copied
+    again, so starting and stopping a frozen change only swaps the context in
+    the store.
+
+    Unlike ContextChange, a frozen change does not keep the restore token -
+    `start` returns it, and it must be passed to `stop`. This allows the same
+    template to be started any number of times concurrently (for example, by
+    a decorated recursive function, or from multiple threads).
+
+    Lazy variables (see LazyValue) are renewed every time the template is
+    applied, so that every scope resolves its own values.
+    """
+
+    __slots__ = ("_fresh", "_remove", "_update", "_lazy")
+
+    def __init__(
+        self,
+        context_fresh: bool = False,
+        context_remove: AbstractSet[AnyStr] = frozenset(),
+        context_update: ContextType = None,
+    ):
+        # imported here, because change module imports this one
+        from .change import ContextChange
+
+        ContextChange.validate_context_variable_names(context_remove)
+        ContextChange.validate_context_variable_names(context_update or {})
+        self._init(context_fresh, context_remove, context_update)
+
+    @classmethod
+    def from_validated(
+        cls,
+        context_fresh: bool,
+        context_remove: AbstractSet[AnyStr],
+        context_update: ContextType,
+    ) -> "FrozenContextChange":
+        """Return a new template of changes, whose names are already valid.
+
+        Used by `ContextChange.freeze`, so that the names are not validated
+        again.
+        """
+        frozen = cls.__new__(cls)
+        frozen._init(context_fresh, context_remove, context_update)
+        return frozen
+
+    def _init(
+        self,
+        context_fresh: bool,
+        context_remove: AbstractSet[AnyStr],
+        context_update: ContextType,
+    ) -> None:
+        object.__setattr__(self, "_fresh", bool(context_fresh))
+        object.__setattr__(self, "_remove", frozenset(context_remove))
+        object.__setattr__(self, "_update", dict(context_update or {}))
+        lazy = tuple(
+            k for k, v in self._update.items() if isinstance(v, LazyValue)
+        )
+        object.__setattr__(self, "_lazy", lazy)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenContextChange can not be modified")
+
+    def __delattr__(self, name):
+        raise AttributeError("FrozenContextChange can not be modified")
+
+    @property
+    def context_fresh(self) -> bool:
+        return self._fresh
+
+    @property
+    def context_remove(self) -> AbstractSet[AnyStr]:
+        return self._remove
+
+    @property
+    def context_update(self) -> Mapping:
+        return MappingProxyType(self._update)
+
+    def __str__(self) -> str:
+        parts = ["-*" if self._fresh else None]
+        parts.extend("-%s" % n for n in sorted(self._remove))
+        upd = self._update
+        parts.extend("+%s=%r" % (n, upd[n]) for n in sorted(upd.keys()))
+        return " ".join(x for x in parts if x)
+
+    def __repr__(self):
+        return "<FrozenContextChange: %s>" % str(self)
+
+    def _scope_update(self) -> ContextType:
+        """Return updates for a new scope, with lazy variables renewed."""
+        if not self._lazy:
+            return self._update
+        update = dict(self._update)
+        for name in self._lazy:
+            update[name] = update[name].renew()
+        return update
+
+    def apply(self, context: ContextType) -> ContextType:
+        """Return given context with changes applied.
+
+        See `ContextChange.apply`.
+
+        :param context: initial context dictionary.
+        :return: changed context dictionary.
+        """
+        update = self._scope_update()
+        if ContextStore.is_persistent():
+            return ContextMap.from_mapping(context).evolve(
+                self._fresh, self._remove, update
+            )
+        if self._fresh:
+            return dict(update)
+        remove = self._remove
+        if remove:
+            context = {k: v for k, v in context.items() if k not in remove}
+        else:
+            context = dict(context)
+        context.update(update)
+        return context
+
+    def start(self) -> Token:
+        """Apply context change to the global logging context store.
+
+        The change is deferred, if nothing consumes the context (see
+        `loggingex.context.consumers`).
+
+        :return: token, to be passed to stop.
+        """
+        resumer = get_resumer()
+        if resumer is not None:
+            return resumer.push(self.apply)
+        variable = ContextStore.variable()
+        context = variable.get(ContextStore.empty_context())
+        if is_consumed():
+            return variable.set(self.apply(context))
+        return variable.set(DeferredContext(self.apply, context))
+
+    def stop(self, token: Token) -> None:
+        """Restore global logging context store to previous state.
+
+        :param token: token, that was returned by start.
+        """
+        if isinstance(token, ResumedChange):
+            token.stop()
+        else:
+            ContextStore.variable().reset(token)
+
+    def __call__(self, func):  # noqa: D202
+        """Allow FrozenContextChange to be used as function decorator.
+
+        Coroutine functions are decorated, so that the context is changed
+        while the coroutine is awaited. Generator functions and asynchronous
+        generator functions are decorated, so that the context is changed
+        only while the generator body runs (and not while the consumer
+        handles the yielded values).
+
+        :param func: A callable to decorated.
+        :return: Decorated callable.
+        """
+        wrapper = get_function_wrapper(func)
+        if wrapper is not None:
+            return wrapper(self, func)
+
+        start, stop = self.start, self.stop
+
+        @wraps(func)
+        def decorated(*args, **kwargs):
+            token = start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stop(token)
+
+        return decorated
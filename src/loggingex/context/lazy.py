@@ -0,0 +1,83 @@
+"""Defines LazyValue class."""
+from threading import Lock
+from typing import Any, AnyStr, Callable, Mapping
+
+_UNRESOLVED = object()
+
+
+class LazyValue:
+    """Context variable value, that is computed only when it is needed.
+
+    The factory is called at most once - when the value is read by a context
+    consumer (such as LoggingContextFilter or ContextSnapshot) for the first
+    time - and the result is cached for the rest of the scope.
+
+    Exceptions raised by the factory are not handled, and the value stays
+    unresolved.
+
+    :param factory: callable without arguments, that returns the value.
+    """
+
+    __slots__ = ("factory", "_value", "_lock")
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self._value = _UNRESOLVED
+        self._lock = Lock()
+
+    @property
+    def resolved(self) -> bool:
+        """Return True if the value was already computed."""
+        return self._value is not _UNRESOLVED
+
+    def resolve(self) -> Any:
+        """Return the value, computing it first, if necessary."""
+        value = self._value
+        if value is _UNRESOLVED:
+            with self._lock:
+                value = self._value
+                if value is _UNRESOLVED:
+                    value = self._value = self.factory()
+        return value
+
+    def renew(self) -> "LazyValue":
+        """Return a new, unresolved LazyValue with the same factory."""
+        return LazyValue(self.factory)
+
+    def __reduce__(self):
+        # the lock (and often the factory) can not be pickled, so the value is
+        # pickled resolved - records, that carry the context, can be sent to
+        # sockets and other processes
+        return resolve_value, (self.resolve(),)
+
+    def __repr__(self) -> str:
+        if self.resolved:
+            return "<LazyValue: %r>" % self._value
+        return "<LazyValue: unresolved>"
+
+
+def resolve_value(value: Any) -> Any:
+    """Return given context variable value, resolving it, if it is lazy.
+
+    :param value: context variable value.
+    :return: resolved value.
+    """
+    if isinstance(value, LazyValue):
+        return value.resolve()
+    return value
+
+
+def renew_values(values: Mapping[AnyStr, Any]) -> Mapping[AnyStr, Any]:
+    """Return given name=value mapping with lazy values renewed.
+
+    :param values: context variable values.
+    :return: given mapping, if it has no lazy values, or its copy, with every
+        LazyValue replaced by a new, unresolved one.
+    """
+    lazy = [k for k, v in values.items() if isinstance(v, LazyValue)]
+    if not lazy:
+        return values
+    values = dict(values)
+    for name in lazy:
+        values[name] = values[name].renew()
+    return values
@@ -0,0 +1,167 @@
+"""Defines ContextLevelOverrides class."""
+from logging import Logger, getLevelName
+from typing import (
+    Any,
+    AnyStr,
+    Callable,
+    Dict,
+    Hashable,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .change import ContextChange
+from .store import ContextStore, ContextType
+
+LevelType = Union[int, str]
+LevelRulesType = Mapping[Tuple[AnyStr, Hashable], LevelType]
+
+# marker attribute of the installed isEnabledFor hooks
+HOOK_ATTRIBUTE = "_loggingex_level_overrides"
+
+_MISSING = object()
+
+
+def get_level_number(level: LevelType) -> int:
+    """Return numeric value of a level given by its number or name."""
+    if isinstance(level, int):
+        return level
+    number = getLevelName(level)
+    if not isinstance(number, int):
+        raise ValueError("Unknown level: %r" % (level,))
+    return number
+
+
+def make_is_enabled_for_hook(
+    overrides: "ContextLevelOverrides", logger: Logger
+) -> Callable[[int], bool]:  # noqa: D202
+    """Return isEnabledFor of the logger, that applies the overrides.
+
+    :param overrides: ContextLevelOverrides to be applied.
+    :param logger: logger, whose isEnabledFor is replaced.
+    :return: the replacement of logger.isEnabledFor.
+    """
+    original = logger.isEnabledFor
+    manager = logger.manager
+    variable = overrides._variable
+
+    def isEnabledFor(level: int) -> bool:  # noqa: N802
+        # get_override is inlined, so that hot loggers pay one identity
+        # comparison, while the context does not change
+        cached_context, override = overrides._decision
+        if variable.get(None) is not cached_context:
+            override = overrides.get_override()
+        if override is None:
+            return original(level)
+        if logger.disabled:  # as in Logger.isEnabledFor
+            return False
+        return level >= override and manager.disable < level
+
+    setattr(isEnabledFor, HOOK_ATTRIBUTE, overrides)
+    isEnabledFor.original = original
+    return isEnabledFor
+
+
+class ContextLevelOverrides:
+    """Overrides logger levels, when the context matches a rule.
+
+    Rules map (name, value) pairs of context variables to levels, for example
+    `{("tenant", "acme"): "DEBUG"}` enables DEBUG records of the loggers, the
+    overrides are installed into, while the context has tenant="acme". When
+    more rules match, the lowest level wins. Loggers use their own level,
+    while no rule matches.
+
+    Rules are indexed by the variable name and value, so finding the override
+    costs one dictionary lookup per variable name used in the rules. The
+    override is cached for the most recently seen context, and contexts are
+    replaced (and never modified) when they change, so a logger pays one
+    identity comparison, while the context stays the same.
+
+    The overrides are installed by replacing `isEnabledFor` of the loggers,
+    so records are rejected before they are created, exactly as they are by
+    the logger level. Note that handler levels still apply.
+
+    :param rules: (name, value) to level mapping.
+    """
+
+    def __init__(self, rules: Optional[LevelRulesType] = None):
+        self._index = {}  # type: Dict[AnyStr, Dict[Hashable, int]]
+        self._variable = ContextStore.variable()
+        self._decision = (_MISSING, None)  # type: Tuple[Any, Optional[int]]
+        for (name, value), level in (rules or {}).items():
+            self.add_rule(name, value, level)
+
+    def add_rule(self, name: AnyStr, value: Hashable, level: LevelType):
+        """Set the level of records logged while context has name=value.
+
+        :param name: context variable name.
+        :param value: context variable value.
+        :param level: level number or name.
+        """
+        ContextChange.validate_context_variable_name(name)
+        level = get_level_number(level)
+        self._index.setdefault(name, {})[value] = level
+        self._decision = (_MISSING, None)
+
+    def remove_rule(self, name: AnyStr, value: Hashable) -> None:
+        """Remove a rule (does nothing, if there is no such rule).
+
+        :param name: context variable name.
+        :param value: context variable value.
+        """
+        values = self._index.get(name, {})
+        values.pop(value, None)
+        if not values:
+            self._index.pop(name, None)
+        self._decision = (_MISSING, None)
+
+    def get_level(self, context: ContextType) -> Optional[int]:
+        """Return the level override of given context.
+
+        :param context: context to be matched.
+        :return: the lowest level of matching rules, or None.
+        """
+        levels = []
+        for name, values in self._index.items():
+            try:
+                level = values.get(context.get(name, _MISSING))
+            except TypeError:  # unhashable value never matches
+                continue
+            if level is not None:
+                levels.append(level)
+        return min(levels) if levels else None
+
+    def get_override(self) -> Optional[int]:
+        """Return the level override of the current context (cached)."""
+        context = self._variable.get(None)
+        cached_context, level = self._decision
+        if context is not cached_context:
+            level = self.get_level(context or {})
+            self._decision = (context, level)
+        return level
+
+    def install(self, logger: Logger) -> None:
+        """Replace isEnabledFor of the logger with the overriding one.
+
+        :param logger: logger to be installed into (installing overrides into
+            the same logger again does nothing).
+        """
+        if not self.is_installed(logger):
+            logger.isEnabledFor = make_is_enabled_for_hook(self, logger)
+
+    def is_installed(self, logger: Logger) -> bool:
+        """Return True if the overrides are installed into the logger."""
+        hook = logger.__dict__.get("isEnabledFor")
+        return getattr(hook, HOOK_ATTRIBUTE, None) is self
+
+    def uninstall(self, logger: Logger) -> None:
+        """Restore isEnabledFor of the logger, if the overrides are installed.
+
+        :param logger: logger to be uninstalled from.
+        """
+        if self.is_installed(logger):
+            hook = logger.__dict__.pop("isEnabledFor")
+            if getattr(hook.original, HOOK_ATTRIBUTE, None) is not None:
+                logger.isEnabledFor = hook.original
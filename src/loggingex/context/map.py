@@ -0,0 +1,161 @@
+"""Defines ContextMap class."""
+from collections.abc import Mapping
+from typing import AbstractSet, Any, AnyStr, Dict, Iterator, Optional
+
+# number of changes a ContextMap may stack on top of a flat root, before
+# it gets compacted into a new root
+MAX_CHAIN_DEPTH = 32
+
+_MISSING = object()
+
+
+class ContextMap(Mapping):
+    """Persistent (immutable) mapping used to store logging contexts.
+
+    ContextMap is a delta-chain: every change holds a reference to the map it
+    was derived from, plus the names it removed and the values it updated.
+    Deriving a new map is O(changed keys) and does not copy the parent, so
+    nested scopes share structure with their parents.
+
+    The flat dictionary, that is needed to iterate over the map, is computed
+    lazily (only once per map) and cached. Single key lookups walk the chain
+    without flattening it. Chains are never allowed to grow longer than
+    MAX_CHAIN_DEPTH - deeper maps are compacted into a new flat root.
+
+    ContextMap instances must never be modified.
+    """
+
+    __slots__ = ("_parent", "_remove", "_update", "_depth", "_flat")
+
+    def __init__(self, mapping: Optional[Mapping] = None):
+        self._parent = None  # type: Optional[ContextMap]
+        self._remove = frozenset()  # type: AbstractSet[AnyStr]
+        self._update = dict(mapping or ())  # type: Dict[AnyStr, Any]
+        self._depth = 0  # type: int
+        self._flat = self._update  # type: Optional[Dict[AnyStr, Any]]
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping) -> "ContextMap":
+        """Return given mapping as a ContextMap.
+
+        :param mapping: a ContextMap or any other mapping.
+        :return: mapping itself, if it is a ContextMap, new ContextMap root
+            with a copy of mapping otherwise.
+        """
+        if isinstance(mapping, ContextMap):
+            return mapping
+        return cls(mapping)
+
+    def evolve(
+        self,
+        fresh: bool = False,
+        remove: AbstractSet[AnyStr] = frozenset(),
+        update: Optional[Mapping] = None,
+    ) -> "ContextMap":
+        """Return a new ContextMap with given changes applied.
+
+        Note: this map is not modified, and update is not copied, so it must
+        not be modified after it has been passed to this method.
+
+        :param fresh: ignore this map (and remove) and start a new root.
+        :param remove: names to be removed.
+        :param update: name=value mapping of values to be set.
+        :return: changed ContextMap.
+        """
+        if fresh:
+            return ContextMap(update)
+        if not remove and not update:
+            return self
+        if self._depth >= MAX_CHAIN_DEPTH:
+            return ContextMap(self._flatten()).evolve(False, remove, update)
+
+        child = ContextMap.__new__(ContextMap)
+        child._parent = self
+        child._remove = remove
+        child._update = update or {}
+        child._depth = self._depth + 1
+        child._flat = None
+        return child
+
+    def _flatten(self) -> Dict[AnyStr, Any]:
+        """Return a cached flat dictionary representation of this map."""
+        if self._flat is not None:
+            return self._flat
+
+        # collect all maps that were not flattened yet (iteratively, so that
+        # deep chains would not hit the recursion limit)
+        pending = []
+        node = self
+        while node._flat is None:
+            pending.append(node)
+            node = node._parent
+
+        flat = node._flat
+        for node in reversed(pending):
+            remove = node._remove
+            if remove:
+                flat = {k: v for k, v in flat.items() if k not in remove}
+            else:
+                flat = flat.copy()
+            flat.update(node._update)
+            node._flat = flat
+        return flat
+
+    def _lookup(self, key: AnyStr, default: Any) -> Any:
+        node = self
+        while node is not None:
+            if node._flat is not None:
+                return node._flat.get(key, default)
+            value = node._update.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            if key in node._remove:
+                return default
+            node = node._parent
+        return default
+
+    def __getitem__(self, key: AnyStr) -> Any:
+        value = self._lookup(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: AnyStr, default: Any = None) -> Any:
+        return self._lookup(key, default)
+
+    def __contains__(self, key: Any) -> bool:
+        return self._lookup(key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[AnyStr]:
+        return iter(self._flatten())
+
+    def __len__(self) -> int:
+        return len(self._flatten())
+
+    def keys(self):
+        return self._flatten().keys()
+
+    def values(self):
+        return self._flatten().values()
+
+    def items(self):
+        return self._flatten().items()
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ContextMap):
+            other = other._flatten()
+        return self._flatten() == other
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return ContextMap, (self._flatten(),)
+
+    def __repr__(self) -> str:
+        return "ContextMap(%r)" % self._flatten()
+
+
+EMPTY_CONTEXT_MAP = ContextMap()
@@ -0,0 +1,196 @@
+"""Defines ContextScope class and iterate helper."""
+from contextvars import ContextVar, Token
+from functools import partial
+from typing import (
+    Any,
+    AnyStr,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Set,
+    Union,
+)
+
+from .change import ContextChange, apply_change
+from .exceptions import (
+    ContextChangeAlreadyStartedException,
+    ContextChangeNotStartedException,
+)
+from .map import ContextMap
+from .store import ContextStore, ContextType
+from .wrappers import ResumedChange, get_resumer
+
+ContextGettersType = Mapping[AnyStr, Callable[[Any], Any]]
+
+
+class ContextScope:
+    """Represents a context scope, whose variables can be rebound in place.
+
+    Entering a scope saves the current context, and `set` replaces the values
+    of the scope without stacking new scopes on top of it, so rebinding a
+    variable in a tight loop costs a single context update instead of a full
+    enter/exit pair of a ContextChange. Names are validated only the first
+    time they are set in the scope.
+
+    The context is restored, when the scope is exited. While a nested context
+    change is active, `set` updates the current context (so the variables of
+    the nested change are kept), and the values it sets are lost, when that
+    change stops.
+
+    In a running generator body, that is decorated by a context change, the
+    scope is kept on the stack of the generator wrapper (see
+    `loggingex.context.wrappers`), so it is re-applied whenever the generator
+    is resumed in another context. There, `set` replaces the change of the
+    scope, and nested changes are re-applied on top of it (so the values it
+    sets are kept, when they stop).
+    """
+
+    __slots__ = (
+        "_variable",
+        "_token",
+        "_base",
+        "_context",
+        "_update",
+        "_names",
+    )
+
+    def __init__(self):
+        self._variable = None  # type: Optional[ContextVar]
+        self._token = None  # type: Optional[Union[Token, ResumedChange]]
+        self._base = None  # type: Optional[ContextMap]
+        self._context = None  # type: Optional[ContextType]
+        self._update = {}  # type: ContextType
+        self._names = set()  # type: Set[AnyStr]
+
+    @property
+    def started(self) -> bool:
+        """Return True if this scope has been entered, and not exited yet."""
+        return self._token is not None
+
+    def start(self) -> None:
+        """Save the current context, so that it can be restored by stop."""
+        if self.started:
+            raise ContextChangeAlreadyStartedException(
+                "Context scope already started"
+            )
+        variable = ContextStore.variable()
+        self._variable = variable
+        self._update = {}
+        resumer = get_resumer()
+        if resumer is not None:
+            self._token = resumer.push(_scope_change({}))
+            return
+        context = variable.get(ContextStore.empty_context())
+        if ContextStore.is_persistent():
+            self._base = ContextMap.from_mapping(context)
+        self._context = context
+        self._token = variable.set(context)
+
+    def stop(self) -> None:
+        """Restore the context, that was current when the scope started."""
+        if not self.started:
+            raise ContextChangeNotStartedException(
+                "Context scope has not been started"
+            )
+        token = self._token
+        if isinstance(token, ResumedChange):
+            token.stop()
+        else:
+            self._variable.reset(token)
+        self._token = None
+        self._base = None
+        self._context = None
+
+    def set(self, **context_update) -> None:  # noqa: A003
+        """Replace the values of given variables in this scope.
+
+        :param context_update: name=value mapping of values to be set.
+        """
+        if not self.started:
+            raise ContextChangeNotStartedException(
+                "Context scope has not been started"
+            )
+        if not self._names.issuperset(context_update):
+            ContextChange.validate_context_variable_names(context_update)
+            self._names.update(context_update)
+        self.rebind(context_update)
+
+    def rebind(self, context_update: ContextType) -> None:
+        """Replace the values of the scope without validating the names.
+
+        This is meant for hot paths, that validate the names once. The scope
+        must be started.
+
+        :param context_update: name=value mapping of values to be set.
+        """
+        token = self._token
+        if isinstance(token, ResumedChange):
+            update = dict(self._update)
+            update.update(context_update)
+            self._update = update
+            token.replace(_scope_change(update))
+            return
+        current = self._variable.get(None)
+        if current is not self._context:
+            # a nested context change is active - update it instead
+            self._variable.set(
+                apply_change(current or {}, False, (), context_update)
+            )
+            return
+        if self._base is not None:
+            # evolve the base with all updates, so that chains do not grow
+            update = dict(self._update)
+            update.update(context_update)
+            self._update = update
+            context = self._base.evolve(False, frozenset(), update)
+        else:
+            context = dict(self._context)
+            context.update(context_update)
+        self._context = context
+        self._variable.set(context)
+
+    def __enter__(self) -> "ContextScope":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.stop()
+        return False
+
+    async def __aenter__(self) -> "ContextScope":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.stop()
+        return False
+
+
+def _scope_change(update: ContextType) -> Callable:
+    """Return the change of a scope, that is kept by a generator wrapper."""
+    return partial(apply_change, fresh=False, remove=frozenset(), update=update)
+
+
+def iterate(iterable: Iterable, getters: ContextGettersType) -> Iterator:
+    """Yield items of iterable, with context variables set per item.
+
+    Every getter is called with the item, and its result is set to the context
+    variable of the same name, while the consumer handles the item. Names are
+    validated once, and the variables are rebound in a single ContextScope.
+
+    :param iterable: items to be yielded.
+    :param getters: name=callable mapping of context variable getters.
+    :return: iterator over the items.
+    """
+    ContextChange.validate_context_variable_names(getters)
+    return _iterate(iterable, tuple(getters.items()))
+
+
+def _iterate(iterable: Iterable, getters: tuple) -> Iterator:
+    with ContextScope() as scope:
+        rebind = scope.rebind
+        for item in iterable:
+            rebind({name: getter(item) for name, getter in getters})
+            yield item
@@ -1,5 +1,9 @@
 """Defines a helper context shortcut."""
+from typing import Iterable, Iterator
+
 from .change import ContextChange
+from .frozen import FrozenContextChange
+from .scope import ContextScope, iterate
 
 
 class _ContextChangeShortcuts:
@@ -10,7 +14,7 @@ class _ContextChangeShortcuts:
         :param kwargs: passed into update.
         :return: new ContextChange object.
         """
-        return ContextChange().remove(*args).update(**kwargs)
+        return ContextChange(context_remove=args, context_update=kwargs)
 
     @staticmethod
     def fresh(**kwargs) -> ContextChange:
@@ -21,5 +25,41 @@ class _ContextChangeShortcuts:
         """
         return ContextChange().fresh(True).update(**kwargs)
 
+    @staticmethod
+    def lazy(**kwargs) -> ContextChange:
+        """Create ContextChange object with lazy variables.
+
+        :param kwargs: passed into ContextChange.lazy.
+        :return: new ContextChange object.
+        """
+        return ContextChange().lazy(**kwargs)
+
+    def compile(self, *args, **kwargs) -> FrozenContextChange:  # noqa: A003
+        """Create FrozenContextChange from positional and keyword arguments.
+
+        :param args: passed into remove.
+        :param kwargs: passed into update.
+        :return: new FrozenContextChange object.
+        """
+        return self(*args, **kwargs).freeze()
+
+    @staticmethod
+    def scope() -> ContextScope:
+        """Create ContextScope object, whose variables can be rebound.
+
+        :return: new ContextScope object.
+        """
+        return ContextScope()
+
+    @staticmethod
+    def iterate(iterable: Iterable, **kwargs) -> Iterator:
+        """Yield items of iterable, with context variables set per item.
+
+        :param iterable: items to be yielded.
+        :param kwargs: name=callable mapping of getters, called with items.
+        :return: iterator over the items.
+        """
+        return iterate(iterable, kwargs)
+
 
 context = _ContextChangeShortcuts()
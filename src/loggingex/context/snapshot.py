@@ -0,0 +1,60 @@
+"""Defines ContextSnapshot class."""
+from collections.abc import Mapping
+from typing import Any, AnyStr, Iterator
+
+from .lazy import resolve_value
+from .store import ContextType
+
+
+class ContextSnapshot(Mapping):
+    """Immutable, read-only view of a logging context.
+
+    LoggingContextFilter can attach a single ContextSnapshot to log records
+    instead of copying every context variable into every record. The same
+    snapshot is shared by all records, that are emitted while the same
+    context is current.
+
+    Context variables can be read both as items (`snapshot["user"]`) and as
+    attributes (`snapshot.user`), so formatters can use either
+    `{context.user}` or `{context[user]}`. Use item access for variables,
+    that share their names with Mapping methods (such as "items" or "get").
+
+    Lazy context variables (see LazyValue) are resolved, when they are read.
+    """
+
+    __slots__ = ("_context",)
+
+    def __init__(self, context: ContextType):
+        object.__setattr__(self, "_context", context)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ContextSnapshot can not be modified")
+
+    def __delattr__(self, name):
+        raise AttributeError("ContextSnapshot can not be modified")
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        try:
+            return resolve_value(self._context[name])
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, name: AnyStr) -> Any:
+        return resolve_value(self._context[name])
+
+    def __iter__(self) -> Iterator[AnyStr]:
+        return iter(self._context)
+
+    def __len__(self) -> int:
+        return len(self._context)
+
+    def __reduce__(self):
+        return ContextSnapshot, (dict(self.items()),)
+
+    def __str__(self) -> str:
+        return " ".join("%s=%s" % item for item in self.items())
+
+    def __repr__(self) -> str:
+        return "<ContextSnapshot: %r>" % dict(self.items())
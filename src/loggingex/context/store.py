@@ -1,8 +1,10 @@
 """Defines ContextStore class."""
 from contextvars import ContextVar, Token
-from typing import Any, AnyStr, ClassVar, Dict
+from typing import Any, AnyStr, ClassVar, Mapping
 
-ContextType = Dict[AnyStr, Any]
+from .map import EMPTY_CONTEXT_MAP
+
+ContextType = Mapping[AnyStr, Any]
 
 CONTEXT_STORE_VARIABLE_NAME = "LOGGINGEX__CONTEXT__STORE"
 
@@ -11,16 +13,57 @@ class ContextStore:
     """ContextStore class is used to save/load/restore contexts.
 
     It is a thin wrapper around contextvars.ContextVar object.
+
+    By default, contexts are stored as plain dictionaries, and every context
+    change copies the whole context. When persistent mode is enabled (see
+    `set_persistent`), contexts are stored as `ContextMap` objects instead,
+    which share structure with the contexts they were derived from.
     """
 
     _context = None  # type: ClassVar[ContextVar[ContextType]]
+    _persistent = False  # type: ClassVar[bool]
 
     @classmethod
     def initialize_context(cls):
         """Ensure private static context is initialized."""
         if not ContextStore._context:
             ContextStore._context = ContextVar(CONTEXT_STORE_VARIABLE_NAME)
-            ContextStore._context.set({})
+            ContextStore._context.set(cls.empty_context())
+
+    @classmethod
+    def variable(cls) -> ContextVar:
+        """Return the initialized static context variable.
+
+        This is meant for hot paths, that need to get and set contexts without
+        the overhead of ContextStore methods.
+        """
+        if not ContextStore._context:
+            cls.initialize_context()
+        return ContextStore._context
+
+    @classmethod
+    def is_persistent(cls) -> bool:
+        """Return True if contexts are stored as persistent ContextMaps."""
+        return ContextStore._persistent
+
+    @classmethod
+    def set_persistent(cls, value: bool = True) -> None:
+        """Enable or disable persistent context storage.
+
+        Already stored contexts are not converted - the contexts derived from
+        them will be.
+
+        :param value: True to store new contexts as ContextMaps, False to store
+            them as plain dictionaries.
+        """
+        ContextStore._persistent = value
+
+    @classmethod
+    def empty_context(cls) -> ContextType:
+        """Return an empty context of the currently configured type."""
+        if ContextStore._persistent:
+            return EMPTY_CONTEXT_MAP
+        return {}
 
     @property
     def context(self) -> ContextVar[ContextType]:
@@ -30,7 +73,7 @@ class ContextStore:
     def get(self) -> ContextType:
         """Return current context."""
         self.initialize_context()
-        ctx = self.context.get({})
+        ctx = self.context.get(self.empty_context())
         return ctx
 
     def replace(self, ctx: ContextType) -> Token:
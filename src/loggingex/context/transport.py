@@ -0,0 +1,323 @@
+"""Defines helpers, that export and import logging contexts.
+
+Exported contexts are compact strings, that can be passed along with tasks or
+messages to other processes, and imported there as a ContextChange.
+
+The format consists of four fields, separated with ASCII record separator
+(0x1E) characters: the format version, value type tags (one character per
+variable), variable names and encoded values. Names and values are separated
+with ASCII unit separator (0x1F) characters. Type tags are:
+
+* "s" - string (strings, that contain separators, are JSON-encoded instead);
+* "i" - integer;
+* "f" - float;
+* "b" - boolean ("True" or "False");
+* "n" - None;
+* "j" - JSON-encoded value (any other value, that JSON can encode).
+
+Values, that JSON can not encode, are exported as strings. Lazy values are
+resolved.
+"""
+import json
+from itertools import repeat
+from typing import Any, AnyStr, Iterable, List, Optional, Sequence, Tuple
+
+from .change import ContextChange
+from .exceptions import ContextImportException
+from .lazy import resolve_value
+from .store import ContextStore, ContextType
+
+EXPORT_FORMAT_VERSION = "LX1"
+
+RECORD_SEPARATOR = "\x1e"
+UNIT_SEPARATOR = "\x1f"
+
+DEFAULT_MAX_SIZE = 4096
+DEFAULT_MAX_VALUE_SIZE = 1024
+
+_TYPE_TAGS = {str: "s", int: "i", float: "f", bool: "b", type(None): "n"}
+
+_DECODERS = {
+    "s": str,
+    "i": int,
+    "f": float,
+    "b": lambda value: value == "True",
+    "n": lambda value: None,
+    "j": json.loads,
+}
+
+EncodedType = Tuple[str, List[str], List[str]]
+
+
+def _has_separators(value: str) -> bool:
+    return RECORD_SEPARATOR in value or UNIT_SEPARATOR in value
+
+
+def _encode_json(value: Any) -> Tuple[str, str]:
+    try:
+        return "j", json.dumps(value, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return encode_value(str(value))
+
+
+def encode_value(value: Any) -> Tuple[str, str]:
+    """Return the type tag and the encoded value.
+
+    :param value: context variable value.
+    :return: (type tag, encoded value) tuple.
+    """
+    value = resolve_value(value)
+    tag = _TYPE_TAGS.get(type(value))
+    if tag is None:
+        return _encode_json(value)
+    value = str(value)
+    if tag == "s" and _has_separators(value):
+        return "j", json.dumps(value)
+    return tag, value
+
+
+def decode_value(tag: str, value: str) -> Any:
+    """Return the value decoded from the type tag and the encoded value.
+
+    :param tag: type tag.
+    :param value: encoded value.
+    :return: decoded value.
+    :raises ValueError: when the tag is unknown, or value is malformed.
+    """
+    decoder = _DECODERS.get(tag)
+    if decoder is None:
+        raise ValueError("Unknown value type tag %r" % tag)
+    return decoder(value)
+
+
+def _encode_simple(
+    names: List[str], values: List[Any], max_value_size: int
+) -> Optional[EncodedType]:
+    """Encode strings, numbers, booleans and None, without a Python loop.
+
+    Returns None, if any value needs to be encoded with `encode_value`.
+    """
+    tags = "".join(map(_TYPE_TAGS.get, map(type, values), repeat("j")))
+    if "j" in tags:
+        return None
+    encoded = values if tags.count("s") == len(tags) else list(map(str, values))
+    joined = UNIT_SEPARATOR.join(encoded)
+    if RECORD_SEPARATOR in joined:
+        return None
+    if joined.count(UNIT_SEPARATOR) >= len(encoded):
+        return None
+    if max(map(len, encoded)) > max_value_size:
+        return None
+    return tags, names, encoded
+
+
+def _encode(
+    names: List[str], values: Sequence, max_value_size: int
+) -> EncodedType:
+    tags, kept_names, encoded = [], [], []
+    for name, value in zip(names, values):
+        tag, value = encode_value(value)
+        if len(value) <= max_value_size:
+            tags.append(tag)
+            kept_names.append(name)
+            encoded.append(value)
+    return "".join(tags), kept_names, encoded
+
+
+def _join(tags: str, names: List[str], encoded: List[str]) -> str:
+    return RECORD_SEPARATOR.join(
+        (
+            EXPORT_FORMAT_VERSION,
+            tags,
+            UNIT_SEPARATOR.join(names),
+            UNIT_SEPARATOR.join(encoded),
+        )
+    )
+
+
+class ContextExporter:
+    """Exports logging contexts as compact strings.
+
+    The exported string is cached, and reused for as long as the exported
+    context does not change, so exporting the context for every task (or
+    message) that is sent within the same scope costs only one encoding.
+
+    Variables, that do not fit in the size limits, are left out (values are
+    never truncated). When the whole context does not fit, the variables are
+    dropped from the end of the context.
+
+    :param keys: names of the only variables to export (all, if None).
+    :param max_size: maximum length of the exported string.
+    :param max_value_size: maximum length of an encoded value.
+    """
+
+    def __init__(
+        self,
+        keys: Optional[Iterable[AnyStr]] = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        max_value_size: int = DEFAULT_MAX_VALUE_SIZE,
+    ):
+        self.keys = None if keys is None else frozenset(keys)
+        self.max_size = max_size
+        self.max_value_size = max_value_size
+        self._exported = (None, "")
+
+    def get_names(self, context: ContextType) -> List[str]:
+        """Return names of the variables, that should be exported."""
+        if self.keys is None:
+            return list(context.keys())
+        return [k for k in context.keys() if k in self.keys]
+
+    def encode(self, context: ContextType) -> str:
+        """Export given context (ignoring the cache).
+
+        :param context: context to be exported.
+        :return: exported context.
+        """
+        names = self.get_names(context)
+        values = list(map(context.__getitem__, names))
+        encoded = None
+        if names:
+            encoded = _encode_simple(names, values, self.max_value_size)
+        if encoded is None:
+            encoded = _encode(names, values, self.max_value_size)
+        tags, names, values = encoded
+        exported = _join(tags, names, values)
+        while len(exported) > self.max_size:
+            tags, names, values = tags[:-1], names[:-1], values[:-1]
+            exported = _join(tags, names, values)
+        return exported
+
+    def export(self, context: Optional[ContextType] = None) -> str:
+        """Export a logging context.
+
+        :param context: context to be exported (current context, if None).
+        :return: exported context.
+        """
+        if context is None:
+            context = ContextStore().get()
+        cached_context, exported = self._exported
+        if cached_context is not context:
+            exported = self.encode(context)
+            self._exported = (context, exported)
+        return exported
+
+
+def _decode(tags: str, names: List[str], values: List[str]) -> dict:
+    update = dict(zip(names, values))
+    if tags.count("s") == len(tags):
+        return update
+    for name, tag, value in zip(names, tags, values):
+        if tag != "s":
+            update[name] = decode_value(tag, value)
+    return update
+
+
+def _split(data: str) -> Tuple[str, List[str], List[str]]:
+    fields = data.split(RECORD_SEPARATOR)
+    if fields[0] != EXPORT_FORMAT_VERSION:
+        raise ContextImportException(
+            "Unsupported exported context format", fields[0][:16]
+        )
+    if len(fields) != 4:
+        raise ContextImportException("Malformed exported context")
+    _, tags, names, values = fields
+    if not tags:
+        return tags, [], []
+    names, values = names.split(UNIT_SEPARATOR), values.split(UNIT_SEPARATOR)
+    if not len(tags) == len(names) == len(values):
+        raise ContextImportException("Malformed exported context")
+    return tags, names, values
+
+
+class ContextImporter:
+    """Imports logging contexts, that were exported by ContextExporter.
+
+    Variable names are validated the same way ContextChange validates them.
+    The last imported context is cached, so importing the same exported
+    context again (for example, for every task sent within the same scope)
+    does not decode it again.
+
+    :param keys: names of the only variables to import (all, if None).
+    :param max_size: maximum length of the exported string.
+    """
+
+    def __init__(
+        self,
+        keys: Optional[Iterable[AnyStr]] = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ):
+        self.keys = None if keys is None else frozenset(keys)
+        self.max_size = max_size
+        self._imported = (None, {})
+
+    def decode(self, data: str) -> dict:
+        """Decode an exported context (ignoring the cache and size limit).
+
+        :param data: exported context.
+        :return: name=value mapping of the imported variables.
+        :raises ContextImportException: when the data can not be imported.
+        """
+        try:
+            update = _decode(*_split(data))
+        except ValueError as e:
+            raise ContextImportException("Malformed exported context") from e
+        if self.keys is not None:
+            update = {k: v for k, v in update.items() if k in self.keys}
+        if not all(map(str.isidentifier, update)):
+            ContextChange.validate_context_variable_names(update)
+        return update
+
+    def load(self, data: str) -> ContextChange:
+        """Import an exported context.
+
+        :param data: exported context.
+        :return: context change, that updates the context with the variables.
+        :raises ContextImportException: when the data can not be imported.
+        """
+        cached_data, update = self._imported
+        if cached_data != data:
+            if len(data) > self.max_size:
+                raise ContextImportException("Exported context is too large")
+            update = self.decode(data)
+            self._imported = (data, update)
+        change = ContextChange()
+        change.context_update = dict(update)
+        return change
+
+
+def export_context(
+    context: Optional[ContextType] = None,
+    keys: Optional[Iterable[AnyStr]] = None,
+    max_size: int = DEFAULT_MAX_SIZE,
+    max_value_size: int = DEFAULT_MAX_VALUE_SIZE,
+) -> str:
+    """Export a logging context as a compact string.
+
+    See ContextExporter (which should be reused, to benefit from its cache).
+
+    :param context: context to be exported (current context, if None).
+    :param keys: names of the only variables to export (all, if None).
+    :param max_size: maximum length of the exported string.
+    :param max_value_size: maximum length of an encoded value.
+    :return: exported context.
+    """
+    return ContextExporter(keys, max_size, max_value_size).export(context)
+
+
+def import_context(
+    data: str,
+    keys: Optional[Iterable[AnyStr]] = None,
+    max_size: int = DEFAULT_MAX_SIZE,
+) -> ContextChange:
+    """Import a logging context, that was exported with export_context.
+
+    See ContextImporter (which should be reused, to benefit from its cache).
+
+    :param data: exported context.
+    :param keys: names of the only variables to import (all, if None).
+    :param max_size: maximum length of the exported string.
+    :return: context change, that updates the context with the variables.
+    :raises ContextImportException: when the data can not be imported.
+    """
+    return ContextImporter(keys, max_size).load(data)
@@ -0,0 +1,351 @@
+"""Defines context change wrappers for coroutines and generators.
+
+These wrappers are used by FrozenContextChange (and therefore ContextChange),
+when they are used as decorators of coroutine functions, generator functions
+or asynchronous generator functions.
+"""
+import inspect
+from collections.abc import Generator
+from contextvars import Context, ContextVar, copy_context
+from functools import wraps
+from threading import get_ident
+from types import coroutine
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .store import ContextStore
+
+# inspect.isasyncgenfunction is not available in python 3.5
+_isasyncgenfunction = getattr(inspect, "isasyncgenfunction", None)
+
+_MISSING = object()
+
+# set to the wrapper in the Context of every wrapped generator body (and
+# inherited by tasks and threads spawned by the body, see get_resumer)
+_RESUMER = ContextVar("LOGGINGEX__CONTEXT__RESUMER")
+
+
+def wrap_coroutine_function(change, func):  # noqa: D202
+    """Decorate coroutine function, so it's awaited within the context change.
+
+    :param change: FrozenContextChange to be applied.
+    :param func: coroutine function to be decorated.
+    :return: decorated coroutine function.
+    """
+    start, stop = change.start, change.stop
+
+    @wraps(func)
+    async def decorated(*args, **kwargs):
+        token = start()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            stop(token)
+
+    return decorated
+
+
+def wrap_generator_function(change, func):  # noqa: D202
+    """Decorate generator function with the context change.
+
+    :param change: FrozenContextChange to be applied.
+    :param func: generator function to be decorated.
+    :return: decorated generator function.
+    """
+
+    @wraps(func)
+    def decorated(*args, **kwargs):
+        return ContextGenerator(change, func(*args, **kwargs))
+
+    return decorated
+
+
+def wrap_async_generator_function(change, func):  # noqa: D202
+    """Decorate asynchronous generator function with the context change.
+
+    :param change: FrozenContextChange to be applied.
+    :param func: asynchronous generator function to be decorated.
+    :return: decorated asynchronous generator function.
+    """
+
+    @wraps(func)
+    def decorated(*args, **kwargs):
+        return ContextAsyncGenerator(change, func(*args, **kwargs))
+
+    return decorated
+
+
+def get_function_wrapper(func) -> Optional[Callable]:
+    """Return the wrapper of a coroutine or generator function.
+
+    :param func: function to be decorated.
+    :return: wrap_* function, that decorates func with a context change, or
+        None, if func is a plain function.
+    """
+    if inspect.iscoroutinefunction(func):
+        return wrap_coroutine_function
+    if inspect.isgeneratorfunction(func):
+        return wrap_generator_function
+    if _isasyncgenfunction and _isasyncgenfunction(func):
+        return wrap_async_generator_function
+    return None
+
+
+class ResumedChange:
+    """Context change, that was started in a running generator body.
+
+    It is returned by ContextResumer.push instead of a token, and it is
+    stopped (by ContextChange, FrozenContextChange or ContextScope) by calling
+    `stop`. ContextScope replaces the change, when it rebinds its variables.
+    """
+
+    __slots__ = ("resumer", "apply", "context")
+
+    def __init__(self, resumer: "ContextResumer", apply: Callable, context):
+        self.resumer = resumer
+        self.apply = apply
+        self.context = context
+
+    def stop(self) -> None:
+        self.resumer.pop(self)
+
+    def replace(self, apply: Callable) -> None:
+        self.resumer.replace(self, apply)
+
+
+def get_resumer() -> Optional["ContextResumer"]:
+    """Return the wrapper of the running generator body (None outside).
+
+    Tasks and threads spawned by the body inherit its Context (and therefore
+    _RESUMER), but they do not run the body itself, so the wrapper is
+    returned only while it runs the body in the current thread.
+    """
+    resumer = _RESUMER.get(None)
+    if resumer is not None and resumer._running == get_ident():
+        return resumer
+    return None
+
+
+class ContextResumer:
+    """Base class of generator wrappers, that apply context change to them.
+
+    Every wrapped generator body runs in its own `contextvars.Context`, so
+    the consumer's context is never changed by it. The Context is a copy of
+    the consumer's Context, taken when the generator is first resumed, so the
+    body sees the other context variables set by the consumer (as they were
+    at that time); only the logging context is handled separately. The
+    logging context of the body consists of three parts: the consumer's
+    (outer) context, the change of the wrapper, and the changes started by
+    the body itself, which are kept on a stack (see `push` and `pop`). When
+    the generator is resumed in another outer context, the change and the
+    stacked changes of the body are re-applied on top of it. While the outer
+    context is the same object, resuming a generator only enters its
+    Context, without any copying.
+
+    :param change: FrozenContextChange to be applied.
+    """
+
+    __slots__ = (
+        "_change",
+        "_variable",
+        "_context",
+        "_outer",
+        "_base",
+        "_stack",
+        "_running",
+    )
+
+    def __init__(self, change):
+        self._change = change
+        self._variable = ContextStore.variable()
+        self._context = None  # type: Optional[Context]
+        self._outer = _MISSING  # type: Any
+        self._base = None  # type: Any
+        self._stack = []  # type: List[ResumedChange]
+        self._running = None  # type: Optional[int]
+
+    def _current(self) -> Any:
+        stack = self._stack
+        return stack[-1].context if stack else self._base
+
+    def _reapply(self, index: int) -> None:
+        """Re-apply the stacked changes of the body from index up."""
+        context = self._stack[index - 1].context if index else self._base
+        for entry in self._stack[index:]:
+            context = entry.context = entry.apply(context)
+
+    def _rebase(self, outer: Any) -> None:
+        """Re-apply the changes on top of a new outer context."""
+        if self._context is None:  # first resume
+            self._context = copy_context()
+            self._context.run(_RESUMER.set, self)
+        self._outer = outer
+        if outer is None:
+            outer = ContextStore.empty_context()
+        self._base = self._change.apply(outer)
+        self._reapply(0)
+        self._context.run(self._variable.set, self._current())
+
+    def _run(self, func: Callable, *args) -> Any:
+        """Call func in the Context of the generator body."""
+        outer = self._variable.get(None)
+        if outer is not self._outer:
+            self._rebase(outer)
+        running, self._running = self._running, get_ident()
+        try:
+            return self._context.run(func, *args)
+        finally:
+            self._running = running
+
+    def push(self, apply: Callable) -> ResumedChange:
+        """Start a context change in the running generator body.
+
+        :param apply: function, that applies the change to a context.
+        :return: ResumedChange, to be stopped instead of a token.
+        """
+        entry = ResumedChange(self, apply, apply(self._current()))
+        self._stack.append(entry)
+        self._variable.set(entry.context)
+        return entry
+
+    def replace(self, entry: ResumedChange, apply: Callable) -> None:
+        """Replace the change of an entry started by `push`.
+
+        The changes stacked on top of the entry are re-applied.
+
+        :param entry: ResumedChange returned by push.
+        :param apply: function, that applies the new change to a context.
+        """
+        entry.apply = apply
+        self._reapply(self._stack.index(entry))
+        if self._running == get_ident():
+            self._variable.set(self._current())
+
+    def pop(self, entry: ResumedChange) -> None:
+        """Stop a context change started by `push`.
+
+        :param entry: ResumedChange returned by push.
+        """
+        stack = self._stack
+        if stack[-1] is entry:
+            stack.pop()
+        else:  # stopped out of order
+            index = stack.index(entry)
+            del stack[index]
+            self._reapply(index)
+        # generators finalized by the garbage collector do not run in their
+        # own Context, and must not change the current one
+        if self._running == get_ident():
+            self._variable.set(self._current())
+
+
+class ContextGenerator(ContextResumer, Generator):
+    """Generator wrapper, that applies context change to it.
+
+    The context change is applied only while the generator body runs, on top
+    of the consumer's context at every resume, and never leaks to the
+    consumer of the generator.
+
+    :param change: FrozenContextChange to be applied.
+    :param gen: generator to be wrapped.
+    """
+
+    __slots__ = ("_gen",)
+
+    def __init__(self, change, gen):
+        super().__init__(change)
+        self._gen = gen
+
+    def __iter__(self) -> Iterator:
+        return self
+
+    def __next__(self) -> Any:
+        # this is the hot path, so _run is inlined
+        outer = self._variable.get(None)
+        if outer is not self._outer:
+            self._rebase(outer)
+        running, self._running = self._running, get_ident()
+        try:
+            return self._context.run(next, self._gen)
+        finally:
+            self._running = running
+
+    def send(self, value: Any) -> Any:
+        return self._run(self._gen.send, value)
+
+    def throw(self, *args) -> Any:
+        return self._run(self._gen.throw, *args)
+
+    def close(self) -> None:
+        self._run(self._gen.close)
+
+
+class ContextAsyncGenerator(ContextResumer):
+    """Asynchronous generator wrapper, that applies context change to it.
+
+    The context change is applied only while the generator body runs (every
+    step of the awaitables returned by the generator is run in the Context of
+    the body), and never leaks to the consumer of the generator.
+
+    :param change: FrozenContextChange to be applied.
+    :param agen: asynchronous generator to be wrapped.
+    """
+
+    __slots__ = ("_agen",)
+
+    def __init__(self, change, agen):
+        super().__init__(change)
+        self._agen = agen
+
+    def _step(self, step: Callable, value: Any) -> Tuple[bool, Any]:
+        """Run a step of an awaitable in the Context of the body.
+
+        :return: (True, result) when the awaitable is done, (False, signal
+            to be yielded to the event loop) otherwise.
+        """
+        try:
+            return False, self._run(step, value)
+        except StopIteration as stop:
+            return True, stop.value
+
+    def _suspend(self, iterator: Iterator, signal: Any):
+        """Yield signal to the event loop, and return the next step."""
+        try:
+            return iterator.send, (yield signal)
+        except GeneratorExit:
+            self._run(iterator.close)
+            raise
+        except BaseException as error:  # noqa: B036 - thrown into the body
+            return iterator.throw, error
+
+    @coroutine
+    def _resume(self, awaitable: Awaitable) -> Any:
+        iterator = awaitable.__await__()
+        step, value = iterator.send, None
+        while True:
+            done, result = self._step(step, value)
+            if done:
+                return result
+            step, value = yield from self._suspend(iterator, result)
+
+    def __aiter__(self) -> "ContextAsyncGenerator":
+        return self
+
+    def __anext__(self) -> Awaitable:
+        return self._resume(self._agen.__anext__())
+
+    def asend(self, value: Any) -> Awaitable:
+        return self._resume(self._agen.asend(value))
+
+    def athrow(self, *args) -> Awaitable:
+        return self._resume(self._agen.athrow(*args))
+
+    def aclose(self) -> Awaitable:
+        return self._resume(self._agen.aclose())
@@ -0,0 +1,6 @@
+"""Defines logging formatters, that are aware of the logging context."""
+from .json_formatter import JsonFormatter
+from .logfmt_formatter import LogfmtFormatter
+from .percent_formatter import PercentFormatter
+
+__all__ = ("JsonFormatter", "LogfmtFormatter", "PercentFormatter")
@@ -0,0 +1,153 @@
+"""Defines JsonFormatter class."""
+import json
+from logging import Formatter, LogRecord
+from typing import Any, AnyStr, Callable, Iterable, Mapping, Optional
+
+from .util import get_context_variables, get_field_getter, get_record_context
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+EncoderType = Callable[[Any], str]
+FieldsType = Mapping[str, str]
+
+DEFAULT_FIELDS = {
+    "time": "created",
+    "level": "levelname",
+    "logger": "name",
+    "message": "message",
+}
+
+
+def json_encoder(value: Any) -> str:
+    """Encode a value as compact JSON, using str for unsupported values."""
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def orjson_encoder(value: Any) -> str:
+    """Encode a value as compact JSON with orjson."""
+    return orjson.dumps(value, default=str).decode("utf-8")
+
+
+def get_default_encoder() -> EncoderType:
+    """Return the fastest available JSON encoder."""
+    return json_encoder if orjson is None else orjson_encoder
+
+
+class JsonFormatter(Formatter):
+    """Formats log records as single line JSON objects.
+
+    The output consists of the configured record fields, followed by the
+    variables of the record's logging context (see `get_record_context`).
+
+    Which record attributes are written under which names is compiled once,
+    when the formatter is created. The context part of the output is encoded
+    once for every context and reused for as long as that context does not
+    change, so per record only the record fields are encoded.
+
+    The special "message" and "asctime" attributes are computed the same way
+    `logging.Formatter` computes them. Exception and stack information is
+    added as "exc_info" and "stack_info" fields, when the record has it.
+
+    If orjson is installed, it is used to encode the values, unless an
+    encoder is given.
+
+    :param fields: output name to record attribute name mapping.
+    :param context: include context variables in the output.
+    :param context_keys: names of the only context variables to include.
+    :param context_renames: context variable name to output name mapping.
+    :param datefmt: date format, used for the "asctime" attribute.
+    :param encoder: a callable, that encodes a value as a JSON string.
+    """
+
+    def __init__(
+        self,
+        fields: Optional[FieldsType] = None,
+        context: bool = True,
+        context_keys: Optional[Iterable[AnyStr]] = None,
+        context_renames: Optional[Mapping[AnyStr, str]] = None,
+        datefmt: Optional[str] = None,
+        encoder: Optional[EncoderType] = None,
+    ):
+        super().__init__(datefmt=datefmt)
+        self.fields = dict(DEFAULT_FIELDS if fields is None else fields)
+        self.context = context
+        self.context_keys = (
+            None if context_keys is None else frozenset(context_keys)
+        )
+        self.context_renames = dict(context_renames or {})
+        self.encoder = encoder or get_default_encoder()
+        self._field_plan = tuple(
+            (name, get_field_getter(self, attr))
+            for name, attr in self.fields.items()
+        )
+        self._context_fragment = (None, "")
+
+    def get_context_fragment(self, record: LogRecord) -> str:
+        """Return encoded context variables of the record.
+
+        :param record: LogRecord to get the context of.
+        :return: comma separated "name":value pairs (without braces).
+        """
+        context = get_record_context(record)
+        cached_context, fragment = self._context_fragment
+        if cached_context is not context:
+            fragment = self.encode_context(context)
+            self._context_fragment = (context, fragment)
+        return fragment
+
+    def encode_context(self, context: Mapping) -> str:
+        """Encode context variables (ignoring the cache).
+
+        :param context: logging context.
+        :return: comma separated "name":value pairs (without braces).
+        """
+        variables = get_context_variables(
+            context, self.context_keys, self.context_renames, self.fields.keys()
+        )
+        return self.encoder(variables)[1:-1]
+
+    def get_fields(self, record: LogRecord) -> dict:
+        """Return record fields, that should be added to the output.
+
+        :param record: LogRecord to be formatted.
+        :return: output name to value mapping.
+        """
+        fields = {name: getter(record) for name, getter in self._field_plan}
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            fields["exc_info"] = record.exc_text
+        if record.stack_info:
+            fields["stack_info"] = self.formatStack(record.stack_info)
+        return fields
+
+    def format(self, record: LogRecord) -> str:  # noqa: A003
+        """Format the record as a single line JSON object.
+
+        :param record: LogRecord to be formatted.
+        :return: JSON object.
+        """
+        output = self.encoder(self.get_fields(record))
+        if not self.context:
+            return output
+        fragment = self.get_context_fragment(record)
+        if not fragment:
+            return output
+        if output == "{}":
+            return "{" + fragment + "}"
+        return output[:-1] + "," + fragment + "}"
+
+    def format_batch(self, records: Iterable[LogRecord]) -> str:
+        """Format records as newline delimited JSON objects.
+
+        :param records: LogRecords to be formatted.
+        :return: newline terminated JSON lines.
+        """
+        lines = [self.format(record) for record in records]
+        if not lines:
+            return ""
+        lines.append("")
+        return "\n".join(lines)
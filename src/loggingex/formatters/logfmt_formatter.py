@@ -0,0 +1,150 @@
+"""Defines LogfmtFormatter class."""
+import json
+from logging import Formatter, LogRecord
+from typing import Any, AnyStr, Iterable, List, Mapping, Optional
+
+from .util import get_context_variables, get_field_getter, get_record_context
+
+FieldsType = Mapping[str, str]
+
+DEFAULT_FIELDS = {
+    "time": "created",
+    "level": "levelname",
+    "logger": "name",
+    "msg": "message",
+}
+
+# characters, that require a logfmt value to be quoted
+_QUOTED_CHARACTERS = frozenset(' ="\\')
+
+
+def format_logfmt_value(value: Any) -> str:
+    """Format a value for logfmt output.
+
+    None is formatted as an empty value, booleans as true and false. Other
+    values are converted to strings, that are quoted (and escaped) if they
+    are empty, or contain whitespace, quotes, backslashes, equal signs or
+    control characters.
+
+    :param value: value to be formatted.
+    :return: formatted value.
+    """
+    if value is None:
+        return ""
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    value = str(value)
+    if not value or not value.isprintable() or _needs_quotes(value):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _needs_quotes(value: str) -> bool:
+    return not _QUOTED_CHARACTERS.isdisjoint(value)
+
+
+class LogfmtFormatter(Formatter):
+    """Formats log records as logfmt (key=value) lines.
+
+    The output consists of the configured record fields, followed by the
+    variables of the record's logging context (see `get_record_context`).
+
+    The context segment of the output is rendered once for every context and
+    reused for as long as that context does not change - that is, once per
+    scope with a persistent context store. Per record only the record fields
+    are formatted and concatenated with the cached segment.
+
+    The special "message" and "asctime" attributes are computed the same way
+    `logging.Formatter` computes them. Exception and stack information is
+    added as "exc_info" and "stack_info" fields, when the record has it.
+
+    :param fields: output name to record attribute name mapping.
+    :param context: include context variables in the output.
+    :param context_keys: names of the only context variables to include.
+    :param context_renames: context variable name to output name mapping.
+    :param datefmt: date format, used for the "asctime" attribute.
+    """
+
+    def __init__(
+        self,
+        fields: Optional[FieldsType] = None,
+        context: bool = True,
+        context_keys: Optional[Iterable[AnyStr]] = None,
+        context_renames: Optional[Mapping[AnyStr, str]] = None,
+        datefmt: Optional[str] = None,
+    ):
+        super().__init__(datefmt=datefmt)
+        self.fields = dict(DEFAULT_FIELDS if fields is None else fields)
+        self.context = context
+        self.context_keys = (
+            None if context_keys is None else frozenset(context_keys)
+        )
+        self.context_renames = dict(context_renames or {})
+        self._field_plan = tuple(
+            (name + "=", get_field_getter(self, attr))
+            for name, attr in self.fields.items()
+        )
+        self._context_segment = (None, "")
+
+    def get_context_segment(self, record: LogRecord) -> str:
+        """Return rendered context variables of the record.
+
+        :param record: LogRecord to get the context of.
+        :return: space separated key=value pairs.
+        """
+        context = get_record_context(record)
+        cached_context, segment = self._context_segment
+        if cached_context is not context:
+            segment = self.render_context(context)
+            self._context_segment = (context, segment)
+        return segment
+
+    def render_context(self, context: Mapping) -> str:
+        """Render context variables (ignoring the cache).
+
+        :param context: logging context.
+        :return: space separated key=value pairs.
+        """
+        variables = get_context_variables(
+            context, self.context_keys, self.context_renames, self.fields.keys()
+        )
+        return " ".join(
+            "%s=%s" % (name, format_logfmt_value(value))
+            for name, value in variables.items()
+        )
+
+    def format(self, record: LogRecord) -> str:  # noqa: A003
+        """Format the record as a logfmt line.
+
+        :param record: LogRecord to be formatted.
+        :return: logfmt line.
+        """
+        parts = [
+            prefix + format_logfmt_value(getter(record))
+            for prefix, getter in self._field_plan
+        ]
+        if self.context:
+            segment = self.get_context_segment(record)
+            if segment:
+                parts.append(segment)
+        if record.exc_info or record.exc_text or record.stack_info:
+            parts.extend(self.get_traceback_parts(record))
+        return " ".join(parts)
+
+    def get_traceback_parts(self, record: LogRecord) -> List[str]:
+        """Return rendered exception and stack information of the record.
+
+        :param record: LogRecord to be formatted.
+        :return: list of key=value pairs.
+        """
+        parts = []
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            parts.append("exc_info=" + format_logfmt_value(record.exc_text))
+        if record.stack_info:
+            stack = self.formatStack(record.stack_info)
+            parts.append("stack_info=" + format_logfmt_value(stack))
+        return parts
@@ -0,0 +1,99 @@
+"""Defines PercentFormatter class."""
+import re
+import time
+from logging import Formatter, LogRecord
+from typing import Any, Mapping, Optional, Tuple
+
+from .util import get_record_context
+from ..context.lazy import resolve_value
+
+_FIELD_PATTERN = re.compile(r"%%|%\((\w+)\)")
+
+_MISSING = object()
+
+
+def get_format_field_names(fmt: str) -> Tuple[str, ...]:
+    """Return names of the fields used in a %-style format string.
+
+    :param fmt: format string.
+    :return: tuple of unique field names, in order of appearance.
+    """
+    names = (m.group(1) for m in _FIELD_PATTERN.finditer(fmt))
+    return tuple(dict.fromkeys(name for name in names if name))
+
+
+class PercentFormatter(Formatter):
+    """%-style formatter, that can use context variables and field defaults.
+
+    The format string is compiled once, into the list of fields it uses.
+    Every field is looked up in the record, then in the record's logging
+    context (see `get_record_context`), so the formatter can be used without
+    LoggingContextFilter. If a field is still missing, its default is used,
+    or ValueError is raised if it has none.
+
+    The formatted asctime (without milliseconds) is cached for the current
+    second, so `time.strftime` is called at most once per second.
+
+    :param fmt: %-style format string.
+    :param datefmt: date format, used for the "asctime" field.
+    :param defaults: field name to default value mapping.
+    """
+
+    def __init__(
+        self,
+        fmt: Optional[str] = None,
+        datefmt: Optional[str] = None,
+        defaults: Optional[Mapping[str, Any]] = None,
+    ):
+        super().__init__(fmt, datefmt)
+        self.defaults = dict(defaults or {})
+        self._field_names = get_format_field_names(self._style._fmt)
+        self._asctime = (None, None, "")
+
+    def get_field(self, name: str, context: Mapping) -> Any:
+        """Return value of a field, that is not a record attribute.
+
+        :param name: field name.
+        :param context: logging context of the record.
+        :return: context variable or default value.
+        """
+        value = context.get(name, _MISSING)
+        if value is not _MISSING:
+            return resolve_value(value)
+        value = self.defaults.get(name, _MISSING)
+        if value is not _MISSING:
+            return value
+        raise ValueError("Formatting field not found in record: %r" % name)
+
+    def formatMessage(self, record: LogRecord) -> str:  # noqa: N802
+        """Return the record formatted with the compiled format string."""
+        attributes = record.__dict__
+        context = None
+        values = {}
+        for name in self._field_names:
+            value = attributes.get(name, _MISSING)
+            if value is _MISSING:
+                if context is None:
+                    context = get_record_context(record)
+                value = self.get_field(name, context)
+            values[name] = value
+        return self._style._fmt % values
+
+    def formatTime(  # noqa: N802
+        self, record: LogRecord, datefmt: Optional[str] = None
+    ) -> str:
+        """Return formatted creation time of the record.
+
+        Works like `logging.Formatter.formatTime`, but caches the formatted
+        time of the current second.
+        """
+        second = int(record.created)
+        cached_second, cached_datefmt, formatted = self._asctime
+        if cached_second != second or cached_datefmt != datefmt:
+            struct_time = self.converter(record.created)
+            fmt = datefmt or self.default_time_format
+            formatted = time.strftime(fmt, struct_time)
+            self._asctime = (second, datefmt, formatted)
+        if datefmt or not self.default_msec_format:
+            return formatted
+        return self.default_msec_format % (formatted, record.msecs)
@@ -0,0 +1,75 @@
+"""Defines helper functions used by loggingex formatters."""
+from logging import Formatter, LogRecord
+from typing import AbstractSet, Any, AnyStr, Callable, Dict, Mapping, Optional
+
+from ..context.filter import INJECTED_CONTEXT_ATTRIBUTE
+from ..context.lazy import resolve_value
+from ..context.store import ContextStore, ContextType
+from ..handlers.queue_handler import QUEUED_CONTEXT_ATTRIBUTE
+
+FieldGetterType = Callable[[LogRecord], Any]
+
+
+def get_record_context(record: LogRecord) -> ContextType:
+    """Return the logging context of given record.
+
+    This is the context, that was injected into the record by
+    LoggingContextFilter (or LoggingContextRecordFactory), or the context
+    saved in the record by ContextQueueHandler. If there is neither, then the
+    current context is returned.
+
+    Contexts are never modified, so formatters can use the identity of the
+    returned context to cache whatever they derive from it.
+
+    :param record: LogRecord to get the context of.
+    :return: logging context.
+    """
+    context = record.__dict__.get(INJECTED_CONTEXT_ATTRIBUTE)
+    if context is None:
+        context = record.__dict__.get(QUEUED_CONTEXT_ATTRIBUTE)
+    if context is None:
+        context = ContextStore().get()
+    return context
+
+
+def get_field_getter(formatter: Formatter, attr: str) -> FieldGetterType:
+    """Return a callable, that gets an attribute value of a record.
+
+    The special "message" and "asctime" attributes are computed the same way
+    `logging.Formatter` computes them. Missing attributes are None.
+
+    :param formatter: formatter, that is used to format asctime.
+    :param attr: record attribute name.
+    :return: callable, that takes a LogRecord and returns the value.
+    """
+    if attr == "message":
+        return LogRecord.getMessage
+    if attr == "asctime":
+        return lambda record: formatter.formatTime(record, formatter.datefmt)
+    return lambda record: record.__dict__.get(attr)
+
+
+def get_context_variables(
+    context: ContextType,
+    keys: Optional[AbstractSet[AnyStr]] = None,
+    renames: Optional[Mapping[AnyStr, str]] = None,
+    exclude: AbstractSet[str] = frozenset(),
+) -> Dict[str, Any]:
+    """Return context variables, that should be formatted.
+
+    Lazy values are resolved.
+
+    :param context: logging context.
+    :param keys: names of the only variables to return (all, if None).
+    :param renames: variable name to output name mapping.
+    :param exclude: output names, that should not be returned.
+    :return: output name to value mapping.
+    """
+    renames = renames or {}
+    variables = {}
+    for key, value in context.items():
+        if keys is None or key in keys:
+            name = renames.get(key, key)
+            if name not in exclude:
+                variables[name] = resolve_value(value)
+    return variables
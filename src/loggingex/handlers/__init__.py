@@ -0,0 +1,24 @@
+"""Defines logging handlers, that are aware of the logging context."""
+from .batch_handler import BatchStreamHandler
+from .exceptions import HandlerException, InvalidQueuePolicyException
+from .queue_handler import (
+    ContextQueueHandler,
+    ContextQueueListener,
+    POLICY_BLOCK,
+    POLICY_COALESCE,
+    POLICY_DROP,
+)
+
+__all__ = (
+    # exceptions
+    "HandlerException",
+    "InvalidQueuePolicyException",
+    # queue handler policies
+    "POLICY_BLOCK",
+    "POLICY_COALESCE",
+    "POLICY_DROP",
+    # public api
+    "BatchStreamHandler",
+    "ContextQueueHandler",
+    "ContextQueueListener",
+)
@@ -0,0 +1,82 @@
+"""Defines BatchStreamHandler class."""
+from logging import ERROR, LogRecord, StreamHandler
+from typing import List, Optional, TextIO
+
+from .queue_handler import QUEUED_CONTEXT_ATTRIBUTE
+from ..context.filter import INJECTED_CONTEXT_ATTRIBUTE
+from ..context.store import ContextStore
+
+
+class BatchStreamHandler(StreamHandler):
+    """Stream handler, that writes buffered records in batches.
+
+    Records are buffered, until `capacity` records are buffered, or a record
+    of `flush_level` (or higher) is handled. The whole batch is then formatted
+    and written to the stream with a single write.
+
+    If the formatter has a `format_batch` method (like JsonFormatter), it is
+    used to format the batch. Otherwise, each record is formatted separately
+    and followed by the terminator.
+
+    The current context is saved in every buffered record (the same way
+    ContextQueueHandler does), so records are formatted with the context
+    they were logged in, not with the context current at flush time.
+
+    :param stream: stream to write to (sys.stderr, if None).
+    :param capacity: maximum number of buffered records.
+    :param flush_level: records of this level cause an immediate flush.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        capacity: int = 100,
+        flush_level: int = ERROR,
+    ):
+        super().__init__(stream)
+        self.capacity = capacity
+        self.flush_level = flush_level
+        self.buffer = []  # type: List[LogRecord]
+
+    def emit(self, record: LogRecord) -> None:
+        attributes = record.__dict__
+        if INJECTED_CONTEXT_ATTRIBUTE not in attributes:
+            if QUEUED_CONTEXT_ATTRIBUTE not in attributes:
+                attributes[QUEUED_CONTEXT_ATTRIBUTE] = ContextStore().get()
+        self.buffer.append(record)
+        if record.levelno >= self.flush_level:
+            self.flush()
+        elif len(self.buffer) >= self.capacity:
+            self.flush()
+
+    def format_batch(self, records: List[LogRecord]) -> str:
+        """Format a batch of records.
+
+        :param records: records to be formatted.
+        :return: formatted records, each followed by the terminator.
+        """
+        format_batch = getattr(self.formatter, "format_batch", None)
+        if format_batch is not None:
+            return format_batch(records)
+        terminator = self.terminator
+        return "".join(self.format(r) + terminator for r in records)
+
+    def flush(self) -> None:
+        """Write all buffered records to the stream."""
+        self.acquire()
+        try:
+            records, self.buffer = self.buffer, []
+            if records:
+                try:
+                    self.stream.write(self.format_batch(records))
+                except Exception:
+                    self.handleError(records[-1])
+            super().flush()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            super().close()
@@ -0,0 +1,10 @@
+"""Exceptions used by loggingex.handlers."""
+from ..exceptions import LoggingExtensionsException
+
+
+class HandlerException(LoggingExtensionsException):
+    pass
+
+
+class InvalidQueuePolicyException(HandlerException):
+    pass
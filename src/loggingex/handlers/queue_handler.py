@@ -0,0 +1,154 @@
+"""Defines ContextQueueHandler and ContextQueueListener classes."""
+from logging import LogRecord, WARNING, makeLogRecord
+from logging.handlers import QueueHandler, QueueListener
+from queue import Full, Queue
+from typing import Optional
+
+from .exceptions import InvalidQueuePolicyException
+from ..context.store import ContextStore
+
+# backpressure policies
+POLICY_BLOCK = "block"
+POLICY_DROP = "drop"
+POLICY_COALESCE = "coalesce"
+POLICIES = (POLICY_BLOCK, POLICY_DROP, POLICY_COALESCE)
+
+# queued records keep a reference to the context, that was current when they
+# were enqueued, in this attribute
+QUEUED_CONTEXT_ATTRIBUTE = "_loggingex_queued_context"
+
+COALESCED_RECORD_LOGGER_NAME = "loggingex.handlers.queue"
+COALESCED_RECORD_MESSAGE = "%d log records were dropped, queue was full"
+
+
+class ContextQueueHandler(QueueHandler):
+    """Non-blocking queue handler, that keeps the logging context of records.
+
+    The current context snapshot is saved (by reference - it is never copied)
+    in every enqueued record, so that ContextQueueListener could handle the
+    record within the same context in its background thread. Unlike the
+    standard QueueHandler, records are not formatted when they are enqueued -
+    all formatting is left to the handlers of the listener. Note, that this
+    means that record arguments must not be modified after they are logged.
+
+    When the queue is full, records are handled according to the policy:
+
+    * "block" - wait for room in the queue (for at most `timeout` seconds,
+      if it is given, records are dropped after that);
+    * "drop" - drop the record;
+    * "coalesce" - drop the record, and once the queue has room again,
+      enqueue a single warning record, that reports how many records were
+      dropped.
+
+    The number of enqueued and dropped records is counted in `enqueued` and
+    `dropped` attributes.
+
+    :param queue: queue to be used (a new bounded Queue is created, if None).
+    :param maxsize: maximum size of the new queue.
+    :param policy: what to do with records, when the queue is full.
+    :param timeout: maximum time to wait for room in the queue (with "block"
+        policy).
+    """
+
+    def __init__(
+        self,
+        queue: Optional[Queue] = None,
+        maxsize: int = 10000,
+        policy: str = POLICY_DROP,
+        timeout: Optional[float] = None,
+    ):
+        if policy not in POLICIES:
+            raise InvalidQueuePolicyException(
+                "Queue policy must be one of %r" % (POLICIES,), policy
+            )
+        super().__init__(Queue(maxsize) if queue is None else queue)
+        self.policy = policy
+        self.timeout = timeout
+        self.enqueued = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        """Save current context snapshot in the record.
+
+        :param record: record to be enqueued.
+        :return: the same record.
+        """
+        if QUEUED_CONTEXT_ATTRIBUTE not in record.__dict__:
+            context = ContextStore().get()
+            record.__dict__[QUEUED_CONTEXT_ATTRIBUTE] = context
+        return record
+
+    def enqueue(self, record: LogRecord) -> None:
+        """Enqueue a record, according to the configured policy.
+
+        Note: this is called while the handler lock is held, so the counters
+        do not need additional locking.
+
+        :param record: record to be enqueued.
+        """
+        if self.coalesced:
+            if not self._put(self.make_coalesced_record()):
+                self.dropped += 1
+                self.coalesced += 1
+                return
+            self.coalesced = 0
+        if self._put(record):
+            self.enqueued += 1
+            return
+        self.dropped += 1
+        if self.policy == POLICY_COALESCE:
+            self.coalesced += 1
+
+    def _put(self, record: LogRecord) -> bool:
+        try:
+            if self.policy == POLICY_BLOCK:
+                self.queue.put(record, True, self.timeout)
+            else:
+                self.queue.put_nowait(record)
+        except Full:
+            return False
+        return True
+
+    def make_coalesced_record(self) -> LogRecord:
+        """Return a record, that reports the number of coalesced records.
+
+        :return: a new warning record.
+        """
+        record = makeLogRecord(
+            {
+                "name": COALESCED_RECORD_LOGGER_NAME,
+                "levelno": WARNING,
+                "levelname": "WARNING",
+                "msg": COALESCED_RECORD_MESSAGE,
+                "args": (self.coalesced,),
+            }
+        )
+        return self.prepare(record)
+
+
+class ContextQueueListener(QueueListener):
+    """Queue listener, that handles records within their saved contexts.
+
+    Records enqueued by ContextQueueHandler carry the context, that was
+    current when they were logged. The listener makes that context current
+    while the record is passed to the handlers, so LoggingContextFilter (and
+    anything else that reads ContextStore) sees the right context, even
+    though it runs in the background thread of the listener.
+    """
+
+    def handle(self, record: LogRecord) -> None:
+        """Handle a record within the context saved in it.
+
+        :param record: record to be handled.
+        """
+        context = record.__dict__.get(QUEUED_CONTEXT_ATTRIBUTE)
+        if context is None:
+            super().handle(record)
+            return
+        context_store = ContextStore()
+        token = context_store.replace(context)
+        try:
+            super().handle(record)
+        finally:
+            context_store.restore(token)
@@ -0,0 +1,28 @@
+"""Defines trace context and request id propagation helpers."""
+from .http_client import install, is_installed, uninstall
+from .request_id import (
+    RequestIdGenerator,
+    generate_request_id,
+    is_valid_request_id,
+)
+from .trace_context import (
+    TraceParent,
+    format_traceparent,
+    get_trace_context,
+    get_trace_headers,
+    parse_traceparent,
+)
+
+__all__ = (
+    "RequestIdGenerator",
+    "TraceParent",
+    "format_traceparent",
+    "generate_request_id",
+    "get_trace_context",
+    "get_trace_headers",
+    "install",
+    "is_installed",
+    "is_valid_request_id",
+    "parse_traceparent",
+    "uninstall",
+)
@@ -0,0 +1,58 @@
+"""Defines an opt-in hook, that adds trace context to outgoing requests.
+
+When installed, every request made with `http.client.HTTPConnection` (and
+`HTTPSConnection`), including requests made with `urllib.request`, gets
+traceparent and tracestate headers built from the current logging context
+(see `get_trace_headers`). Headers set explicitly by the caller are never
+overridden.
+"""
+from http.client import HTTPConnection
+from typing import Mapping
+
+from .trace_context import get_trace_headers
+from ..context.store import ContextStore
+
+_original_request = None
+
+
+def add_trace_headers(headers: Mapping[str, str]) -> Mapping[str, str]:
+    """Return request headers with trace context headers added.
+
+    :param headers: request headers.
+    :return: a new dictionary with missing trace context headers added, or
+        headers themselves, if nothing needs to be added.
+    """
+    trace_headers = get_trace_headers(ContextStore().get())
+    if not trace_headers:
+        return headers
+    present = {name.lower() for name in headers}
+    missing = {k: v for k, v in trace_headers.items() if k not in present}
+    if not missing:
+        return headers
+    return dict(headers, **missing)
+
+
+def _request(self, method, url, body=None, headers=None, **kwargs):
+    headers = add_trace_headers({} if headers is None else headers)
+    return _original_request(self, method, url, body, headers, **kwargs)
+
+
+def is_installed() -> bool:
+    """Return True if the http.client hook is installed."""
+    return _original_request is not None
+
+
+def install() -> None:
+    """Install the http.client hook (does nothing, if it is installed)."""
+    global _original_request
+    if _original_request is None:
+        _original_request = HTTPConnection.request
+        HTTPConnection.request = _request
+
+
+def uninstall() -> None:
+    """Uninstall the http.client hook (does nothing, if it is not installed)."""
+    global _original_request
+    if _original_request is not None:
+        HTTPConnection.request = _original_request
+        _original_request = None
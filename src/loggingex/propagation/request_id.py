@@ -0,0 +1,69 @@
+"""Defines request id generation helpers."""
+import os
+from binascii import hexlify
+from itertools import count
+from threading import Lock
+from typing import Optional
+
+REQUEST_ID_NAME = "request_id"
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# maximum length of inbound request ids, that are reused
+MAX_REQUEST_ID_LENGTH = 128
+
+# number of random bytes in the per-process prefix
+PREFIX_SIZE = 8
+
+
+class RequestIdGenerator:
+    """Generates unique request ids, without a system call per id.
+
+    Request ids consist of a random per-process prefix (64 bits, read from
+    os.urandom once) and a hex counter, for example
+    "1f2e3d4c5b6a7988-2a". The prefix is renewed in forked child processes,
+    so that they never generate ids of their parent (on python versions
+    without os.register_at_fork, the process id is checked for every id).
+
+    Generating an id is thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._pid = None  # type: Optional[int]
+        self._prefix = ""
+        self._counter = count()
+        self.reset()
+        register_at_fork = getattr(os, "register_at_fork", None)
+        self._check_pid = register_at_fork is None
+        if register_at_fork is not None:
+            register_at_fork(after_in_child=self.reset)
+
+    def reset(self) -> None:
+        """Start a new sequence of ids, with a new random prefix."""
+        with self._lock:
+            self._prefix = hexlify(os.urandom(PREFIX_SIZE)).decode() + "-"
+            self._counter = count(1)
+            self._pid = os.getpid()
+
+    def __call__(self) -> str:
+        """Return a new request id."""
+        if self._check_pid and os.getpid() != self._pid:
+            self.reset()
+        return "%s%x" % (self._prefix, next(self._counter))
+
+
+generate_request_id = RequestIdGenerator()
+
+
+def is_valid_request_id(value: Optional[str]) -> bool:
+    """Return True if an inbound request id can be reused.
+
+    Request ids must not be empty, longer than MAX_REQUEST_ID_LENGTH, or
+    contain whitespace or control characters.
+
+    :param value: inbound request id.
+    :return: True if the request id is valid.
+    """
+    if not value or len(value) > MAX_REQUEST_ID_LENGTH:
+        return False
+    return value.isprintable() and " " not in value
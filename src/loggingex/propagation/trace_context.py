@@ -0,0 +1,123 @@
+"""Defines W3C Trace Context (traceparent and tracestate) helpers."""
+from collections import namedtuple
+from typing import Dict, Optional
+
+from ..context.lazy import resolve_value
+from ..context.store import ContextType
+
+# logging context variable names
+TRACE_ID_NAME = "trace_id"
+SPAN_ID_NAME = "span_id"
+TRACE_FLAGS_NAME = "trace_flags"
+TRACE_STATE_NAME = "trace_state"
+
+TRACEPARENT_HEADER = "traceparent"
+TRACESTATE_HEADER = "tracestate"
+
+# length of the version 00 traceparent header value
+TRACEPARENT_LENGTH = 55
+
+_HEX_DIGITS = frozenset("0123456789abcdef")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+TraceParent = namedtuple(
+    "TraceParent", ("version", "trace_id", "span_id", "trace_flags")
+)
+
+
+def _is_valid_traceparent_format(value: str) -> bool:
+    if len(value) < TRACEPARENT_LENGTH:
+        return False
+    if value[2] != "-" or value[35] != "-" or value[52] != "-":
+        return False
+    if len(value) > TRACEPARENT_LENGTH and value[55] != "-":
+        return False
+    hex_digits = value[:2] + value[3:35] + value[36:52] + value[53:55]
+    return _HEX_DIGITS.issuperset(hex_digits)
+
+
+def _is_valid_traceparent_version(value: str) -> bool:
+    version = value[:2]
+    if version == "00":
+        return len(value) == TRACEPARENT_LENGTH
+    return version != "ff"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[TraceParent]:
+    """Parse a traceparent header value.
+
+    Follows the W3C Trace Context specification: version "ff", all-zero trace
+    and span ids, and upper case hex digits are invalid. Values of future
+    versions may have more fields, that are ignored.
+
+    :param value: traceparent header value.
+    :return: parsed TraceParent, or None, if the value is not valid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if not _is_valid_traceparent_format(value):
+        return None
+    if not _is_valid_traceparent_version(value):
+        return None
+    trace_id, span_id = value[3:35], value[36:52]
+    if trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return TraceParent(value[:2], trace_id, span_id, value[53:55])
+
+
+def format_traceparent(trace_id: str, span_id: str, trace_flags: str) -> str:
+    """Return a version 00 traceparent header value."""
+    return "00-%s-%s-%s" % (trace_id, span_id, trace_flags)
+
+
+def get_trace_context(
+    traceparent: Optional[str], tracestate: Optional[str] = None
+) -> ContextType:
+    """Return logging context variables of inbound trace context headers.
+
+    Tracestate is ignored, when traceparent is missing or not valid.
+
+    :param traceparent: traceparent header value.
+    :param tracestate: tracestate header value.
+    :return: trace_id, span_id, trace_flags (and trace_state) variables, or
+        an empty dictionary, if traceparent is missing or not valid.
+    """
+    parent = parse_traceparent(traceparent)
+    if parent is None:
+        return {}
+    trace_context = {
+        TRACE_ID_NAME: parent.trace_id,
+        SPAN_ID_NAME: parent.span_id,
+        TRACE_FLAGS_NAME: parent.trace_flags,
+    }
+    tracestate = tracestate.strip() if tracestate else None
+    if tracestate:
+        trace_context[TRACE_STATE_NAME] = tracestate
+    return trace_context
+
+
+def get_trace_headers(context: ContextType) -> Dict[str, str]:
+    """Return outbound trace context headers for a logging context.
+
+    The service is treated as a pass-through - trace_id and span_id of the
+    context (usually the ones received with the inbound request) are
+    propagated as they are.
+
+    :param context: logging context.
+    :return: traceparent (and tracestate) headers, or an empty dictionary,
+        if the context has no trace_id and span_id variables.
+    """
+    trace_id = resolve_value(context.get(TRACE_ID_NAME))
+    span_id = resolve_value(context.get(SPAN_ID_NAME))
+    if not trace_id or not span_id:
+        return {}
+    trace_flags = resolve_value(context.get(TRACE_FLAGS_NAME)) or "00"
+    headers = {
+        TRACEPARENT_HEADER: format_traceparent(trace_id, span_id, trace_flags)
+    }
+    tracestate = resolve_value(context.get(TRACE_STATE_NAME))
+    if tracestate:
+        headers[TRACESTATE_HEADER] = tracestate
+    return headers
@@ -1,4 +1,22 @@
 """Defines various logging utilities for WSGI applications."""
+from .exceptions import InvalidRoutePolicyException, WSGIException
 from .request_context import RequestContextMiddleware
+from .routes import (
+    POLICY_HEADERS,
+    POLICY_REQUEST,
+    POLICY_SKIP,
+    POLICY_WSGI,
+)
 
-__all__ = ("RequestContextMiddleware",)
+__all__ = (
+    # exceptions
+    "InvalidRoutePolicyException",
+    "WSGIException",
+    # route policies
+    "POLICY_HEADERS",
+    "POLICY_REQUEST",
+    "POLICY_SKIP",
+    "POLICY_WSGI",
+    # public api
+    "RequestContextMiddleware",
+)
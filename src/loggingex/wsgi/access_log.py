@@ -0,0 +1,158 @@
+"""Defines WSGI access log helpers."""
+import time
+from logging import Logger
+from typing import Iterable, List, Optional, Tuple
+
+from .response import ContextResponse
+from ..context.store import ContextType
+
+ACCESS_LOGGER_NAME = "loggingex.wsgi.access"
+ACCESS_LOG_MESSAGE = '"%s %s %s" %s %d %.3fms'
+
+# time.perf_counter_ns is not available in python < 3.7
+perf_counter_ns = getattr(time, "perf_counter_ns", None) or (
+    lambda: int(time.perf_counter() * 1e9)
+)
+
+HeadersType = List[Tuple[str, str]]
+
+
+def get_request_line(request_context: ContextType) -> Tuple[str, str, str]:
+    """Return method, path (with query string) and protocol of a request.
+
+    :param request_context: context returned by `get_wsgi_request_context`.
+    :return: (method, path, protocol) tuple.
+    """
+    path = request_context.get("request_script_name", "") + (
+        request_context.get("request_path_info", "")
+    )
+    query = request_context.get("request_query_string")
+    if query:
+        path += "?" + query
+    return (
+        request_context.get("request_method", "-"),
+        path or "/",
+        request_context.get("request_server_protocol", "-"),
+    )
+
+
+class AccessLog:
+    """Collects response information of a single request, and logs it.
+
+    The access log record is logged once, with the response status, size and
+    duration (from the creation of this object) as the message arguments.
+    They are also available as `response_status`, `response_size` and
+    `response_time_ms` attributes of the record, together with the
+    `response_headers`.
+
+    :param logger: logger to log the access log record with.
+    :param level: access log record level.
+    """
+
+    __slots__ = (
+        "logger",
+        "level",
+        "started",
+        "status",
+        "headers",
+        "size",
+        "logged",
+    )
+
+    def __init__(self, logger: Logger, level: int):
+        self.logger = logger
+        self.level = level
+        self.started = perf_counter_ns()
+        self.status = None  # type: Optional[str]
+        self.headers = []  # type: HeadersType
+        self.size = 0
+        self.logged = False
+
+    def wrap_start_response(self, start_response):
+        """Wrap start_response, so that it captures status and headers."""
+
+        def start_response_with_access_log(status, headers, exc_info=None):
+            self.status = status
+            self.headers = headers
+            return start_response(status, headers, exc_info)
+
+        return start_response_with_access_log
+
+    def get_content_length(self) -> int:
+        """Return the Content-Length response header value (or 0)."""
+        for name, value in self.headers:
+            if name.lower() == "content-length" and value.isdigit():
+                return int(value)
+        return 0
+
+    def log_error(self, request_context: ContextType) -> None:
+        """Log the access log record of a request, that raised an exception.
+
+        The server responds with an error, when the application raises, so
+        the record is logged with 500 status and no response headers.
+
+        :param request_context: context returned by `get_wsgi_request_context`.
+        """
+        self.status = "500 Internal Server Error"
+        self.headers = []
+        self.log(request_context)
+
+    def log(self, request_context: ContextType) -> None:
+        """Log the access log record (only the first call logs it).
+
+        :param request_context: context returned by `get_wsgi_request_context`.
+        """
+        if self.logged or not self.logger.isEnabledFor(self.level):
+            return
+        self.logged = True
+        duration = (perf_counter_ns() - self.started) / 1e6
+        status = (self.status or "-").split(" ", 1)[0]
+        extra = {
+            "response_status": int(status) if status.isdigit() else None,
+            "response_size": self.size,
+            "response_time_ms": duration,
+            "response_headers": self.headers,
+        }
+        method, path, protocol = get_request_line(request_context)
+        self.logger.log(
+            self.level,
+            ACCESS_LOG_MESSAGE,
+            method,
+            path,
+            protocol,
+            status,
+            self.size,
+            duration,
+            extra=extra,
+        )
+
+
+class AccessLogResponse(ContextResponse):
+    """ContextResponse, that counts response bytes and logs access on close.
+
+    :param iterable: response iterable returned by the WSGI application.
+    :param context: request logging context.
+    :param access_log: AccessLog of the request.
+    """
+
+    __slots__ = ("access_log",)
+
+    def __init__(
+        self,
+        iterable: Iterable[bytes],
+        context: ContextType,
+        access_log: AccessLog,
+    ):
+        super().__init__(iterable, context)
+        self.access_log = access_log
+
+    def __next__(self) -> bytes:
+        chunk = super().__next__()
+        self.access_log.size += len(chunk)
+        return chunk
+
+    def close_iterable(self) -> None:
+        try:
+            super().close_iterable()
+        finally:
+            self.access_log.log(self.context)
@@ -0,0 +1,10 @@
+"""Exceptions used by loggingex.wsgi."""
+from ..exceptions import LoggingExtensionsException
+
+
+class WSGIException(LoggingExtensionsException):
+    pass
+
+
+class InvalidRoutePolicyException(WSGIException):
+    pass
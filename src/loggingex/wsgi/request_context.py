@@ -1,6 +1,30 @@
 """Defines a WSGI request context middleware."""
-from .util import get_wsgi_request_context
+from logging import INFO, Logger, getLogger
+from typing import Optional, Union
+
+from .access_log import ACCESS_LOGGER_NAME, AccessLog, AccessLogResponse
+from .response import ContextResponse
+from .routes import (
+    POLICY_SKIP,
+    RoutePoliciesType,
+    compile_route_policies,
+    get_policy_options,
+)
+from .util import (
+    HeaderNamesType,
+    get_header_environ_key,
+    get_wsgi_request_context,
+    is_file_wrapper,
+    record_file_wrapper,
+)
 from ..context import context
+from ..context.store import ContextStore
+from ..propagation.request_id import (
+    REQUEST_ID_HEADER,
+    REQUEST_ID_NAME,
+    generate_request_id,
+    is_valid_request_id,
+)
 
 
 class RequestContextMiddleware:
@@ -13,20 +37,183 @@ class RequestContextMiddleware:
     context manager, where it sets configured WSGI information extracted from
     `environ` argument in the context.
 
+    The response iterable is wrapped in a `ContextResponse`, so that it is
+    iterated and closed within the same context. Lists, tuples and
+    `wsgi.file_wrapper` results are returned as they are, so that servers can
+    still serve files with sendfile. A `wsgi.file_wrapper`, that is a function
+    (as in uWSGI), is replaced in environ by a `RecordingFileWrapper`, so that
+    its results can be recognized.
+
     :param app: WSGI application to be wrapped by this middleware.
     :param headers: Include request headers in the context.
     :param wsgi_info: Include WSGI information in the context.
+    :param include_headers: Names of the only request headers to be included
+        in the context (for example, `["User-Agent", "X-Request-ID"]`).
+    :param exclude_headers: Names of the request headers to be left out of
+        the context (for example, `["Cookie", "Authorization"]`), even if
+        they are listed in `include_headers`.
+    :param lazy_uri: Calculate `request_uri` and `request_application_uri`
+        only when a log record actually uses them.
+    :param trace_context: Parse W3C traceparent and tracestate headers into
+        `trace_id`, `span_id`, `trace_flags` and `trace_state` variables.
+    :param request_id: Set `request_id` variable - to the value of the
+        inbound request id header (if it is valid), or to a new unique id.
+    :param request_id_header: Name of the request id header (None to never
+        reuse inbound request ids).
+    :param echo_request_id: Add the request id header to the response (if
+        the application does not set it).
+    :param access_log: Log a single access log record (within the request
+        context), when the response is closed.
+    :param access_logger: Logger (or logger name) for access log records.
+    :param access_log_level: Level of access log records.
+    :param route_policies: Path prefix (of `PATH_INFO`) to policy mapping.
+        Policies are "skip" (call the application without a context),
+        "request" (request information only), "headers" (request information
+        and headers) and "wsgi" (request information, headers and WSGI
+        information). The longest matching prefix wins. Other paths use
+        `headers` and `wsgi_info` arguments.
     """
 
-    def __init__(self, app, headers: bool = True, wsgi_info: bool = False):
+    def __init__(
+        self,
+        app,
+        headers: bool = True,
+        wsgi_info: bool = False,
+        include_headers: HeaderNamesType = None,
+        exclude_headers: HeaderNamesType = None,
+        lazy_uri: bool = False,
+        trace_context: bool = False,
+        request_id: bool = False,
+        request_id_header: Optional[str] = REQUEST_ID_HEADER,
+        echo_request_id: bool = False,
+        access_log: bool = False,
+        access_logger: Union[str, Logger] = ACCESS_LOGGER_NAME,
+        access_log_level: int = INFO,
+        route_policies: RoutePoliciesType = None,
+    ):
         self.app = app
         self.headers = headers
         self.wsgi_info = wsgi_info
+        self.include_headers = (
+            None if include_headers is None else frozenset(include_headers)
+        )
+        self.exclude_headers = frozenset(exclude_headers or ())
+        self.lazy_uri = lazy_uri
+        self.trace_context = trace_context
+        self.request_id = request_id
+        self.request_id_header = request_id_header
+        self.request_id_environ_key = (
+            request_id_header and get_header_environ_key(request_id_header)
+        )
+        self.echo_request_id = echo_request_id
+        self.access_log = access_log
+        if isinstance(access_logger, str):
+            access_logger = getLogger(access_logger)
+        self.access_logger = access_logger
+        self.access_log_level = access_log_level
+        self.route_policies = compile_route_policies(route_policies)
 
-    def __call__(self, environ, start_request):
+    def get_route_policy(self, environ) -> Optional[str]:
+        """Return policy of the request path (None, if there is none)."""
+        if not self.route_policies:
+            return None
+        path = environ.get("PATH_INFO", "")
+        return self.route_policies.longest_match(path)
+
+    def get_request_id(self, environ) -> str:
+        """Return inbound request id, if it is valid, or a new unique id."""
+        if self.request_id_environ_key:
+            request_id = environ.get(self.request_id_environ_key)
+            if is_valid_request_id(request_id):
+                return request_id
+        return generate_request_id()
+
+    def echo_request_id_header(self, start_request, request_id: str):
+        """Wrap start_response, so that it adds the request id header."""
+        header = self.request_id_header or REQUEST_ID_HEADER
+        lower_header = header.lower()
+
+        def start_request_with_request_id(status, headers, exc_info=None):
+            if all(name.lower() != lower_header for name, _ in headers):
+                headers = list(headers)
+                headers.append((header, request_id))
+            return start_request(status, headers, exc_info)
+
+        return start_request_with_request_id
+
+    def get_request_context(self, environ, policy: Optional[str] = None):
+        """Return logging context of the request."""
+        headers, wsgi_info = get_policy_options(
+            policy, (self.headers, self.wsgi_info)
+        )
         request_context = get_wsgi_request_context(
-            environ, wsgi_info=self.wsgi_info, headers=self.headers
+            environ,
+            wsgi_info=wsgi_info,
+            headers=headers,
+            include_headers=self.include_headers,
+            exclude_headers=self.exclude_headers,
+            lazy_uri=self.lazy_uri,
+            trace_context=self.trace_context,
         )
+        if self.request_id:
+            request_context[REQUEST_ID_NAME] = self.get_request_id(environ)
+        return request_context
+
+    def wrap_response(self, environ, result, request_context, access_log):
+        """Return response, that is iterated within the request context."""
+        if access_log is not None:
+            return self.wrap_access_log(
+                environ, result, request_context, access_log
+            )
+        if isinstance(result, (list, tuple)):
+            return result
+        if is_file_wrapper(environ, result):
+            return result
+        return ContextResponse(result, request_context)
+
+    def __call__(self, environ, start_request):
+        policy = self.get_route_policy(environ)
+        if policy == POLICY_SKIP:
+            return self.app(environ, start_request)
+        request_context = self.get_request_context(environ, policy)
+        if self.request_id and self.echo_request_id:
+            start_request = self.echo_request_id_header(
+                start_request, request_context[REQUEST_ID_NAME]
+            )
+        record_file_wrapper(environ)
+        access_log = None
+        if self.access_log:
+            access_log = AccessLog(self.access_logger, self.access_log_level)
+            start_request = access_log.wrap_start_response(start_request)
         with context(**request_context):
-            for item in self.app(environ, start_request):
-                yield item
+            request_context = ContextStore.variable().get()
+            result = self.call_app(
+                environ, start_request, request_context, access_log
+            )
+            return self.wrap_response(
+                environ, result, request_context, access_log
+            )
+
+    def call_app(self, environ, start_request, request_context, access_log):
+        """Call the application (and log access, if it raises)."""
+        try:
+            return self.app(environ, start_request)
+        except Exception:
+            if access_log is not None:
+                access_log.log_error(request_context)
+            raise
+
+    def wrap_access_log(
+        self, environ, result, request_context, access_log: AccessLog
+    ):
+        """Return response, that logs access, when it is closed.
+
+        Responses of `wsgi.file_wrapper` are returned as they are (so that
+        the server can still use sendfile), and access is logged right away,
+        with the size taken from the Content-Length header.
+        """
+        if is_file_wrapper(environ, result):
+            access_log.size = access_log.get_content_length()
+            access_log.log(request_context)
+            return result
+        return AccessLogResponse(result, request_context, access_log)
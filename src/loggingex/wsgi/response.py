@@ -0,0 +1,55 @@
+"""Defines ContextResponse class."""
+from typing import Any, Iterable, Optional
+
+from ..context.store import ContextStore, ContextType
+
+
+class ContextResponse:
+    """WSGI response iterable, that is iterated within a logging context.
+
+    Wraps the iterable returned by a WSGI application. The logging context is
+    replaced with the request context while the next chunk is produced and
+    while the original iterable is closed, and restored right after, so the
+    server never runs within the request context.
+
+    The request context is not applied again for every chunk - the same
+    context object is set, so lazy values are resolved only once per request.
+
+    :param iterable: response iterable returned by the WSGI application.
+    :param context: request logging context.
+    """
+
+    __slots__ = ("iterable", "context", "_iterator")
+
+    def __init__(self, iterable: Iterable[bytes], context: ContextType):
+        self.iterable = iterable
+        self.context = context
+        self._iterator = None  # type: Optional[Any]
+
+    def __iter__(self) -> "ContextResponse":
+        return self
+
+    def __next__(self) -> bytes:
+        variable = ContextStore.variable()
+        token = variable.set(self.context)
+        try:
+            if self._iterator is None:
+                self._iterator = iter(self.iterable)
+            return next(self._iterator)
+        finally:
+            variable.reset(token)
+
+    def close(self) -> None:
+        """Close the original iterable within the request context."""
+        variable = ContextStore.variable()
+        token = variable.set(self.context)
+        try:
+            self.close_iterable()
+        finally:
+            variable.reset(token)
+
+    def close_iterable(self) -> None:
+        """Close the original iterable (if it can be closed)."""
+        close = getattr(self.iterable, "close", None)
+        if close is not None:
+            close()
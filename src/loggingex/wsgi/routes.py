@@ -0,0 +1,94 @@
+"""Defines per-route (path prefix) context policies."""
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .exceptions import InvalidRoutePolicyException
+
+# route policies
+POLICY_SKIP = "skip"  # no context at all
+POLICY_REQUEST = "request"  # request information only
+POLICY_HEADERS = "headers"  # request information and headers
+POLICY_WSGI = "wsgi"  # request information, headers and WSGI information
+
+# (headers, wsgi_info) extraction options of the policies, that set a context
+POLICY_OPTIONS = {
+    POLICY_REQUEST: (False, False),
+    POLICY_HEADERS: (True, False),
+    POLICY_WSGI: (True, True),
+}
+POLICIES = (POLICY_SKIP,) + tuple(POLICY_OPTIONS)
+
+RoutePoliciesType = Optional[Mapping[str, str]]
+
+# trie node key, under which the value of a prefix is stored
+_VALUE = None
+
+
+class PrefixTrie:
+    """Character trie, that finds the value of the longest matching prefix.
+
+    Lookups walk the trie one character at a time, so they are O(length of
+    the path), no matter how many prefixes the trie has. Prefixes are plain
+    string prefixes - "/health" matches "/health/live" and "/healthz" alike.
+
+    :param values: prefix to value mapping.
+    """
+
+    __slots__ = ("_root",)
+
+    def __init__(self, values: Optional[Mapping[str, Any]] = None):
+        self._root = {}  # type: Dict[Optional[str], Any]
+        for prefix, value in (values or {}).items():
+            self.insert(prefix, value)
+
+    def insert(self, prefix: str, value: Any) -> None:
+        """Set the value of a prefix."""
+        node = self._root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[_VALUE] = value
+
+    def longest_match(self, path: str, default: Any = None) -> Any:
+        """Return the value of the longest prefix of path.
+
+        :param path: path to be matched.
+        :param default: value returned, when no prefix matches.
+        :return: value of the longest matching prefix, or default.
+        """
+        node = self._root
+        value = node.get(_VALUE, default)
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                break
+            value = node.get(_VALUE, value)
+        return value
+
+    def __bool__(self) -> bool:
+        return bool(self._root)
+
+
+def compile_route_policies(route_policies: RoutePoliciesType) -> PrefixTrie:
+    """Validate route policies, and compile them into a PrefixTrie.
+
+    :param route_policies: path prefix to policy mapping.
+    :return: PrefixTrie of path prefix to policy.
+    :raises InvalidRoutePolicyException: when a policy is not valid.
+    """
+    for prefix, policy in (route_policies or {}).items():
+        if policy not in POLICIES:
+            raise InvalidRoutePolicyException(
+                "Route policy must be one of %r" % (POLICIES,), prefix, policy
+            )
+    return PrefixTrie(route_policies)
+
+
+def get_policy_options(
+    policy: Optional[str], default: Tuple[bool, bool]
+) -> Tuple[bool, bool]:
+    """Return (headers, wsgi_info) extraction options of a policy.
+
+    :param policy: route policy (None for the default options).
+    :param default: default (headers, wsgi_info) options.
+    :return: (headers, wsgi_info) tuple.
+    """
+    return POLICY_OPTIONS.get(policy, default)
@@ -1,10 +1,24 @@
 """Defines information extraction from WSGI environ functions."""
-from typing import Any, AnyStr, Mapping
+from functools import lru_cache, partial
+from typing import (
+    AbstractSet,
+    Any,
+    AnyStr,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+from urllib.parse import quote
 from wsgiref import util
 
 from ..context.change import ContextType
+from ..context.lazy import LazyValue
+from ..propagation.trace_context import get_trace_context
 
 EnvironType = Mapping[AnyStr, Any]
+HeaderNamesType = Optional[Iterable[str]]
 
 
 def unicode(value: Any) -> str:
@@ -49,7 +63,110 @@ def get_wsgi_info(environ: EnvironType) -> ContextType:
     return wsgi_info
 
 
-def get_request_info(environ: EnvironType) -> ContextType:
+@lru_cache(maxsize=64)
+def get_server_info(
+    server_name: Any, server_port: Any, server_protocol: Any
+) -> Tuple[str, str, str]:
+    """Return (memoized) string representations of server information.
+
+    Server information is almost always the same for every request handled by
+    a process, so the converted values are cached.
+
+    :param server_name: SERVER_NAME value from WSGI environ.
+    :param server_port: SERVER_PORT value from WSGI environ.
+    :param server_protocol: SERVER_PROTOCOL value from WSGI environ.
+    :return: a tuple of converted name, port and protocol.
+    """
+    return unicode(server_name), unicode(server_port), unicode(server_protocol)
+
+
+@lru_cache(maxsize=256)
+def _get_application_uri(
+    url_scheme: str,
+    http_host: Optional[str],
+    server_name: str,
+    server_port: str,
+    script_name: Optional[str],
+) -> str:
+    environ = {
+        "wsgi.url_scheme": url_scheme,
+        "HTTP_HOST": http_host,
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": server_port,
+        "SCRIPT_NAME": script_name,
+    }
+    return unicode(util.application_uri(environ))
+
+
+def get_application_uri(environ: EnvironType) -> str:
+    """Return the application URI of the request.
+
+    The result is the same as the result of `wsgiref.util.application_uri`,
+    but it is cached for every distinct set of values it depends on (scheme,
+    host, server name, server port and script name).
+
+    :param environ: WSGI environ (as it is passed to WSGI application).
+    :return: application URI.
+    """
+    return _get_application_uri(
+        environ["wsgi.url_scheme"],
+        environ.get("HTTP_HOST"),
+        environ["SERVER_NAME"],
+        environ["SERVER_PORT"],
+        environ.get("SCRIPT_NAME"),
+    )
+
+
+def get_request_uri(environ: EnvironType) -> str:
+    """Return the full request URI (including the query string).
+
+    The result is the same as the result of `wsgiref.util.request_uri` (with
+    `include_query=True`), but the application URI part is cached (see
+    `get_application_uri`).
+
+    :param environ: WSGI environ (as it is passed to WSGI application).
+    :return: request URI.
+    """
+    url = get_application_uri(environ)
+    path_info = quote(
+        environ.get("PATH_INFO", ""), safe="/;=,", encoding="latin1"
+    )
+    if not environ.get("SCRIPT_NAME"):
+        path_info = path_info[1:]
+    url += path_info
+    if environ.get("QUERY_STRING"):
+        url += "?" + environ["QUERY_STRING"]
+    return unicode(url)
+
+
+# environ keys, that request and application URIs are calculated from
+URI_ENVIRON_KEYS = (
+    "wsgi.url_scheme",
+    "HTTP_HOST",
+    "SERVER_NAME",
+    "SERVER_PORT",
+    "SCRIPT_NAME",
+    "PATH_INFO",
+    "QUERY_STRING",
+)
+
+
+def get_uri_environ(environ: EnvironType) -> EnvironType:
+    """Return a copy of the environ values, that URIs are calculated from.
+
+    Applications (and middlewares) may modify environ while handling the
+    request (for example, when dispatching to mounted applications), so lazy
+    URIs are calculated from a copy taken when the request info is extracted.
+
+    :param environ: WSGI environ (as it is passed to WSGI application).
+    :return: a mapping of `URI_ENVIRON_KEYS`, that are present in environ.
+    """
+    return {key: environ[key] for key in URI_ENVIRON_KEYS if key in environ}
+
+
+def get_request_info(
+    environ: EnvironType, lazy_uri: bool = False
+) -> ContextType:
     """Extract logging context friendly request and server information.
 
     Extract all values related to server and to the specific request, such as
@@ -60,51 +177,227 @@ def get_request_info(environ: EnvironType) -> ContextType:
 
     In addition to these values, two calculated values are also added -
     `request_uri` and `request_application_uri`. These values are calculated
-    using `wsgiref.util` functions `request_uri` (with `include_query=True`) and
-    `application_uri`.
+    using `get_request_uri` and `get_application_uri` functions (that return
+    the same values as `wsgiref.util` functions `request_uri` with
+    `include_query=True` and `application_uri`). If `lazy_uri` is True, they
+    are added as LazyValue objects, that are only calculated if a log record
+    actually uses them. Lazy URIs are calculated from the environ values, that
+    were current when the request info was extracted (see `get_uri_environ`).
+
+    Server name, port and protocol are cached (see `get_server_info`).
 
     :param environ: WSGI environ (as it is passed to WSGI application).
+    :param lazy_uri: Calculate URIs lazily.
     :return: A logging context friendly mapping of request and server
         information.
     """
+    server_name, server_port, server_protocol = get_server_info(
+        environ["SERVER_NAME"],
+        environ["SERVER_PORT"],
+        environ["SERVER_PROTOCOL"],
+    )
+    if lazy_uri:
+        uri_environ = get_uri_environ(environ)
+        request_uri = LazyValue(partial(get_request_uri, uri_environ))
+        application_uri = LazyValue(partial(get_application_uri, uri_environ))
+    else:
+        request_uri = get_request_uri(environ)
+        application_uri = get_application_uri(environ)
     request_info = {
         "request_method": unicode(environ["REQUEST_METHOD"]),
         "request_script_name": unicode(environ["SCRIPT_NAME"]),
         "request_path_info": unicode(environ["PATH_INFO"]),
         "request_query_string": unicode(environ.get("QUERY_STRING", "")),
-        "request_server_name": unicode(environ["SERVER_NAME"]),
-        "request_server_port": unicode(environ["SERVER_PORT"]),
-        "request_server_protocol": unicode(environ["SERVER_PROTOCOL"]),
+        "request_server_name": server_name,
+        "request_server_port": server_port,
+        "request_server_protocol": server_protocol,
         "request_content_type": unicode(environ.get("CONTENT_TYPE", "")),
         "request_content_length": unicode(environ.get("CONTENT_LENGTH", "")),
-        "request_uri": unicode(util.request_uri(environ, include_query=True)),
-        "request_application_uri": unicode(util.application_uri(environ)),
+        "request_uri": request_uri,
+        "request_application_uri": application_uri,
     }
     return request_info
 
 
-def get_request_headers(environ: EnvironType) -> ContextType:
+def get_header_environ_key(header: str) -> str:
+    """Return WSGI environ key for given HTTP header name.
+
+    For example, "X-Request-ID" is converted to "HTTP_X_REQUEST_ID".
+
+    :param header: HTTP header name.
+    :return: WSGI environ key of the header.
+    """
+    return "HTTP_" + header.upper().replace("-", "_")
+
+
+@lru_cache(maxsize=512)
+def get_header_context_name(key: str) -> str:
+    """Return logging context variable name for given WSGI header key.
+
+    WSGI header key is converted to lowercase and "HTTP_" prefix is replaced
+    with "header_" prefix. For example, "HTTP_X_FOO" is converted to
+    "header_x_foo". The results are memoized.
+
+    :param key: WSGI environ key of the header (starting with "HTTP_").
+    :return: context variable name.
+    """
+    return "header_" + key[5:].lower()
+
+
+@lru_cache(maxsize=64)
+def get_header_environ_keys(headers: AbstractSet[str]) -> AbstractSet[str]:
+    """Return (memoized) WSGI environ keys for given HTTP header names.
+
+    :param headers: a frozenset of HTTP header names.
+    :return: a frozenset of WSGI environ keys.
+    """
+    return frozenset(get_header_environ_key(h) for h in headers)
+
+
+@lru_cache(maxsize=64)
+def get_header_lookup_table(
+    headers: AbstractSet[str], excluded: AbstractSet[str] = frozenset()
+) -> Tuple[Tuple[str, str], ...]:
+    """Return (memoized) environ key to context name table for given headers.
+
+    :param headers: a frozenset of HTTP header names.
+    :param excluded: a frozenset of HTTP header names to be left out.
+    :return: a tuple of (WSGI environ key, context variable name) pairs.
+    """
+    keys = get_header_environ_keys(headers)
+    keys = sorted(keys - get_header_environ_keys(excluded))
+    return tuple((key, get_header_context_name(key)) for key in keys)
+
+
+def _lookup_request_headers(
+    environ: EnvironType,
+    include: AbstractSet[str],
+    exclude: AbstractSet[str],
+) -> ContextType:
+    request_headers = {}
+    for key, name in get_header_lookup_table(include, exclude):
+        value = environ.get(key)
+        if value is not None:
+            request_headers[name] = value
+    return request_headers
+
+
+def get_request_headers(
+    environ: EnvironType,
+    include: HeaderNamesType = None,
+    exclude: HeaderNamesType = None,
+) -> ContextType:
     """Extract logging context friendly request headers.
 
     All headers are added to the result as is, their WSGI names are converted to
     lowercase and "HTTP_" prefix is replaced with "header_" prefix.
 
+    If `include` is given, only the listed headers are looked up in environ
+    directly (without scanning it). Headers listed in `exclude` are always
+    left out of the result, even if they are included. Headers are listed by
+    their HTTP names (for example, "User-Agent" or "Cookie"); passing them as
+    frozensets allows the derived lookup tables to be reused.
+
     :param environ: WSGI environ (as it is passed to WSGI application).
+    :param include: names of the only headers to be extracted.
+    :param exclude: names of the headers to be skipped.
     :return: A logging context friendly mapping of request headers.
     """
-    request_headers = {}
+    if include is not None:
+        return _lookup_request_headers(
+            environ, frozenset(include), frozenset(exclude or ())
+        )
 
-    headers = ((k, v) for k, v in environ.items() if k.startswith("HTTP_"))
-    for key, value in headers:
-        header = key[5:]  # drop "HTTP_" prefix
-        header = header.lower()
-        request_headers["header_" + header] = value
+    request_headers = {}
+    excluded = get_header_environ_keys(frozenset(exclude or ()))
+    for key, value in environ.items():
+        if key.startswith("HTTP_") and key not in excluded:
+            request_headers[get_header_context_name(key)] = value
 
     return request_headers
 
 
+class RecordingFileWrapper:
+    """Server's wsgi.file_wrapper function, that records its results.
+
+    PEP 3333 only requires `wsgi.file_wrapper` to be a callable (uWSGI, for
+    example, provides a function), so its results can not be recognized by
+    their type. They are recognized by identity instead.
+
+    :param file_wrapper: the server's wsgi.file_wrapper.
+    """
+
+    __slots__ = ("file_wrapper", "results")
+
+    def __init__(self, file_wrapper: Any):
+        self.file_wrapper = file_wrapper
+        self.results = []  # type: List[Any]
+
+    def __call__(self, *args, **kwargs) -> Any:
+        result = self.file_wrapper(*args, **kwargs)
+        self.results.append(result)
+        return result
+
+    def __contains__(self, result: Any) -> bool:
+        return any(result is r for r in self.results)
+
+
+def record_file_wrapper(environ: EnvironType) -> None:
+    """Replace wsgi.file_wrapper function with a RecordingFileWrapper.
+
+    File wrappers, that are classes (or already recorded), are kept as they
+    are.
+
+    :param environ: WSGI environ (as it is passed to WSGI application).
+    """
+    file_wrapper = environ.get("wsgi.file_wrapper")
+    if file_wrapper is None or isinstance(
+        file_wrapper, (type, RecordingFileWrapper)
+    ):
+        return
+    environ["wsgi.file_wrapper"] = RecordingFileWrapper(file_wrapper)
+
+
+def is_file_wrapper(environ: EnvironType, result: Any) -> bool:
+    """Return True if result was created by the server's wsgi.file_wrapper.
+
+    Servers may serve such results with a platform specific fast path (like
+    sendfile), so they must be returned to the server as they are.
+
+    Results of a file wrapper, that is a function, are recognized only if it
+    was replaced by `record_file_wrapper` before the application was called.
+
+    :param environ: WSGI environ (as it is passed to WSGI application).
+    :param result: WSGI application result.
+    :return: True if result was returned by wsgi.file_wrapper.
+    """
+    file_wrapper = environ.get("wsgi.file_wrapper")
+    if isinstance(file_wrapper, RecordingFileWrapper):
+        return result in file_wrapper
+    return isinstance(file_wrapper, type) and isinstance(result, file_wrapper)
+
+
+def get_request_trace_context(environ: EnvironType) -> ContextType:
+    """Extract trace context from traceparent and tracestate headers.
+
+    See `loggingex.propagation.get_trace_context`.
+
+    :param environ: WSGI environ (as it is passed to WSGI application).
+    :return: A logging context friendly mapping of trace context values.
+    """
+    return get_trace_context(
+        environ.get("HTTP_TRACEPARENT"), environ.get("HTTP_TRACESTATE")
+    )
+
+
 def get_wsgi_request_context(
-    environ: EnvironType, headers: bool = True, wsgi_info: bool = False
+    environ: EnvironType,
+    headers: bool = True,
+    wsgi_info: bool = False,
+    include_headers: HeaderNamesType = None,
+    exclude_headers: HeaderNamesType = None,
+    lazy_uri: bool = False,
+    trace_context: bool = False,
 ) -> ContextType:
     """Extract logging context friendly information from WSGI environ mapping.
 
@@ -112,23 +405,35 @@ def get_wsgi_request_context(
     `get_wsgi_info` functions.
 
     The result will always include values returned by `get_request_info`
-    function.
+    function (called with `lazy_uri` argument).
 
     If `headers` is `True`, result will include values returned by
-    `get_request_headers` function.
+    `get_request_headers` function (called with `include_headers` and
+    `exclude_headers` as `include` and `exclude` arguments).
 
     If `wsgi_info` is `True`, result will include values returned by
     `get_wsgi_info` function.
 
+    If `trace_context` is `True`, result will include values returned by
+    `get_request_trace_context` function.
+
     :param environ: WSGI environ (as it is passed to WSGI application).
     :param headers: Include request header information in the result.
     :param wsgi_info: Include WSGI information in the result.
+    :param include_headers: names of the only headers to be included.
+    :param exclude_headers: names of the headers to be skipped.
+    :param lazy_uri: Calculate request URIs lazily.
+    :param trace_context: Include parsed trace context in the result.
     :return: A logging context friendly mapping of values.
     """
     request_context = {}
-    request_context.update(get_request_info(environ))
+    request_context.update(get_request_info(environ, lazy_uri))
     if headers:
-        request_context.update(get_request_headers(environ))
+        request_context.update(
+            get_request_headers(environ, include_headers, exclude_headers)
+        )
     if wsgi_info:
         request_context.update(get_wsgi_info(environ))
+    if trace_context:
+        request_context.update(get_request_trace_context(environ))
     return request_context
@@ -0,0 +1,154 @@
+import asyncio
+from logging import getLogger
+
+from pytest import fixture
+
+from loggingex.asgi import RequestContextMiddleware
+from loggingex.context import ContextStore, LoggingContextFilter
+from loggingex.propagation import is_valid_request_id
+
+
+class FakeASGIServer:
+    """Runs ASGI applications in-process, the way an ASGI server would."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def make_scope(self, path, headers=()):
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "root_path": "",
+            "path": path,
+            "query_string": b"",
+            "server": ("testserver", 80),
+            "headers": [(b"host", b"testserver")] + list(headers),
+        }
+
+    async def call(self, scope, body=b""):
+        messages = []
+        request = [{"type": "http.request", "body": body}]
+
+        async def receive():
+            await asyncio.sleep(0)
+            return request.pop(0)
+
+        async def send(message):
+            await asyncio.sleep(0)
+            messages.append(message)
+
+        await self.app(scope, receive, send)
+        return messages
+
+    def request(self, path, headers=()):
+        loop = asyncio.new_event_loop()
+        try:
+            scope = self.make_scope(path, headers)
+            return loop.run_until_complete(self.call(scope))
+        finally:
+            loop.close()
+
+
+class DummyApp:
+    def __init__(self, logger):
+        self.logger = logger
+        self.contexts = []
+
+    async def __call__(self, scope, receive, send):
+        self.contexts.append(dict(ContextStore().get()))
+        if scope["type"] != "http":
+            return
+        message = await receive()
+        self.logger.debug("Handling request: %s", scope["path"])
+        await send({"type": "http.response.start", "status": 200})
+        self.contexts.append(dict(ContextStore().get()))
+        await send({"type": "http.response.body", "body": message["body"]})
+        self.logger.info("%s: %s", scope["path"], 200)
+
+
+@fixture()
+def logger(caplog):
+    caplog.set_level("DEBUG", "asgiapp")
+    logger = getLogger("asgiapp")
+    context_filter = LoggingContextFilter()
+    logger.addFilter(context_filter)
+    yield logger
+    logger.removeFilter(context_filter)
+
+
+@fixture()
+def dummyapp(logger):
+    return DummyApp(logger)
+
+
+@fixture()
+def server(dummyapp):
+    app = RequestContextMiddleware(dummyapp, headers=True, asgi_info=True)
+    return FakeASGIServer(app)
+
+
+def test_request_context_is_added_to_logging_records(caplog, server):
+    messages = server.request("/", [(b"x-request-id", b"abc")])
+    assert messages[0] == {"type": "http.response.start", "status": 200}
+
+    assert len(caplog.records) == 2
+    for record in caplog.records:
+        assert record.request_method == "GET"
+        assert record.request_path_info == "/"
+        assert record.header_x_request_id == "abc"
+        assert record.asgi_type == "http"
+
+
+def test_context_is_kept_during_receive_and_send(server, dummyapp):
+    server.request("/path")
+    assert len(dummyapp.contexts) == 2
+    for ctx in dummyapp.contexts:
+        assert ctx["request_path_info"] == "/path"
+    assert ContextStore().get() == {}
+
+
+def test_non_request_scopes_are_passed_through(server, dummyapp):
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(server.call({"type": "lifespan"}))
+    finally:
+        loop.close()
+    assert dummyapp.contexts == [{}]
+
+
+def test_trace_context_is_added_to_logging_records(caplog, dummyapp):
+    server = FakeASGIServer(
+        RequestContextMiddleware(dummyapp, trace_context=True)
+    )
+    traceparent = b"00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    server.request("/", [(b"traceparent", traceparent)])
+
+    assert caplog.records
+    for record in caplog.records:
+        assert record.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+        assert record.span_id == "00f067aa0ba902b7"
+
+
+def test_request_id_is_generated_and_echoed(caplog, dummyapp):
+    app = RequestContextMiddleware(
+        dummyapp, request_id=True, echo_request_id=True
+    )
+    messages = FakeASGIServer(app).request("/")
+
+    headers = dict(messages[0]["headers"])
+    request_id = headers[b"x-request-id"].decode()
+    assert is_valid_request_id(request_id)
+    assert {record.request_id for record in caplog.records} == {request_id}
+
+
+def test_inbound_request_id_is_reused(caplog, dummyapp):
+    server = FakeASGIServer(RequestContextMiddleware(dummyapp, request_id=True))
+    messages = server.request("/", [(b"x-request-id", b"abc-123")])
+
+    assert "headers" not in messages[0]
+    assert caplog.records
+    for record in caplog.records:
+        assert record.request_id == "abc-123"
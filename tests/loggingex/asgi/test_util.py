@@ -0,0 +1,119 @@
+from pytest import fixture, mark
+
+from loggingex.asgi.util import (
+    get_asgi_info,
+    get_asgi_request_context,
+    get_header_context_name,
+    get_request_headers,
+    get_request_info,
+    get_request_trace_context,
+)
+
+TRACEPARENT = b"00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+@fixture()
+def asgi_scope():
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.1"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "https",
+        "root_path": "/foo",
+        "path": "/bar/baz",
+        "query_string": b"dummy=1",
+        "server": ("backend", 8000),
+        "headers": [
+            (b"user-agent", b"UnitTest"),
+            (b"host", b"example.io"),
+            (b"x-forwarded-for", b"111.222.112.221"),
+            (b"x-forwarded-for", b"10.0.0.1"),
+            (b"x-request-id", b"1a2a3a4a5a6a7a8a"),
+            (b"x.invalid", b"ignored"),
+        ],
+    }
+
+
+def test_get_asgi_info_returns_asgi_information(asgi_scope):
+    info = get_asgi_info(asgi_scope)
+    assert info == {
+        "asgi_version": "3.0",
+        "asgi_spec_version": "2.1",
+        "asgi_type": "http",
+    }
+
+
+def test_get_request_info(asgi_scope):
+    info = get_request_info(asgi_scope)
+    assert info["request_method"] == "POST"
+    assert info["request_scheme"] == "https"
+    assert info["request_script_name"] == "/foo"
+    assert info["request_path_info"] == "/bar/baz"
+    assert info["request_query_string"] == "dummy=1"
+    assert info["request_server_name"] == "backend"
+    assert info["request_server_port"] == "8000"
+    assert info["request_server_protocol"] == "HTTP/1.1"
+
+
+def test_get_request_info_handles_missing_server(asgi_scope):
+    asgi_scope["server"] = None
+    info = get_request_info(asgi_scope)
+    assert info["request_server_name"] == ""
+    assert info["request_server_port"] == ""
+
+
+@mark.parametrize(
+    "name,result",
+    [
+        (b"user-agent", "header_user_agent"),
+        (b"x-request-id", "header_x_request_id"),
+        (b"x.invalid", None),
+    ],
+)
+def test_get_header_context_name(name, result):
+    assert get_header_context_name(name) == result
+
+
+def test_get_request_headers(asgi_scope):
+    info = get_request_headers(asgi_scope)
+    assert info == {
+        "header_user_agent": "UnitTest",
+        "header_host": "example.io",
+        "header_x_forwarded_for": "111.222.112.221,10.0.0.1",
+        "header_x_request_id": "1a2a3a4a5a6a7a8a",
+    }
+
+
+@mark.parametrize("headers", [True, False])
+@mark.parametrize("asgi_info", [True, False])
+def test_get_asgi_request_context(asgi_scope, headers, asgi_info):
+    info = get_asgi_request_context(asgi_scope, headers, asgi_info)
+    assert info["request_method"] == "POST"
+    assert ("header_host" in info) is headers
+    assert ("asgi_type" in info) is asgi_info
+
+
+def test_get_request_trace_context(asgi_scope):
+    asgi_scope["headers"].append((b"traceparent", TRACEPARENT))
+    asgi_scope["headers"].append((b"tracestate", b"congo=t61rcWkgMzE"))
+    asgi_scope["headers"].append((b"tracestate", b"rojo=00f067aa0ba902b7"))
+    assert get_request_trace_context(asgi_scope) == {
+        "trace_id": "4bf92f3577b34da6a3ce929d0e0e4736",
+        "span_id": "00f067aa0ba902b7",
+        "trace_flags": "01",
+        "trace_state": "congo=t61rcWkgMzE,rojo=00f067aa0ba902b7",
+    }
+
+
+def test_get_request_trace_context_ignores_repeated_traceparent(asgi_scope):
+    asgi_scope["headers"].append((b"traceparent", TRACEPARENT))
+    asgi_scope["headers"].append((b"traceparent", TRACEPARENT))
+    assert get_request_trace_context(asgi_scope) == {}
+
+
+@mark.parametrize("trace_context", [True, False])
+def test_get_asgi_request_context_with_trace_context(asgi_scope, trace_context):
+    asgi_scope["headers"].append((b"traceparent", TRACEPARENT))
+    info = get_asgi_request_context(asgi_scope, trace_context=trace_context)
+    assert ("trace_id" in info) is trace_context
@@ -0,0 +1,6 @@
+import sys
+
+collect_ignore = []
+if sys.version_info < (3, 6):
+    # asynchronous generators are not supported by python 3.5
+    collect_ignore.append("test_async_generators.py")
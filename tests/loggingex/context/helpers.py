@@ -11,9 +11,17 @@ class ResetContextBase:
     @fixture(autouse=True)
     def reset_context_variable(self):
         ContextStore._context = None
+        ContextStore._persistent = False
 
 
 class InitializedContextBase(ResetContextBase):
     @fixture(autouse=True)
     def initialized_context(self, reset_context_variable):
         ContextStore.initialize_context()
+
+
+class PersistentContextBase(ResetContextBase):
+    @fixture(autouse=True)
+    def initialized_context(self, reset_context_variable):
+        ContextStore.set_persistent(True)
+        ContextStore.initialize_context()
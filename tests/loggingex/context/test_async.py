@@ -0,0 +1,71 @@
+import asyncio
+
+from pytest import raises
+
+from loggingex.context import context
+from .helpers import InitializedContextBase
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class AsyncContextManagerTests(InitializedContextBase):
+    def test_can_be_used_as_async_context_manager(self, store):
+        async def main():
+            async with context(foo=1) as change:
+                assert change.started
+                await asyncio.sleep(0)
+                assert store.get() == {"foo": 1}
+            return store.get()
+
+        assert run(main()) == {}
+
+    def test_async_context_manager_does_not_swallow_exceptions(self, store):
+        async def main():
+            async with context(foo=1):
+                raise ValueError("test")
+
+        assert raises(ValueError, run, main())
+        assert store.get() == {}
+
+
+class CoroutineDecoratorTests(InitializedContextBase):
+    def test_decorated_coroutine_is_awaited_within_context(self, store):
+        @context(func="foo")
+        async def foo(a, b):
+            await asyncio.sleep(0)
+            assert store.get() == {"func": "foo"}
+            return a + b
+
+        assert asyncio.iscoroutinefunction(foo)
+        assert run(foo(1, 2)) == 3
+        assert store.get() == {}
+
+    def test_decorated_coroutine_restores_context_on_exception(self, store):
+        @context(func="foo")
+        async def foo():
+            await asyncio.sleep(0)
+            raise ValueError("test")
+
+        assert raises(ValueError, run, foo())
+        assert store.get() == {}
+
+    def test_concurrent_tasks_do_not_mix_contexts(self, store):
+        @context.compile(func="worker")
+        async def worker(num):
+            with context(num=num):
+                for _ in range(3):
+                    await asyncio.sleep(0)
+                    assert store.get() == {"func": "worker", "num": num}
+            return num
+
+        async def main():
+            tasks = [asyncio.ensure_future(worker(i)) for i in range(10)]
+            return await asyncio.gather(*tasks)
+
+        assert run(main()) == list(range(10))
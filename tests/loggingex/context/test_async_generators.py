@@ -0,0 +1,175 @@
+import asyncio
+from contextvars import ContextVar
+
+from pytest import raises
+
+from loggingex.context import context
+from loggingex.context.wrappers import ContextAsyncGenerator
+from .helpers import InitializedContextBase
+from .test_async import run
+
+consumer_variable = ContextVar("consumer_variable", default="default")
+
+
+def make_echo_generator(store, closed):
+    @context(func="gen")
+    async def gen():
+        try:
+            value = yield store.get()
+            try:
+                yield (value, store.get())
+            except KeyError:
+                yield ("thrown", store.get())
+        finally:
+            closed.append(store.get())
+
+    return gen
+
+
+class AsyncGeneratorDecoratorTests(InitializedContextBase):
+    def test_context_is_applied_only_while_generator_runs(self, store):
+        @context(func="gen")
+        async def gen(n):
+            for i in range(n):
+                await asyncio.sleep(0)
+                yield i, store.get()
+
+        async def main():
+            results = []
+            async for i, ctx in gen(3):
+                results.append((i, ctx, store.get()))
+            return results
+
+        assert isinstance(gen(1), ContextAsyncGenerator)
+        assert run(main()) == [(i, {"func": "gen"}, {}) for i in range(3)]
+
+    def test_nested_changes_are_kept_when_consumer_context_changes(
+        self, store
+    ):
+        @context(stage="parse")
+        async def gen():
+            async with context(file="a"):
+                await asyncio.sleep(0)
+                yield store.get()
+                yield store.get()
+            yield store.get()
+
+        async def main():
+            agen = gen()
+            seen = []
+            for i in range(2):
+                async with context(item=i):
+                    seen.append(await agen.__anext__())
+            async with context(final=1):
+                seen.append(await agen.__anext__())
+            return seen, store.get()
+
+        assert run(main()) == (
+            [
+                {"stage": "parse", "file": "a", "item": 0},
+                {"stage": "parse", "file": "a", "item": 1},
+                {"stage": "parse", "final": 1},
+            ],
+            {},
+        )
+
+    def test_asend_athrow_and_aclose_are_forwarded(self, store):
+        closed = []
+
+        async def main():
+            agen = make_echo_generator(store, closed)()
+            assert await agen.__anext__() == {"func": "gen"}
+            assert await agen.asend(1) == (1, {"func": "gen"})
+            assert await agen.athrow(KeyError) == ("thrown", {"func": "gen"})
+            await agen.aclose()
+            return store.get()
+
+        assert run(main()) == {}
+        assert closed == [{"func": "gen"}]
+
+    def test_exceptions_are_propagated(self, store):
+        @context(func="gen")
+        async def gen():
+            yield 1
+            raise ValueError("test")
+
+        async def main():
+            return [i async for i in gen()]
+
+        assert raises(ValueError, run, main())
+        assert store.get() == {}
+
+    def test_body_sees_other_context_variables_of_consumer(self, store):
+        @context(func="gen")
+        async def gen():
+            yield consumer_variable.get()
+
+        async def main():
+            consumer_variable.set("consumer")
+            return [value async for value in gen()]
+
+        assert run(main()) == ["consumer"]
+
+    def test_changes_of_tasks_spawned_by_body_are_not_applied_to_it(
+        self, store
+    ):
+        @context(gen=1)
+        async def gen():
+            started, release = asyncio.Event(), asyncio.Event()
+
+            async def task():
+                with context(task=1):
+                    started.set()
+                    await release.wait()
+                    return store.get()
+
+            spawned = asyncio.ensure_future(task())
+            await started.wait()
+            yield store.get()
+            release.set()
+            yield (store.get(), await spawned)
+            yield store.get()
+
+        async def main():
+            agen = gen()
+            seen = []
+            for i in range(3):
+                async with context(outer=i):
+                    seen.append(await agen.__anext__())
+            return seen
+
+        assert run(main()) == [
+            {"outer": 0, "gen": 1},
+            ({"outer": 1, "gen": 1}, {"outer": 0, "gen": 1, "task": 1}),
+            {"outer": 2, "gen": 1},
+        ]
+
+    def test_scope_and_iterate_in_generator_body(self, store):
+        @context(func="gen")
+        async def gen():
+            async with context.scope() as scope:
+                scope.set(b=2)
+                yield store.get()
+                await asyncio.sleep(0)
+                yield store.get()
+            for _ in context.iterate([1], item=lambda item: item):
+                yield store.get()
+            yield store.get()
+
+        async def main():
+            agen = gen()
+            seen = []
+            for i in range(4):
+                async with context(o=i):
+                    seen.append(await agen.__anext__())
+            return seen, store.get()
+
+        assert run(main()) == (
+            [
+                {"o": 0, "func": "gen", "b": 2},
+                {"o": 1, "func": "gen", "b": 2},
+                {"o": 2, "func": "gen", "item": 1},
+                {"o": 3, "func": "gen"},
+            ],
+            {},
+        )
@@ -0,0 +1,162 @@
+import gc
+import pickle
+import time
+from logging import DEBUG, WARNING, getLogger
+from threading import Barrier, Thread
+
+from pytest import fixture
+
+from loggingex.context import (
+    FrozenContextChange,
+    LoggingContextFilter,
+    consumers,
+    context,
+)
+from loggingex.context.consumers import DeferredContext
+from .helpers import InitializedContextBase
+
+
+class ConsumerTrackingTests(InitializedContextBase):
+    @fixture(autouse=True)
+    def tracking(self):
+        consumers.clear_consumers()
+        consumers.enable_tracking()
+        yield
+        consumers.enable_tracking(False)
+        consumers.clear_consumers()
+
+    @fixture()
+    def logger(self):
+        logger = getLogger("loggingex.tests.consumers")
+        yield logger
+        logger.setLevel(0)
+
+    def test_changes_are_applied_when_tracking_is_disabled(self, store):
+        consumers.enable_tracking(False)
+        assert consumers.is_tracking() is False
+        with context(foo=1):
+            assert type(store.get()) is dict
+            assert store.get() == {"foo": 1}
+
+    def test_changes_are_deferred_without_consumers(self, store):
+        assert consumers.is_consumed() is False
+        frozen = context.compile(bar=2)
+        with context(foo=1):
+            token = frozen.start()
+            assert isinstance(store.get(), DeferredContext)
+            assert store.get() == {"foo": 1, "bar": 2}
+            frozen.stop(token)
+            assert store.get() == {"foo": 1}
+        assert store.get() == {}
+
+    def test_deferred_context_is_applied_once(self, mocker, store):
+        apply = mocker.spy(FrozenContextChange, "apply")
+        change = context.compile(foo=1)
+        token = change.start()
+        deferred = store.get()
+        assert apply.call_count == 0
+        assert dict(deferred) == {"foo": 1}
+        assert deferred["foo"] == 1 and "foo" in deferred
+        assert len(deferred) == 1
+        assert apply.call_count == 1
+        assert pickle.loads(pickle.dumps(deferred)) == {"foo": 1}
+        change.stop(token)
+
+    def test_deferred_change_is_not_affected_by_modifications(self, store):
+        change = context(foo=1)
+        with change:
+            deferred = store.get()
+        change.update(foo=2)
+        assert deferred == {"foo": 1}
+
+    def test_deferred_change_shares_removes_and_updates(self, store):
+        change = context("bar", foo=1)
+        remove, update = change.context_remove, change.context_update
+        with context(bar=2), change:
+            deferred = store.get()
+        change.remove("baz").update(foo=2)
+        assert (remove, update) == ({"bar"}, {"foo": 1})
+        assert deferred == {"foo": 1}
+
+    def test_deferred_context_is_applied_once_by_concurrent_threads(self):
+        calls = []
+
+        def apply(context):
+            calls.append(context)
+            time.sleep(0.001)
+            return dict(context, foo=len(calls))
+
+        deferred = DeferredContext(apply, DeferredContext(apply, {}))
+        barrier = Barrier(4)
+        results = []
+
+        def resolve():
+            barrier.wait()
+            results.append(deferred.resolve())
+
+        threads = [Thread(target=resolve) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 2
+        assert len(results) == 4
+        assert all(result is results[0] for result in results)
+
+    def test_context_filter_registers_itself_for_root_logger(self, store):
+        root = getLogger()
+        level = root.level
+        context_filter = LoggingContextFilter()
+        try:
+            root.setLevel(WARNING)
+            assert consumers.is_consumed() is False
+            root.setLevel(DEBUG)
+            assert consumers.is_consumed() is True
+        finally:
+            root.setLevel(level)
+        del context_filter
+        gc.collect()
+        assert consumers.is_consumed() is False
+
+    def test_consumer_is_active_while_logger_is_enabled(self, store, logger):
+        context_filter = LoggingContextFilter()
+        consumers.register_consumer(context_filter, logger, DEBUG)
+        logger.setLevel(WARNING)
+        with context(foo=1):
+            assert isinstance(store.get(), DeferredContext)
+        logger.setLevel(DEBUG)
+        with context(foo=1):
+            assert type(store.get()) is dict
+
+    def test_emitted_records_carry_deferred_context(
+        self, caplog, store, logger
+    ):
+        context_filter = LoggingContextFilter()
+        logger.addFilter(context_filter)
+        consumers.register_consumer(context_filter, logger, DEBUG)
+        logger.setLevel(WARNING)
+        try:
+            with context(foo=1):
+                logger.debug("rejected")
+                logger.warning("emitted")
+        finally:
+            logger.removeFilter(context_filter)
+        assert [r.getMessage() for r in caplog.records] == ["emitted"]
+        assert caplog.records[0].foo == 1
+
+    def test_unregistered_consumers_are_ignored(self, store):
+        context_filter = LoggingContextFilter()
+        consumers.register_consumer(context_filter)
+        assert consumers.is_consumed() is True
+        consumers.unregister_consumer(context_filter)
+        consumers.unregister_consumer(context_filter)
+        assert consumers.is_consumed() is False
+
+    def test_context_is_complete_when_consumer_appears(self, store):
+        with context(foo=1):
+            context_filter = LoggingContextFilter()
+            consumers.register_consumer(context_filter)
+            with context(bar=2):
+                assert type(store.get()) is dict
+                assert store.get() == {"foo": 1, "bar": 2}
+            assert store.get() == {"foo": 1}
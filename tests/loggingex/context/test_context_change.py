@@ -8,7 +8,8 @@ from loggingex.context import (
     ContextChangeNotStartedException,
     ContextInvalidNameException,
 )
-from .helpers import InitializedContextBase
+from loggingex.context.map import ContextMap
+from .helpers import InitializedContextBase, PersistentContextBase
 
 
 def test_default_constructor_initializes_context_changes():
@@ -171,6 +172,37 @@ def test_apply_combines_removes_and_updates():
     assert change.apply(initial) == expected
 
 
+class PersistentApplyTests(PersistentContextBase):
+    def test_apply_returns_context_map_sharing_the_initial_context(self):
+        initial = ContextMap({"foo": 1, "bar": 2})
+        result = ContextChange().remove("foo").update(baz=3).apply(initial)
+        assert isinstance(result, ContextMap)
+        assert result._parent is initial
+        assert result == {"bar": 2, "baz": 3}
+
+    def test_apply_converts_plain_dicts(self):
+        result = ContextChange().update(bar=2).apply({"foo": 1})
+        assert isinstance(result, ContextMap)
+        assert result == {"foo": 1, "bar": 2}
+
+    def test_apply_starts_fresh_when_fresh(self):
+        change = ContextChange().fresh().update(bar=1)
+        assert change.apply(ContextMap({"foo": 1})) == {"bar": 1}
+
+    def test_apply_is_not_affected_by_later_change_modifications(self):
+        change = ContextChange().update(foo=1)
+        result = change.apply(ContextMap())
+        change.update(foo=2)
+        assert result == {"foo": 1}
+
+    def test_nested_changes_restore_previous_context(self, store):
+        with ContextChange().update(foo=1):
+            with ContextChange().remove("foo").update(bar=2):
+                assert store.get() == {"bar": 2}
+            assert store.get() == {"foo": 1}
+        assert store.get() == {}
+
+
 class StartAndStopTests(InitializedContextBase):
     def test_start_applies_context_change_and_saves_token(self, store):
         change = ContextChange().update(foo=1, bar=2.3, baz=True)
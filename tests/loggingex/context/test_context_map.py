@@ -0,0 +1,98 @@
+import pickle
+
+from pytest import mark, raises
+
+from loggingex.context import ContextMap
+from loggingex.context.map import EMPTY_CONTEXT_MAP, MAX_CHAIN_DEPTH
+
+
+def test_default_constructor_creates_empty_map():
+    assert ContextMap() == {}
+    assert len(ContextMap()) == 0
+
+
+def test_constructor_copies_given_mapping():
+    initial = {"foo": 1}
+    ctx = ContextMap(initial)
+    initial["bar"] = 2
+    assert ctx == {"foo": 1}
+
+
+def test_from_mapping_returns_same_context_map():
+    ctx = ContextMap({"foo": 1})
+    assert ContextMap.from_mapping(ctx) is ctx
+
+
+def test_from_mapping_wraps_dicts():
+    ctx = ContextMap.from_mapping({"foo": 1})
+    assert isinstance(ctx, ContextMap)
+    assert ctx == {"foo": 1}
+
+
+def test_evolve_without_changes_returns_self():
+    ctx = ContextMap({"foo": 1})
+    assert ctx.evolve() is ctx
+
+
+def test_evolve_does_not_modify_parent():
+    parent = ContextMap({"foo": 1, "bar": 2})
+    child = parent.evolve(remove=frozenset({"foo"}), update={"baz": 3})
+    assert parent == {"foo": 1, "bar": 2}
+    assert child == {"bar": 2, "baz": 3}
+
+
+def test_evolve_fresh_ignores_parent_and_removes():
+    parent = ContextMap({"foo": 1})
+    child = parent.evolve(True, frozenset({"bar"}), {"bar": 2})
+    assert child == {"bar": 2}
+
+
+@mark.parametrize(
+    "key,value",
+    [("foo", 10), ("bar", 2), ("baz", None), ("new", 4), ("missing", None)],
+)
+def test_get_walks_the_chain_without_flattening(key, value):
+    ctx = ContextMap({"foo": 1, "bar": 2, "baz": 3})
+    ctx = ctx.evolve(update={"foo": 10})
+    ctx = ctx.evolve(remove=frozenset({"baz"}), update={"new": 4})
+    assert ctx.get(key) == value
+    assert ctx._flat is None
+
+
+def test_getitem_raises_key_error_for_removed_keys():
+    ctx = ContextMap({"foo": 1}).evolve(remove=frozenset({"foo"}))
+    assert "foo" not in ctx
+    assert raises(KeyError, ctx.__getitem__, "foo")
+
+
+def test_iteration_flattens_the_chain_once():
+    ctx = ContextMap({"foo": 1}).evolve(update={"bar": 2})
+    assert dict(ctx.items()) == {"foo": 1, "bar": 2}
+    flat = ctx._flat
+    assert list(ctx) == ["foo", "bar"]
+    assert ctx._flat is flat
+
+
+def test_deep_chains_are_compacted():
+    ctx = EMPTY_CONTEXT_MAP
+    for i in range(MAX_CHAIN_DEPTH * 3):
+        ctx = ctx.evolve(update={"level": i})
+        assert ctx._depth <= MAX_CHAIN_DEPTH
+    assert ctx == {"level": MAX_CHAIN_DEPTH * 3 - 1}
+
+
+def test_compares_equal_to_dicts_and_other_maps():
+    ctx = ContextMap({"foo": 1}).evolve(update={"bar": 2})
+    assert ctx == {"foo": 1, "bar": 2}
+    assert {"foo": 1, "bar": 2} == ctx
+    assert ctx == ContextMap({"bar": 2, "foo": 1})
+    assert ctx != {"foo": 1}
+
+
+def test_can_be_pickled():
+    ctx = ContextMap({"foo": 1}).evolve(update={"bar": 2})
+    assert pickle.loads(pickle.dumps(ctx)) == {"foo": 1, "bar": 2}
+
+
+def test_repr_shows_flat_contents():
+    assert repr(ContextMap({"foo": 1})) == "ContextMap({'foo': 1})"
@@ -0,0 +1,83 @@
+import pickle
+from logging import DEBUG, Formatter, LogRecord
+
+from pytest import fixture, raises
+
+from loggingex.context import ContextSnapshot, LoggingContextFilter
+from .helpers import InitializedContextBase
+
+
+def test_values_can_be_read_as_items_and_attributes():
+    snapshot = ContextSnapshot({"user": "alice", "items": 3})
+    assert snapshot["user"] == "alice"
+    assert snapshot.user == "alice"
+    assert snapshot["items"] == 3
+    assert dict(snapshot) == {"user": "alice", "items": 3}
+
+
+def test_missing_values_raise():
+    snapshot = ContextSnapshot({})
+    assert raises(KeyError, snapshot.__getitem__, "user")
+    assert raises(AttributeError, getattr, snapshot, "user")
+
+
+def test_can_not_be_modified():
+    snapshot = ContextSnapshot({"user": "alice"})
+    assert raises(AttributeError, setattr, snapshot, "user", "bob")
+    assert raises(AttributeError, delattr, snapshot, "user")
+    with raises(TypeError):
+        snapshot["user"] = "bob"
+    assert not hasattr(snapshot, "__dict__")
+
+
+def test_can_be_pickled():
+    snapshot = pickle.loads(pickle.dumps(ContextSnapshot({"user": "alice"})))
+    assert snapshot.user == "alice"
+
+
+def test_str_and_repr():
+    snapshot = ContextSnapshot({"user": "alice", "num": 1})
+    assert str(snapshot) == "user=alice num=1"
+    assert repr(snapshot) == "<ContextSnapshot: {'user': 'alice', 'num': 1}>"
+
+
+class SnapshotFilterTests(InitializedContextBase):
+    @fixture()
+    def context_filter(self):
+        return LoggingContextFilter(snapshot_attribute="context")
+
+    def make_record(self):
+        return LogRecord("test", DEBUG, "test.py", 1, "message", (), None)
+
+    def test_injects_single_snapshot_attribute(self, store, context_filter):
+        store.replace({"user": "alice", "name": "overwrite"})
+        record = self.make_record()
+        context_filter.filter(record)
+        assert isinstance(record.context, ContextSnapshot)
+        assert record.context.user == "alice"
+        assert record.context.name == "overwrite"
+        assert record.name == "test"
+        assert not hasattr(record, "user")
+
+    def test_records_share_snapshot_in_same_context(
+        self, store, context_filter
+    ):
+        store.replace({"user": "alice"})
+        record1, record2 = self.make_record(), self.make_record()
+        context_filter.filter(record1)
+        context_filter.filter(record2)
+        assert record1.context is record2.context
+        store.replace({"user": "bob"})
+        record3 = self.make_record()
+        context_filter.filter(record3)
+        assert record3.context.user == "bob"
+        assert record1.context.user == "alice"
+
+    def test_formatters_can_read_snapshot(self, store, context_filter):
+        store.replace({"user": "alice"})
+        record = self.make_record()
+        context_filter.filter(record)
+        formatter = Formatter("{context.user}: {message}", style="{")
+        assert formatter.format(record) == "alice: message"
+        formatter = Formatter("[%(context)s] %(message)s")
+        assert formatter.format(record) == "[user=alice] message"
@@ -1,4 +1,4 @@
-from loggingex.context import ContextStore
+from loggingex.context import ContextMap, ContextStore
 from .helpers import InitializedContextBase, ResetContextBase
 
 
@@ -55,3 +55,27 @@ class RestoreTests(InitializedContextBase):
         )
         store.restore(token)
         assert store.context.get() == {}
+
+
+class PersistentModeTests(ResetContextBase):
+    def test_is_not_persistent_by_default(self, store):
+        assert ContextStore.is_persistent() is False
+        assert type(store.get()) is dict
+
+    def test_set_persistent_stores_context_maps(self, store):
+        ContextStore.set_persistent(True)
+        assert ContextStore.is_persistent() is True
+        assert isinstance(store.get(), ContextMap)
+        assert store.get() == {}
+
+    def test_set_persistent_false_stores_dicts(self, store):
+        ContextStore.set_persistent(True)
+        ContextStore.set_persistent(False)
+        assert type(store.get()) is dict
+
+
+class VariableTests(ResetContextBase):
+    def test_returns_initialized_context_variable(self, store):
+        variable = ContextStore.variable()
+        assert variable is ContextStore._context
+        assert variable.get() == {}
@@ -0,0 +1,168 @@
+from threading import Lock, Thread
+
+from pytest import fixture
+
+from loggingex.context import (
+    ContextProcessPoolExecutor,
+    ContextStore,
+    ContextThread,
+    ContextThreadPoolExecutor,
+    LazyValue,
+    context,
+    with_current_context,
+)
+from loggingex.context.executor import get_portable_context, run_in_context
+from .helpers import InitializedContextBase, PersistentContextBase
+
+
+def get_context():
+    return ContextStore().get()
+
+
+def get_context_dict(*args, **kwargs):
+    return dict(ContextStore().get(), args=args, kwargs=kwargs)
+
+
+def run_thread(thread):
+    thread.start()
+    thread.join()
+
+
+class ExecutorHelpersTests(InitializedContextBase):
+    def test_run_in_context_replaces_and_restores_context(self, store):
+        ctx = {"user": "alice"}
+        with context(user="bob"):
+            before = store.get()
+            assert run_in_context(ctx, get_context) is ctx
+            assert store.get() is before
+
+    def test_run_in_context_restores_context_on_error(self, store):
+        before = store.get()
+
+        def fail():
+            raise ValueError()
+
+        try:
+            run_in_context({"user": "alice"}, fail)
+        except ValueError:
+            pass
+        assert store.get() is before
+
+    def test_with_current_context_captures_context(self):
+        with context(user="alice"):
+            func = with_current_context(get_context_dict)
+        result = func(1, x=2)
+        assert result == {"user": "alice", "args": (1,), "kwargs": {"x": 2}}
+
+    def test_with_current_context_works_in_raw_threads(self):
+        results = []
+        with context(user="alice"):
+            func = with_current_context(lambda: results.append(get_context()))
+        run_thread(Thread(target=func))
+        assert results == [{"user": "alice"}]
+
+    def test_portable_context_resolves_lazy_values(self):
+        ctx = {"user": LazyValue(lambda: "alice"), "n": 1}
+        assert get_portable_context(ctx) == {"user": "alice", "n": 1}
+
+    def test_portable_context_converts_unpicklable_values(self):
+        lock = Lock()
+        ctx = {"user": "alice", "lock": lock}
+        assert get_portable_context(ctx) == {"user": "alice", "lock": str(lock)}
+
+
+class ContextThreadTests(InitializedContextBase):
+    def test_raw_thread_does_not_inherit_context(self):
+        results = []
+        with context(user="alice"):
+            thread = Thread(target=lambda: results.append(get_context()))
+            run_thread(thread)
+        assert results == [{}]
+
+    def test_thread_runs_in_creators_context(self):
+        results = []
+        with context(user="alice"):
+            thread = ContextThread(target=lambda: results.append(get_context()))
+        with context(user="bob"):
+            run_thread(thread)
+        assert results == [{"user": "alice"}]
+
+    def test_context_is_passed_by_reference(self, store):
+        results = []
+        with context(user="alice"):
+            thread = ContextThread(target=lambda: results.append(get_context()))
+            current = store.get()
+            run_thread(thread)
+        assert results[0] is current
+
+
+class ContextThreadPoolExecutorTests(InitializedContextBase):
+    @fixture
+    def executor(self):
+        with ContextThreadPoolExecutor(max_workers=2) as executor:
+            yield executor
+
+    def test_tasks_run_in_submitters_context(self, executor, store):
+        with context(user="alice"):
+            current = store.get()
+            future = executor.submit(get_context)
+        assert future.result() is current
+
+    def test_submit_passes_arguments(self, executor):
+        with context(user="alice"):
+            result = executor.submit(get_context_dict, 1, x=2).result()
+        assert result == {"user": "alice", "args": (1,), "kwargs": {"x": 2}}
+
+    def test_map_uses_submitters_context(self, executor):
+        with context(user="alice"):
+            results = list(executor.map(get_context_dict, [1, 2]))
+        assert [r["user"] for r in results] == ["alice", "alice"]
+        assert [r["args"] for r in results] == [(1,), (2,)]
+
+    def test_worker_context_is_restored(self, executor):
+        with context(user="alice"):
+            executor.submit(get_context).result()
+        assert executor.submit(get_context).result() == {}
+
+
+class PersistentContextThreadPoolExecutorTests(PersistentContextBase):
+    def test_tasks_run_in_submitters_context(self, store):
+        with ContextThreadPoolExecutor(max_workers=1) as executor:
+            with context(user="alice"):
+                with context(n=1):
+                    current = store.get()
+                    future = executor.submit(get_context)
+            assert future.result() is current
+
+
+class ContextProcessPoolExecutorTests(InitializedContextBase):
+    @fixture
+    def executor(self):
+        with ContextProcessPoolExecutor(max_workers=1) as executor:
+            yield executor
+
+    def test_tasks_run_in_submitters_context(self, executor):
+        with context(user="alice", n=LazyValue(lambda: 1)):
+            result = executor.submit(get_context_dict, 1, x=2).result()
+        assert result == {
+            "user": "alice",
+            "n": 1,
+            "args": (1,),
+            "kwargs": {"x": 2},
+        }
+
+    def test_unpicklable_values_do_not_break_submit(self, executor):
+        with context(user="alice", lock=Lock()):
+            assert executor.submit(abs, -1).result() == 1
+            result = executor.submit(get_context).result()
+        assert result["user"] == "alice"
+        assert isinstance(result["lock"], str)
+
+    def test_portable_context_is_reused_within_context(self, executor):
+        with context(user="alice"):
+            executor.submit(get_context).result()
+            portable = executor._portable_context[1]
+            executor.submit(get_context).result()
+            assert executor._portable_context[1] is portable
+        with context(user="bob"):
+            assert executor.submit(get_context).result() == {"user": "bob"}
@@ -0,0 +1,124 @@
+from pytest import raises
+
+from loggingex.context import (
+    ContextChange,
+    ContextInvalidNameException,
+    FrozenContextChange,
+    context,
+)
+from .helpers import InitializedContextBase, PersistentContextBase
+
+
+def test_freeze_creates_frozen_context_change():
+    change = ContextChange().fresh().remove("foo").update(bar=1)
+    frozen = change.freeze()
+    assert isinstance(frozen, FrozenContextChange)
+    assert frozen.context_fresh is True
+    assert frozen.context_remove == {"foo"}
+    assert frozen.context_update == {"bar": 1}
+
+
+def test_freeze_does_not_validate_names_again(mocker):
+    change = ContextChange().update(foo=1, bar=2)
+    spy = mocker.spy(ContextChange, "validate_context_variable_name")
+    change.freeze()
+    assert spy.call_count == 0
+
+
+def test_frozen_change_validates_names():
+    with raises(ContextInvalidNameException):
+        FrozenContextChange(context_update={"1bad": 1})
+    with raises(ContextInvalidNameException):
+        FrozenContextChange(context_remove={"bad name"})
+
+
+def test_frozen_change_is_not_affected_by_later_modifications():
+    change = ContextChange().remove("foo").update(bar=1)
+    frozen = change.freeze()
+    change.remove("baz").update(bar=2)
+    assert frozen.context_remove == {"foo"}
+    assert frozen.context_update == {"bar": 1}
+
+
+def test_frozen_change_can_not_be_modified():
+    frozen = ContextChange().update(bar=1).freeze()
+    assert raises(AttributeError, setattr, frozen, "_fresh", True)
+    assert raises(AttributeError, delattr, frozen, "_update")
+    with raises(TypeError):
+        frozen.context_update["bar"] = 2
+
+
+def test_compile_shortcut_creates_frozen_context_change():
+    frozen = context.compile("foo", bar="baz")
+    assert isinstance(frozen, FrozenContextChange)
+    assert frozen.context_remove == {"foo"}
+    assert frozen.context_update == {"bar": "baz"}
+
+
+def test_str_and_repr():
+    frozen = context.fresh(y=2, x=1).remove("a").freeze()
+    assert str(frozen) == "-* -a +x=1 +y=2"
+    assert repr(frozen) == "<FrozenContextChange: -* -a +x=1 +y=2>"
+
+
+def test_apply_combines_removes_and_updates():
+    frozen = context.compile("foo", "bar", baz=1337, new=True)
+    initial = {"foo": 1, "baz": 2, "old": "yes"}
+    assert frozen.apply(initial) == {"old": "yes", "baz": 1337, "new": True}
+    assert initial == {"foo": 1, "baz": 2, "old": "yes"}
+
+
+def test_apply_starts_fresh_when_fresh():
+    frozen = context.fresh(bar=1).freeze()
+    assert frozen.apply({"foo": 1}) == {"bar": 1}
+
+
+class StartAndStopTests(InitializedContextBase):
+    def test_start_returns_token_and_stop_restores_it(self, store):
+        frozen = context.compile(foo=1)
+        token1 = frozen.start()
+        token2 = frozen.start()
+        assert store.get() == {"foo": 1}
+        frozen.stop(token2)
+        frozen.stop(token1)
+        assert store.get() == {}
+
+    def test_can_be_used_as_decorator(self, store):
+        @context.compile(func="foo")
+        def foo(a, b):
+            assert store.get() == {"func": "foo"}
+            return a + b
+
+        assert foo(1, 2) == 3
+        assert store.get() == {}
+
+    def test_decorator_restores_context_on_exceptions(self, store):
+        @context.compile(func="foo")
+        def foo():
+            raise ValueError("test")
+
+        assert raises(ValueError, foo)
+        assert store.get() == {}
+
+    def test_context_change_decorator_validates_once(self, mocker, store):
+        decorator = context(func="foo")
+        spy = mocker.spy(ContextChange, "validate_context_variable_name")
+
+        @decorator
+        def foo():
+            return store.get()
+
+        for _ in range(10):
+            assert foo() == {"func": "foo"}
+        assert spy.call_count == 0
+
+
+class PersistentStartAndStopTests(PersistentContextBase):
+    def test_nested_frozen_changes_share_update(self, store):
+        frozen = context.compile(foo=1)
+        with context(bar=2):
+            token = frozen.start()
+            assert store.get() == {"foo": 1, "bar": 2}
+            assert store.get()._update is frozen._update
+            frozen.stop(token)
+        assert store.get() == {}
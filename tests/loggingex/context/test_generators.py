@@ -0,0 +1,227 @@
+import gc
+from collections.abc import Generator
+from contextvars import ContextVar, copy_context
+from threading import Thread
+
+from pytest import raises
+
+from loggingex.context import context
+from loggingex.context.wrappers import ContextGenerator
+from .helpers import InitializedContextBase, PersistentContextBase
+
+consumer_variable = ContextVar("consumer_variable", default="default")
+
+
+class GeneratorDecoratorTests(InitializedContextBase):
+    def test_context_is_applied_only_while_generator_runs(self, store):
+        @context(func="gen")
+        def gen(n):
+            for i in range(n):
+                yield i, store.get()
+
+        generator = gen(3)
+        assert isinstance(generator, ContextGenerator)
+        assert isinstance(generator, Generator)
+        results = [(i, ctx, store.get()) for i, ctx in generator]
+        assert results == [(i, {"func": "gen"}, {}) for i in range(3)]
+
+    def test_generator_follows_consumer_context(self, store):
+        @context(func="gen")
+        def gen():
+            while True:
+                yield store.get()
+
+        generator = gen()
+        assert next(generator) == {"func": "gen"}
+        with context(request="a"):
+            assert next(generator) == {"func": "gen", "request": "a"}
+            assert next(generator) == {"func": "gen", "request": "a"}
+        assert next(generator) == {"func": "gen"}
+        assert store.get() == {}
+
+    def test_nested_changes_of_generator_body_are_kept(self, store):
+        @context(func="gen")
+        def gen():
+            with context(step=1):
+                yield store.get()
+                yield store.get()
+            yield store.get()
+
+        assert list(gen()) == [
+            {"func": "gen", "step": 1},
+            {"func": "gen", "step": 1},
+            {"func": "gen"},
+        ]
+        assert store.get() == {}
+
+    def test_nested_changes_are_kept_when_consumer_context_changes(
+        self, store
+    ):
+        @context(stage="parse")
+        def gen():
+            with context(file="a"):
+                yield store.get()
+                yield store.get()
+            yield store.get()
+
+        generator = gen()
+        seen = []
+        for i in range(2):
+            with context(item=i):
+                seen.append(next(generator))
+        with context(final=1):
+            seen.append(next(generator))
+        assert seen == [
+            {"stage": "parse", "file": "a", "item": 0},
+            {"stage": "parse", "file": "a", "item": 1},
+            {"stage": "parse", "final": 1},
+        ]
+        assert store.get() == {}
+
+    def test_changes_stopped_out_of_order_are_removed(self, store):
+        @context(stage="parse")
+        def gen():
+            first = context(a=1)
+            second = context(b=2)
+            first.start()
+            second.start()
+            first.stop()
+            yield store.get()
+            second.stop()
+            yield store.get()
+
+        generator = gen()
+        assert next(generator) == {"stage": "parse", "b": 2}
+        with context(item=1):
+            assert next(generator) == {"stage": "parse", "item": 1}
+
+    def test_abandoned_generator_does_not_change_context(self, store):
+        @context(stage="parse")
+        def gen():
+            with context(file="a"):
+                yield store.get()
+
+        generator = gen()
+        next(generator)
+        with context(item=1):
+            del generator
+            gc.collect()
+            assert store.get() == {"item": 1}
+
+    def test_send_throw_and_close_are_forwarded(self, store):
+        closed = []
+
+        @context(func="gen")
+        def gen():
+            try:
+                value = yield store.get()
+                try:
+                    yield (value, store.get())
+                except KeyError:
+                    yield ("thrown", store.get())
+            finally:
+                closed.append(store.get())
+
+        generator = gen()
+        assert next(generator) == {"func": "gen"}
+        assert generator.send(1) == (1, {"func": "gen"})
+        assert generator.throw(KeyError) == ("thrown", {"func": "gen"})
+        generator.close()
+        assert closed == [{"func": "gen"}]
+        assert store.get() == {}
+
+    def test_exceptions_are_propagated(self, store):
+        @context(func="gen")
+        def gen():
+            yield 1
+            raise ValueError("test")
+
+        assert raises(ValueError, list, gen())
+        assert store.get() == {}
+
+    def test_body_sees_other_context_variables_of_consumer(self, store):
+        @context(func="gen")
+        def gen():
+            yield consumer_variable.get()
+
+        def consume():
+            consumer_variable.set("consumer")
+            return list(gen())
+
+        assert copy_context().run(consume) == ["consumer"]
+
+    def test_changes_of_threads_spawned_by_body_are_not_applied_to_it(
+        self, store
+    ):
+        seen = []
+
+        def target():
+            with context(thread=1):
+                seen.append(store.get())
+
+        @context(gen=1)
+        def gen():
+            thread = Thread(target=copy_context().run, args=(target,))
+            thread.start()
+            thread.join()
+            yield store.get()
+
+        assert list(gen()) == [{"gen": 1}]
+        assert seen == [{"gen": 1, "thread": 1}]
+
+    def test_scope_of_generator_body_is_kept(self, store):
+        @context(func="gen")
+        def gen():
+            with context.scope() as scope:
+                scope.set(b=2)
+                yield store.get()
+                yield store.get()
+                scope.set(b=3)
+                yield store.get()
+            yield store.get()
+
+        generator = gen()
+        seen = []
+        for i in range(4):
+            with context(o=i):
+                seen.append(next(generator))
+        assert seen == [
+            {"o": 0, "func": "gen", "b": 2},
+            {"o": 1, "func": "gen", "b": 2},
+            {"o": 2, "func": "gen", "b": 3},
+            {"o": 3, "func": "gen"},
+        ]
+        assert store.get() == {}
+
+    def test_iterate_in_generator_body(self, store):
+        @context(func="gen")
+        def gen():
+            for _ in context.iterate([1, 2], item=lambda item: item):
+                yield store.get()
+            yield store.get()
+
+        generator = gen()
+        seen = []
+        for i in range(3):
+            with context(o=i):
+                seen.append(next(generator))
+        assert seen == [
+            {"o": 0, "func": "gen", "item": 1},
+            {"o": 1, "func": "gen", "item": 2},
+            {"o": 2, "func": "gen"},
+        ]
+        assert store.get() == {}
+
+
+class PersistentGeneratorDecoratorTests(PersistentContextBase):
+    def test_applied_context_is_reused(self, store):
+        @context(func="gen")
+        def gen():
+            while True:
+                yield store.get()
+
+        generator = gen()
+        with context(request="a"):
+            first, second = next(generator), next(generator)
+        assert first is second
+        assert first == {"func": "gen", "request": "a"}
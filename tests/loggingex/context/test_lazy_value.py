@@ -0,0 +1,131 @@
+import logging
+import pickle
+from logging.handlers import SocketHandler
+from threading import Thread
+
+from pytest import fixture
+
+from loggingex.context import (
+    ContextSnapshot,
+    LazyValue,
+    LoggingContextFilter,
+    context,
+)
+from loggingex.context.lazy import resolve_value
+from .helpers import InitializedContextBase
+
+
+def test_factory_is_called_once(mocker):
+    factory = mocker.Mock(return_value="alice")
+    value = LazyValue(factory)
+    assert value.resolved is False
+    assert value.resolve() == "alice"
+    assert value.resolve() == "alice"
+    assert value.resolved is True
+    factory.assert_called_once_with()
+
+
+def test_factory_is_called_once_by_concurrent_threads(mocker):
+    factory = mocker.Mock(return_value="alice")
+    value = LazyValue(factory)
+    threads = [Thread(target=value.resolve) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    factory.assert_called_once_with()
+
+
+def test_renew_returns_unresolved_copy():
+    value = LazyValue(lambda: "alice")
+    value.resolve()
+    renewed = value.renew()
+    assert renewed.resolved is False
+    assert renewed.factory is value.factory
+
+
+def test_repr():
+    value = LazyValue(lambda: "alice")
+    assert repr(value) == "<LazyValue: unresolved>"
+    value.resolve()
+    assert repr(value) == "<LazyValue: 'alice'>"
+
+
+def test_resolve_value_resolves_only_lazy_values():
+    assert resolve_value(LazyValue(lambda: 1)) == 1
+    assert resolve_value(2) == 2
+
+
+def test_pickles_resolved_value():
+    value = LazyValue(lambda: "alice")
+    assert pickle.loads(pickle.dumps(value)) == "alice"
+    assert value.resolved is True
+
+
+def test_lazy_shortcut_creates_lazy_updates():
+    factory = lambda: "alice"  # noqa: E731
+    change = context.lazy(user=factory)
+    assert isinstance(change.context_update["user"], LazyValue)
+    assert change.context_update["user"].factory is factory
+
+
+class LazyContextTests(InitializedContextBase):
+    @fixture()
+    def factory(self, mocker):
+        return mocker.Mock(return_value="alice")
+
+    @fixture()
+    def logger(self, caplog):
+        logger = logging.getLogger("test.lazy")
+        context_filter = LoggingContextFilter()
+        logger.addFilter(context_filter)
+        with caplog.at_level(logging.INFO, logger.name):
+            yield logger
+        logger.removeFilter(context_filter)
+
+    def test_not_resolved_when_nothing_is_emitted(self, factory, logger):
+        with context.lazy(user=factory):
+            logger.debug("not emitted")
+        factory.assert_not_called()
+
+    def test_resolved_once_per_scope_by_filter(self, factory, logger, caplog):
+        with context.lazy(user=factory):
+            logger.info("one")
+            with context(num=1):
+                logger.info("two")
+        factory.assert_called_once_with()
+        assert [r.user for r in caplog.records] == ["alice", "alice"]
+
+    def test_resolved_by_snapshot_when_read(self, factory, store):
+        with context.lazy(user=factory):
+            snapshot = ContextSnapshot(store.get())
+            factory.assert_not_called()
+            assert snapshot.user == "alice"
+            assert snapshot["user"] == "alice"
+        factory.assert_called_once_with()
+
+    def test_frozen_changes_resolve_once_per_scope(self, factory, store):
+        @context.lazy(user=factory)
+        def user():
+            return ContextSnapshot(store.get()).user
+
+        assert user() == "alice"
+        assert user() == "alice"
+        assert factory.call_count == 2
+
+    def test_reused_changes_resolve_once_per_scope(self, logger, caplog):
+        counter = iter(range(10))
+        change = context.lazy(n=lambda: next(counter))
+        for _ in range(2):
+            with change:
+                logger.info("one")
+                logger.info("two")
+        assert [r.n for r in caplog.records] == [0, 0, 1, 1]
+
+    def test_record_carrying_lazy_value_can_be_pickled(self, logger, caplog):
+        with context.lazy(user=lambda: "alice"):
+            logger.info("test")
+        handler = SocketHandler("localhost", None)
+        data = pickle.loads(handler.makePickle(caplog.records[0])[4:])
+        assert data["user"] == "alice"
+        assert data["_loggingex_context"] == {"user": "alice"}
@@ -0,0 +1,117 @@
+import logging
+from logging import DEBUG, ERROR, INFO, WARNING, getLogger
+
+from pytest import fixture, raises
+
+from loggingex.context import (
+    ContextInvalidNameException,
+    ContextLevelOverrides,
+    context,
+)
+from loggingex.context.levels import get_level_number
+from .helpers import InitializedContextBase
+
+
+def test_get_level_number_accepts_numbers_and_names():
+    assert get_level_number(DEBUG) == DEBUG
+    assert get_level_number("INFO") == INFO
+    with raises(ValueError):
+        get_level_number("VERBOSE")
+
+
+def test_add_rule_validates_names():
+    with raises(ContextInvalidNameException):
+        ContextLevelOverrides({("not valid", 1): DEBUG})
+
+
+class LevelOverridesTests(InitializedContextBase):
+    @fixture()
+    def logger(self):
+        logger = getLogger("loggingex.tests.levels")
+        logger.setLevel(WARNING)
+        yield logger
+        logger.__dict__.pop("isEnabledFor", None)
+        logger.setLevel(logging.NOTSET)
+
+    @fixture()
+    def overrides(self, logger):
+        overrides = ContextLevelOverrides(
+            {("tenant", "acme"): "DEBUG", ("tenant", "noisy"): ERROR}
+        )
+        overrides.install(logger)
+        return overrides
+
+    def test_get_level_returns_lowest_matching_level(self):
+        overrides = ContextLevelOverrides(
+            {("tenant", "acme"): INFO, ("request_id", "abc"): DEBUG}
+        )
+        assert overrides.get_level({}) is None
+        assert overrides.get_level({"tenant": "acme"}) == INFO
+        context = {"tenant": "acme", "request_id": "abc"}
+        assert overrides.get_level(context) == DEBUG
+        assert overrides.get_level({"tenant": ["unhashable"]}) is None
+
+    def test_logger_level_is_used_without_matching_rule(
+        self, logger, overrides
+    ):
+        assert logger.isEnabledFor(DEBUG) is False
+        assert logger.isEnabledFor(WARNING) is True
+        with context(tenant="other"):
+            assert logger.isEnabledFor(DEBUG) is False
+
+    def test_matching_rule_overrides_logger_level(self, logger, overrides):
+        with context(tenant="acme"):
+            assert logger.isEnabledFor(DEBUG) is True
+        with context(tenant="noisy"):
+            assert logger.isEnabledFor(WARNING) is False
+            assert logger.isEnabledFor(ERROR) is True
+
+    def test_records_are_logged_with_overridden_level(
+        self, caplog, logger, overrides
+    ):
+        caplog.set_level(DEBUG)
+        logger.setLevel(WARNING)
+        logger.debug("hidden")
+        with context(tenant="acme"):
+            logger.debug("shown")
+        assert [r.getMessage() for r in caplog.records] == ["shown"]
+
+    def test_logging_disable_is_respected(self, logger, overrides):
+        logging.disable(INFO)
+        try:
+            with context(tenant="acme"):
+                assert logger.isEnabledFor(DEBUG) is False
+        finally:
+            logging.disable(logging.NOTSET)
+
+    def test_disabled_logger_is_not_enabled(self, logger, overrides):
+        logger.disabled = True
+        try:
+            with context(tenant="acme"):
+                assert logger.isEnabledFor(ERROR) is False
+        finally:
+            logger.disabled = False
+
+    def test_rules_can_be_added_and_removed(self, logger, overrides):
+        with context(tenant="other"):
+            assert logger.isEnabledFor(INFO) is False
+            overrides.add_rule("tenant", "other", INFO)
+            assert logger.isEnabledFor(INFO) is True
+            overrides.remove_rule("tenant", "other")
+            assert logger.isEnabledFor(INFO) is False
+        overrides.remove_rule("user", "nobody")
+
+    def test_decision_is_cached_per_context(self, mocker, logger, overrides):
+        spy = mocker.spy(overrides, "get_level")
+        with context(tenant="acme"):
+            for _ in range(3):
+                logger.isEnabledFor(DEBUG)
+        assert spy.call_count == 1
+
+    def test_install_and_uninstall(self, logger, overrides):
+        assert overrides.is_installed(logger)
+        overrides.install(logger)
+        overrides.uninstall(logger)
+        assert not overrides.is_installed(logger)
+        assert "isEnabledFor" not in logger.__dict__
+        overrides.uninstall(logger)
@@ -3,7 +3,10 @@ from logging import DEBUG, LogRecord
 from pytest import fixture, mark
 
 from loggingex.context import LoggingContextFilter
-from loggingex.context.filter import IGNORED_VARIABLE_NAMES
+from loggingex.context.filter import (
+    IGNORED_VARIABLE_NAMES,
+    INJECTED_CONTEXT_ATTRIBUTE,
+)
 from .helpers import InitializedContextBase
 
 
@@ -29,3 +32,35 @@ class FilterTests(InitializedContextBase):
         LoggingContextFilter().filter(record)
         assert record.foo == 1
         assert getattr(record, field, "undefined") != "overwrite"
+
+    def test_injection_plan_is_cached_for_same_context(self, store):
+        context_filter = LoggingContextFilter()
+        context = {"foo": 1, "name": "overwrite"}
+        plan = context_filter.get_injection_plan(context)
+        assert plan == {"foo": 1, INJECTED_CONTEXT_ATTRIBUTE: context}
+        assert context_filter.get_injection_plan(context) is plan
+
+    def test_injection_plan_is_recalculated_when_context_changes(self, store):
+        context_filter = LoggingContextFilter()
+        store.replace({"foo": 1})
+        record = LogRecord("test", DEBUG, "test.py", 1, "message", (), None)
+        context_filter.filter(record)
+        assert record.foo == 1
+        store.replace({"foo": 2})
+        record = LogRecord("test", DEBUG, "test.py", 1, "message", (), None)
+        context_filter.filter(record)
+        assert record.foo == 2
+
+    def test_injected_context_is_saved_in_the_record(self, store, record):
+        context = {"foo": 1}
+        store.replace(context)
+        LoggingContextFilter().filter(record)
+        assert getattr(record, INJECTED_CONTEXT_ATTRIBUTE) is context
+
+    def test_context_is_not_injected_twice(self, store, record):
+        store.replace({"foo": 1})
+        LoggingContextFilter().filter(record)
+        store.replace({"foo": 2, "bar": 3})
+        assert LoggingContextFilter().filter(record) == 1
+        assert record.foo == 1
+        assert not hasattr(record, "bar")
@@ -6,7 +6,7 @@ import time
 from pytest import fixture
 
 from loggingex.context import LoggingContextFilter, context
-from .helpers import InitializedContextBase
+from .helpers import InitializedContextBase, PersistentContextBase
 
 
 class SimpleLoggingTests(InitializedContextBase):
@@ -63,6 +63,10 @@ class SimpleLoggingTests(InitializedContextBase):
                 assert getattr(record, k, "undefined") == v
 
 
+class PersistentSimpleLoggingTests(PersistentContextBase, SimpleLoggingTests):
+    pass
+
+
 class MultiThreadedLoggingTests(InitializedContextBase):
     @fixture(autouse=True)
     def logging_context_of_the_test(self, request, initialized_context):
@@ -0,0 +1,95 @@
+import logging
+
+from pytest import fixture, raises
+
+from loggingex.context import (
+    LoggingContextFilter,
+    LoggingContextRecordFactory,
+    context,
+)
+from .helpers import InitializedContextBase
+
+
+class RecordFactoryTests(InitializedContextBase):
+    @fixture(autouse=True)
+    def restore_record_factory(self):
+        factory = logging.getLogRecordFactory()
+        make_record = logging.Logger.makeRecord
+        yield
+        logging.setLogRecordFactory(factory)
+        logging.Logger.makeRecord = make_record
+
+    @fixture()
+    def logger(self):
+        logger = logging.getLogger("test.record_factory.extra")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        records = []
+        handler = logging.NullHandler()
+        handler.handle = records.append
+        logger.addHandler(handler)
+        logger.records = records
+        yield logger
+        logger.removeHandler(handler)
+
+    def test_records_are_created_with_context(self):
+        factory = LoggingContextRecordFactory()
+        with context(foo=1):
+            record = factory("test", logging.DEBUG, "t.py", 1, "msg", (), None)
+        assert record.foo == 1
+
+    def test_chains_to_given_factory(self, mocker):
+        base = mocker.Mock(return_value=logging.makeLogRecord({}))
+        factory = LoggingContextRecordFactory(base)
+        with context(foo=1):
+            record = factory("test", logging.DEBUG)
+        base.assert_called_once_with("test", logging.DEBUG)
+        assert record.foo == 1
+
+    def test_install_and_uninstall(self):
+        previous = logging.getLogRecordFactory()
+        make_record = logging.Logger.makeRecord
+        factory = LoggingContextRecordFactory.install()
+        assert logging.getLogRecordFactory() is factory
+        assert factory.factory is previous
+        assert logging.Logger.makeRecord.original is make_record
+        factory.uninstall()
+        assert logging.getLogRecordFactory() is previous
+        assert logging.Logger.makeRecord is make_record
+
+    def test_context_is_injected_once_with_multiple_handlers(self, mocker):
+        LoggingContextRecordFactory.install()
+        spy = mocker.spy(LoggingContextFilter, "get_injection_plan")
+        handlers = [logging.NullHandler() for _ in range(3)]
+        for handler in handlers:
+            handler.addFilter(LoggingContextFilter())
+        logger = logging.getLogger("test.record_factory")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        records = []
+        handlers[0].handle = records.append
+        for handler in handlers:
+            logger.addHandler(handler)
+        try:
+            with context(foo=1):
+                logger.debug("message")
+        finally:
+            for handler in handlers:
+                logger.removeHandler(handler)
+        assert spy.call_count == 1
+        assert records[0].foo == 1
+
+    def test_extra_overwrites_context_variables(self, logger):
+        LoggingContextRecordFactory.install()
+        with context(user="alice", foo=1):
+            logger.info("message", extra={"user": "bob", "bar": 2})
+        record = logger.records[0]
+        assert (record.user, record.foo, record.bar) == ("bob", 1, 2)
+
+    def test_extra_does_not_overwrite_record_attributes(self, logger):
+        LoggingContextRecordFactory.install()
+        with context(user="alice"):
+            for name in ("name", "message", "_loggingex_context"):
+                with raises(KeyError):
+                    logger.info("message", extra={name: 1})
+        assert logger.records == []
@@ -0,0 +1,114 @@
+from operator import itemgetter
+
+from pytest import raises
+
+from loggingex.context import (
+    ContextChangeAlreadyStartedException,
+    ContextChangeNotStartedException,
+    ContextInvalidNameException,
+    ContextMap,
+    ContextScope,
+    context,
+)
+from .helpers import InitializedContextBase, PersistentContextBase
+
+
+def test_scope_shortcut_creates_context_scope():
+    scope = context.scope()
+    assert isinstance(scope, ContextScope)
+    assert scope.started is False
+
+
+def test_scope_must_be_started_to_set_variables():
+    with raises(ContextChangeNotStartedException):
+        context.scope().set(foo=1)
+
+
+def test_scope_must_be_started_to_be_stopped():
+    with raises(ContextChangeNotStartedException):
+        context.scope().stop()
+
+
+def test_iterate_validates_names_eagerly():
+    with raises(ContextInvalidNameException):
+        context.iterate([], **{"not valid": len})
+
+
+class ScopeTests(InitializedContextBase):
+    def test_set_rebinds_variables_in_place(self, store):
+        with context(foo=1):
+            with context.scope() as scope:
+                assert store.get() == {"foo": 1}
+                scope.set(bar=1)
+                assert store.get() == {"foo": 1, "bar": 1}
+                scope.set(bar=2, baz=3)
+                assert store.get() == {"foo": 1, "bar": 2, "baz": 3}
+                scope.set(foo=4)
+                assert store.get() == {"foo": 4, "bar": 2, "baz": 3}
+            assert store.get() == {"foo": 1}
+        assert store.get() == {}
+
+    def test_set_does_not_modify_previous_contexts(self, store):
+        with context.scope() as scope:
+            scope.set(foo=1)
+            previous = store.get()
+            scope.set(foo=2)
+        assert previous == {"foo": 1}
+
+    def test_set_keeps_variables_of_nested_changes(self, store):
+        with context(outer=1):
+            with context.scope() as scope:
+                with context(a=1):
+                    scope.set(i=1)
+                    assert store.get() == {"outer": 1, "a": 1, "i": 1}
+                assert store.get() == {"outer": 1}
+                scope.set(i=2)
+                assert store.get() == {"outer": 1, "i": 2}
+
+    def test_set_validates_names(self, store):
+        with context.scope() as scope:
+            with raises(ContextInvalidNameException):
+                scope.set(**{"not valid": 1})
+        assert store.get() == {}
+
+    def test_scope_can_not_be_started_twice(self, store):
+        with context.scope() as scope:
+            with raises(ContextChangeAlreadyStartedException):
+                scope.start()
+        assert store.get() == {}
+
+    def test_iterate_sets_variables_per_item(self, store):
+        seen = []
+        items = context.iterate(
+            enumerate("abc", 1), line=itemgetter(0), text=itemgetter(1)
+        )
+        for _ in items:
+            seen.append(store.get())
+        assert seen == [
+            {"line": 1, "text": "a"},
+            {"line": 2, "text": "b"},
+            {"line": 3, "text": "c"},
+        ]
+        assert store.get() == {}
+
+
+class PersistentScopeTests(PersistentContextBase):
+    def test_set_rebinds_persistent_contexts(self, store):
+        with context(foo=1):
+            with context.scope() as scope:
+                for i in range(100):
+                    scope.set(bar=i)
+                scope.set(baz=True)
+                assert isinstance(store.get(), ContextMap)
+                assert store.get() == {"foo": 1, "bar": 99, "baz": True}
+                assert store.get()._depth == 2
+            assert store.get() == {"foo": 1}
+
+    def test_set_keeps_variables_of_nested_changes(self, store):
+        with context.scope() as scope:
+            with context(a=1):
+                scope.set(i=1)
+                assert isinstance(store.get(), ContextMap)
+                assert store.get() == {"a": 1, "i": 1}
+            scope.set(i=2)
+            assert store.get() == {"i": 2}
@@ -0,0 +1,185 @@
+import json
+
+from pytest import fixture, mark, raises
+
+from loggingex.context import (
+    ContextChange,
+    ContextExporter,
+    ContextImportException,
+    ContextImporter,
+    ContextInvalidNameException,
+    ContextMap,
+    LazyValue,
+    context,
+    export_context,
+    import_context,
+)
+from loggingex.context.transport import (
+    RECORD_SEPARATOR,
+    UNIT_SEPARATOR,
+    decode_value,
+    encode_value,
+)
+from .helpers import InitializedContextBase, PersistentContextBase
+
+VALUES = [
+    "",
+    "abc",
+    "zażółć",
+    "a%sb" % RECORD_SEPARATOR,
+    "a%sb" % UNIT_SEPARATOR,
+    0,
+    -12,
+    2 ** 70,
+    1.5,
+    float("inf"),
+    True,
+    False,
+    None,
+    [1, "a"],
+    {"a": [1, None]},
+]
+
+
+@mark.parametrize("value", VALUES)
+def test_encoded_values_are_decoded(value):
+    assert decode_value(*encode_value(value)) == value
+
+
+def test_encoded_values_have_no_separators():
+    for value in VALUES:
+        _, encoded = encode_value(value)
+        assert RECORD_SEPARATOR not in encoded
+        assert UNIT_SEPARATOR not in encoded
+
+
+def test_unsupported_values_are_encoded_as_strings():
+    assert encode_value(object) == ("s", str(object))
+
+
+def test_lazy_values_are_resolved():
+    assert encode_value(LazyValue(lambda: 1)) == ("i", "1")
+
+
+def test_unknown_tag_raises():
+    with raises(ValueError):
+        decode_value("?", "")
+
+
+@mark.parametrize(
+    "ctx",
+    [
+        {},
+        {"a": "x"},
+        {"a": "x", "b": "y"},
+        {"a": 1, "b": 1.5, "c": True, "d": None, "e": "x"},
+        {"a": [1], "b": "x%sy" % UNIT_SEPARATOR, "c": 1},
+    ],
+)
+def test_exported_context_is_imported(ctx):
+    change = import_context(export_context(ctx))
+    assert isinstance(change, ContextChange)
+    assert change.context_update == ctx
+
+
+def test_export_allowlist():
+    exported = export_context({"a": 1, "b": 2}, keys=["b", "c"])
+    assert import_context(exported).context_update == {"b": 2}
+
+
+def test_export_skips_large_values():
+    ctx = {"a": "x" * 10, "b": "y" * 11}
+    exported = export_context(ctx, max_value_size=10)
+    assert import_context(exported).context_update == {"a": "x" * 10}
+
+
+def test_export_drops_variables_from_the_end_to_fit():
+    ctx = {"a": "x" * 10, "b": "y" * 10, "c": "z" * 10}
+    exported = export_context(ctx, max_size=30)
+    assert len(exported) <= 30
+    assert import_context(exported).context_update == {"a": "x" * 10}
+
+
+def test_export_is_smaller_than_json():
+    ctx = {"user": "alice", "user_id": 1, "path": "/a/b", "sampled": True}
+    assert len(export_context(ctx)) < len(json.dumps(ctx))
+
+
+def test_import_allowlist():
+    exported = export_context({"a": 1, "b": 2})
+    assert import_context(exported, keys=["a"]).context_update == {"a": 1}
+
+
+@mark.parametrize(
+    "data",
+    [
+        "",
+        "XX9",
+        "LX1",
+        "LX1\x1es\x1ea",
+        "LX1\x1ess\x1ea\x1ex",
+        "LX1\x1ei\x1ea\x1ex",
+        "LX1\x1e?\x1ea\x1ex",
+        "LX1\x1ej\x1ea\x1e{",
+    ],
+)
+def test_import_malformed_data_raises(data):
+    with raises(ContextImportException):
+        import_context(data)
+
+
+def test_import_too_large_data_raises():
+    exported = export_context({"a": "x" * 100})
+    with raises(ContextImportException):
+        import_context(exported, max_size=100)
+
+
+def test_import_validates_names():
+    with raises(ContextInvalidNameException):
+        import_context("LX1\x1ess\x1ea\x1fnot valid\x1ex\x1fy")
+
+
+class ContextExporterTests(InitializedContextBase):
+    def test_current_context_is_exported(self):
+        with context(user="alice"):
+            exported = export_context()
+        assert import_context(exported).context_update == {"user": "alice"}
+
+    def test_export_is_cached_per_context(self, mocker):
+        exporter = ContextExporter()
+        encode = mocker.spy(exporter, "encode")
+        with context(user="alice"):
+            first = exporter.export()
+            assert exporter.export() is first
+            with context(user="bob"):
+                exporter.export()
+        assert encode.call_count == 2
+
+
+class PersistentContextExporterTests(PersistentContextBase):
+    def test_context_map_is_exported(self):
+        ctx = ContextMap({"a": 1}).evolve(update={"b": "x"})
+        assert import_context(export_context(ctx)).context_update == {
+            "a": 1,
+            "b": "x",
+        }
+
+
+class ContextImporterTests(InitializedContextBase):
+    @fixture
+    def importer(self):
+        return ContextImporter()
+
+    def test_imported_change_can_be_started(self, importer, store):
+        change = importer.load(export_context({"user": "alice"}))
+        with change:
+            assert store.get() == {"user": "alice"}
+
+    def test_import_is_cached(self, importer, mocker):
+        decode = mocker.spy(importer, "decode")
+        exported = export_context({"user": "alice"})
+        first = importer.load(exported)
+        second = importer.load(exported)
+        assert decode.call_count == 1
+        assert first.context_update == second.context_update
+        assert first.context_update is not second.context_update
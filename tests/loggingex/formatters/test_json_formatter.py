@@ -0,0 +1,177 @@
+import json
+import logging
+import sys
+
+from pytest import fixture, mark
+
+from loggingex.context import LazyValue, LoggingContextFilter, context
+from loggingex.formatters import JsonFormatter
+from loggingex.formatters import json_formatter
+from loggingex.handlers import ContextQueueHandler
+from ..context.helpers import InitializedContextBase, PersistentContextBase
+
+
+def make_record(msg="message", args=(), exc_info=None):
+    return logging.LogRecord(
+        "test", logging.INFO, "t.py", 1, msg, args, exc_info
+    )
+
+
+def inject(record):
+    LoggingContextFilter().filter(record)
+    return record
+
+
+def test_json_encoder_is_compact_and_falls_back_to_str():
+    assert json_formatter.json_encoder({"a": [1, 2]}) == '{"a":[1,2]}'
+    assert json_formatter.json_encoder({"a": object}) == (
+        '{"a":"%s"}' % str(object)
+    )
+
+
+def test_default_encoder_depends_on_orjson(monkeypatch):
+    monkeypatch.setattr(json_formatter, "orjson", None)
+    encoder = json_formatter.get_default_encoder()
+    assert encoder is json_formatter.json_encoder
+
+
+class JsonFormatterTests(InitializedContextBase):
+    @fixture
+    def formatter(self):
+        return JsonFormatter(encoder=json_formatter.json_encoder)
+
+    def test_default_fields_are_formatted(self, formatter):
+        record = make_record("hello %s", ("world",))
+        output = json.loads(formatter.format(record))
+        assert output == {
+            "time": record.created,
+            "level": "INFO",
+            "logger": "test",
+            "message": "hello world",
+        }
+
+    def test_output_is_a_single_line(self, formatter):
+        assert "\n" not in formatter.format(make_record("a\nb"))
+
+    def test_custom_fields_and_asctime(self):
+        formatter = JsonFormatter(
+            fields={"at": "asctime", "line": "lineno", "missing": "nope"},
+            datefmt="%Y",
+        )
+        record = make_record()
+        output = json.loads(formatter.format(record))
+        assert output == {
+            "at": formatter.formatTime(record, "%Y"),
+            "line": 1,
+            "missing": None,
+        }
+
+    def test_injected_context_is_added(self, formatter):
+        with context(user="alice", n=1):
+            record = inject(make_record())
+        output = json.loads(formatter.format(record))
+        assert output["user"] == "alice"
+        assert output["n"] == 1
+
+    def test_current_context_is_used_if_record_was_not_injected(
+        self, formatter
+    ):
+        with context(user="alice"):
+            output = json.loads(formatter.format(make_record()))
+        assert output["user"] == "alice"
+
+    def test_queued_context_is_used(self, formatter):
+        handler = ContextQueueHandler()
+        with context(user="alice"):
+            record = handler.prepare(make_record())
+        output = json.loads(formatter.format(record))
+        assert output["user"] == "alice"
+
+    def test_context_can_be_disabled(self):
+        formatter = JsonFormatter(fields={}, context=False)
+        with context(user="alice"):
+            assert formatter.format(make_record()) == "{}"
+
+    def test_only_context_is_formatted_without_fields(self):
+        formatter = JsonFormatter(fields={})
+        with context(user="alice"):
+            assert formatter.format(make_record()) == '{"user":"alice"}'
+
+    def test_context_keys_and_renames(self):
+        formatter = JsonFormatter(
+            fields={},
+            context_keys=["user", "n"],
+            context_renames={"user": "usr"},
+        )
+        with context(user="alice", n=1, secret="x"):
+            output = json.loads(formatter.format(make_record()))
+        assert output == {"usr": "alice", "n": 1}
+
+    def test_context_does_not_override_fields(self, formatter):
+        with context(message="from context", user="alice"):
+            output = json.loads(formatter.format(make_record("msg")))
+        assert output["message"] == "msg"
+        assert output["user"] == "alice"
+
+    def test_lazy_context_values_are_resolved(self, formatter):
+        with context(user=LazyValue(lambda: "alice")):
+            output = json.loads(formatter.format(make_record()))
+        assert output["user"] == "alice"
+
+    def test_context_fragment_is_cached_per_context(self, formatter):
+        calls = []
+        encode_context = formatter.encode_context
+
+        def counting_encode_context(ctx):
+            calls.append(ctx)
+            return encode_context(ctx)
+
+        formatter.encode_context = counting_encode_context
+        with context(user="alice"):
+            formatter.format(make_record())
+            formatter.format(make_record())
+            with context(user="bob"):
+                output = json.loads(formatter.format(make_record()))
+        assert output["user"] == "bob"
+        assert len(calls) == 2
+
+    def test_exception_info_is_added(self, formatter):
+        try:
+            raise ValueError("oops")
+        except ValueError:
+            record = make_record(exc_info=sys.exc_info())
+        output = json.loads(formatter.format(record))
+        assert "ValueError: oops" in output["exc_info"]
+
+    def test_stack_info_is_added(self, formatter):
+        record = make_record()
+        record.stack_info = "Stack (most recent call last):"
+        output = json.loads(formatter.format(record))
+        assert output["stack_info"] == "Stack (most recent call last):"
+
+    def test_format_batch_returns_json_lines(self, formatter):
+        records = [make_record("a"), make_record("b")]
+        output = formatter.format_batch(records)
+        assert output.endswith("\n")
+        lines = output.splitlines()
+        assert [json.loads(x)["message"] for x in lines] == ["a", "b"]
+
+    def test_format_batch_of_no_records_is_empty(self, formatter):
+        assert formatter.format_batch([]) == ""
+
+    @mark.skipif(json_formatter.orjson is None, reason="orjson missing")
+    def test_orjson_encoder_is_used_if_installed(self):
+        formatter = JsonFormatter()
+        assert formatter.encoder is json_formatter.orjson_encoder
+
+
+class PersistentJsonFormatterTests(PersistentContextBase):
+    def test_injected_context_is_added(self):
+        formatter = JsonFormatter(fields={})
+        with context(user="alice"):
+            with context(n=1):
+                record = inject(make_record())
+        assert json.loads(formatter.format(record)) == {
+            "user": "alice",
+            "n": 1,
+        }
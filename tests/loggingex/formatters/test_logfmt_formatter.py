@@ -0,0 +1,135 @@
+import logging
+import sys
+
+from pytest import fixture, mark
+
+from loggingex.context import LazyValue, LoggingContextFilter, context
+from loggingex.formatters import LogfmtFormatter
+from loggingex.formatters.logfmt_formatter import format_logfmt_value
+from ..context.helpers import InitializedContextBase, PersistentContextBase
+
+
+def make_record(msg="message", args=(), exc_info=None):
+    return logging.LogRecord(
+        "test", logging.INFO, "t.py", 1, msg, args, exc_info
+    )
+
+
+def inject(record):
+    LoggingContextFilter().filter(record)
+    return record
+
+
+@mark.parametrize(
+    "value,expected",
+    [
+        (None, ""),
+        (True, "true"),
+        (False, "false"),
+        (1, "1"),
+        ("abc", "abc"),
+        ("", '""'),
+        ("a b", '"a b"'),
+        ("a=b", '"a=b"'),
+        ('a"b', '"a\\"b"'),
+        ("a\\b", '"a\\\\b"'),
+        ("a\nb", '"a\\nb"'),
+        ("zażółć", "zażółć"),
+    ],
+)
+def test_format_logfmt_value(value, expected):
+    assert format_logfmt_value(value) == expected
+
+
+class LogfmtFormatterTests(InitializedContextBase):
+    @fixture
+    def formatter(self):
+        return LogfmtFormatter(fields={"level": "levelname", "msg": "message"})
+
+    def test_default_fields_are_formatted(self):
+        record = make_record("hello %s", ("world",))
+        assert LogfmtFormatter().format(record) == (
+            'time=%r level=INFO logger=test msg="hello world"' % record.created
+        )
+
+    def test_injected_context_is_appended(self, formatter):
+        with context(user="alice", agent="curl 7.0"):
+            record = inject(make_record())
+        assert formatter.format(record) == (
+            'level=INFO msg=message user=alice agent="curl 7.0"'
+        )
+
+    def test_current_context_is_used_if_record_was_not_injected(
+        self, formatter
+    ):
+        with context(user="alice"):
+            output = formatter.format(make_record())
+        assert output == "level=INFO msg=message user=alice"
+
+    def test_context_can_be_disabled(self):
+        formatter = LogfmtFormatter(fields={"msg": "message"}, context=False)
+        with context(user="alice"):
+            assert formatter.format(make_record()) == "msg=message"
+
+    def test_context_keys_and_renames(self):
+        formatter = LogfmtFormatter(
+            fields={},
+            context_keys=["user", "n"],
+            context_renames={"user": "usr"},
+        )
+        with context(user="alice", n=1, secret="x"):
+            assert formatter.format(make_record()) == "usr=alice n=1"
+
+    def test_context_does_not_override_fields(self, formatter):
+        with context(msg="from context", user="alice"):
+            output = formatter.format(make_record())
+        assert output == "level=INFO msg=message user=alice"
+
+    def test_lazy_context_values_are_resolved(self, formatter):
+        with context(user=LazyValue(lambda: "alice")):
+            output = formatter.format(make_record())
+        assert output == "level=INFO msg=message user=alice"
+
+    def test_context_segment_is_cached_per_context(self, formatter):
+        calls = []
+        render_context = formatter.render_context
+
+        def counting_render_context(ctx):
+            calls.append(ctx)
+            return render_context(ctx)
+
+        formatter.render_context = counting_render_context
+        with context(user="alice"):
+            formatter.format(make_record())
+            formatter.format(make_record())
+            with context(user="bob"):
+                output = formatter.format(make_record())
+        assert output.endswith("user=bob")
+        assert len(calls) == 2
+
+    def test_exception_info_is_appended(self, formatter):
+        try:
+            raise ValueError("oops")
+        except ValueError:
+            record = make_record(exc_info=sys.exc_info())
+        output = formatter.format(record)
+        assert output.startswith('level=INFO msg=message exc_info="Traceback')
+        assert "ValueError: oops" in output
+        assert "\n" not in output
+
+    def test_stack_info_is_appended(self, formatter):
+        record = make_record()
+        record.stack_info = "Stack"
+        assert formatter.format(record).endswith(" stack_info=Stack")
+
+
+class PersistentLogfmtFormatterTests(PersistentContextBase):
+    def test_context_segment_is_cached_per_scope(self):
+        formatter = LogfmtFormatter(fields={})
+        with context(user="alice"):
+            with context(n=1):
+                first = formatter.format(inject(make_record()))
+                cached_context, _ = formatter._context_segment
+                second = formatter.format(inject(make_record()))
+                assert formatter._context_segment[0] is cached_context
+        assert first == second == "user=alice n=1"
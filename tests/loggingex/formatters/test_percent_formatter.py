@@ -0,0 +1,104 @@
+import logging
+import time
+
+from pytest import fixture, mark, raises
+
+from loggingex.context import LazyValue, LoggingContextFilter, context
+from loggingex.formatters import PercentFormatter
+from loggingex.formatters.percent_formatter import get_format_field_names
+from ..context.helpers import InitializedContextBase
+
+FORMAT = "%(current_file)s:%(current_line)s:%(levelname)s: %(message)s"
+
+
+def make_record(msg="message", args=()):
+    return logging.LogRecord("test", logging.INFO, "t.py", 1, msg, args, None)
+
+
+def make_record_at(created):
+    record = make_record()
+    record.created = created
+    record.msecs = (created - int(created)) * 1000
+    return record
+
+
+@mark.parametrize(
+    "fmt,expected",
+    [
+        ("", ()),
+        ("%(message)s", ("message",)),
+        ("%(a)s %(b)5.2f %(a)r", ("a", "b")),
+        ("%%(a)s %(b)s %%", ("b",)),
+    ],
+)
+def test_get_format_field_names(fmt, expected):
+    assert get_format_field_names(fmt) == expected
+
+
+class PercentFormatterTests(InitializedContextBase):
+    @fixture
+    def formatter(self):
+        return PercentFormatter(
+            FORMAT, defaults={"current_file": "-", "current_line": "-"}
+        )
+
+    def test_defaults_are_used_for_missing_fields(self, formatter):
+        assert formatter.format(make_record()) == "-:-:INFO: message"
+
+    def test_missing_field_without_default_raises(self):
+        formatter = PercentFormatter(FORMAT, defaults={"current_file": "-"})
+        with raises(ValueError, match="current_line"):
+            formatter.format(make_record())
+
+    def test_current_context_is_used(self, formatter):
+        with context(current_file="a.txt"):
+            output = formatter.format(make_record("x %d", (1,)))
+        assert output == "a.txt:-:INFO: x 1"
+
+    def test_injected_context_is_used(self, formatter):
+        with context(current_file="a.txt", current_line=2):
+            record = make_record()
+            LoggingContextFilter().filter(record)
+        assert formatter.format(record) == "a.txt:2:INFO: message"
+
+    def test_record_attributes_take_precedence(self, formatter):
+        record = make_record()
+        record.current_file = "record.txt"
+        with context(current_file="context.txt"):
+            assert formatter.format(record).startswith("record.txt:")
+
+    def test_lazy_context_values_are_resolved(self, formatter):
+        with context(current_file=LazyValue(lambda: "lazy.txt")):
+            assert formatter.format(make_record()).startswith("lazy.txt:")
+
+    def test_format_specifiers_are_supported(self):
+        formatter = PercentFormatter("%(n)05.1f|%(name)-6s|%%")
+        with context(n=1.25):
+            assert formatter.format(make_record()) == "001.2|test  |%"
+
+    def test_default_format(self):
+        assert PercentFormatter().format(make_record()) == "message"
+
+    def test_asctime_matches_standard_formatter(self):
+        standard = logging.Formatter("%(asctime)s %(message)s")
+        formatter = PercentFormatter("%(asctime)s %(message)s")
+        output = formatter.format(make_record_at(1000.25))
+        assert output == standard.format(make_record_at(1000.25))
+
+    @mark.parametrize("datefmt", [None, "%Y-%m-%d %H:%M:%S", "%H"])
+    def test_format_time_matches_standard_formatter(self, datefmt):
+        formatter = PercentFormatter()
+        standard = logging.Formatter()
+        for created in (1000.25, 1000.75, 1001.5):
+            record = make_record_at(created)
+            expected = standard.formatTime(record, datefmt)
+            assert formatter.formatTime(record, datefmt) == expected
+
+    def test_format_time_is_cached_per_second(self, mocker):
+        strftime = mocker.spy(time, "strftime")
+        formatter = PercentFormatter()
+        formatter.formatTime(make_record_at(1000.25))
+        formatter.formatTime(make_record_at(1000.75))
+        assert strftime.call_count == 1
+        formatter.formatTime(make_record_at(1001.5))
+        assert strftime.call_count == 2
@@ -0,0 +1,77 @@
+import json
+import logging
+from io import StringIO
+
+from pytest import fixture
+
+from loggingex.context import context
+from loggingex.formatters import JsonFormatter
+from loggingex.handlers import BatchStreamHandler
+from ..context.helpers import InitializedContextBase
+
+
+class CountingStream(StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+
+def make_record(msg="message", level=logging.INFO):
+    return logging.LogRecord("test", level, "t.py", 1, msg, (), None)
+
+
+class BatchStreamHandlerTests(InitializedContextBase):
+    @fixture
+    def stream(self):
+        return CountingStream()
+
+    def test_records_are_buffered_until_capacity(self, stream):
+        handler = BatchStreamHandler(stream, capacity=3)
+        handler.handle(make_record("a"))
+        handler.handle(make_record("b"))
+        assert stream.getvalue() == ""
+        handler.handle(make_record("c"))
+        assert stream.getvalue() == "a\nb\nc\n"
+        assert stream.writes == 1
+
+    def test_flush_level_flushes_immediately(self, stream):
+        handler = BatchStreamHandler(stream, capacity=10)
+        handler.handle(make_record("a"))
+        handler.handle(make_record("b", logging.ERROR))
+        assert stream.getvalue() == "a\nb\n"
+
+    def test_close_flushes(self, stream):
+        handler = BatchStreamHandler(stream)
+        handler.handle(make_record("a"))
+        handler.close()
+        assert stream.getvalue() == "a\n"
+
+    def test_formatter_batches_are_written_at_once(self, stream):
+        handler = BatchStreamHandler(stream, capacity=2)
+        handler.setFormatter(JsonFormatter(fields={"message": "message"}))
+        with context(user="alice"):
+            handler.handle(make_record("a"))
+            handler.handle(make_record("b"))
+        lines = [json.loads(x) for x in stream.getvalue().splitlines()]
+        assert lines == [
+            {"message": "a", "user": "alice"},
+            {"message": "b", "user": "alice"},
+        ]
+        assert stream.writes == 1
+
+    def test_records_are_formatted_with_their_context(self, stream):
+        handler = BatchStreamHandler(stream, capacity=2)
+        handler.setFormatter(JsonFormatter(fields={"m": "message"}))
+        with context(request="A"):
+            handler.handle(make_record("in A"))
+        with context(request="B"):
+            handler.handle(make_record("in B"))
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert lines == [
+            {"m": "in A", "request": "A"},
+            {"m": "in B", "request": "B"},
+        ]
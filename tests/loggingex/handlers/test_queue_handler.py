@@ -0,0 +1,146 @@
+import logging
+from queue import Queue
+from threading import Event
+
+from pytest import fixture, raises
+
+from loggingex.context import LoggingContextFilter, context
+from loggingex.handlers import (
+    ContextQueueHandler,
+    ContextQueueListener,
+    InvalidQueuePolicyException,
+    POLICY_BLOCK,
+    POLICY_COALESCE,
+)
+from loggingex.handlers.queue_handler import (
+    COALESCED_RECORD_LOGGER_NAME,
+    QUEUED_CONTEXT_ATTRIBUTE,
+)
+from ..context.helpers import InitializedContextBase
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.addFilter(LoggingContextFilter())
+
+    def emit(self, record):
+        self.format(record)
+        self.records.append(record)
+
+
+def make_record(msg="message", args=()):
+    return logging.LogRecord("test", logging.INFO, "t.py", 1, msg, args, None)
+
+
+def test_invalid_policy_raises():
+    with raises(InvalidQueuePolicyException):
+        ContextQueueHandler(policy="?")
+
+
+class ContextQueueHandlerTests(InitializedContextBase):
+    def test_current_context_is_saved_by_reference(self, store):
+        handler = ContextQueueHandler()
+        with context(user="alice"):
+            handler.handle(make_record())
+            current = store.get()
+        record = handler.queue.get_nowait()
+        assert getattr(record, QUEUED_CONTEXT_ATTRIBUTE) is current
+        assert handler.enqueued == 1
+
+    def test_records_are_not_formatted(self):
+        handler = ContextQueueHandler()
+        handler.handle(make_record("message %d", (1,)))
+        record = handler.queue.get_nowait()
+        assert record.msg == "message %d"
+        assert record.args == (1,)
+
+    def test_drop_policy_drops_records(self):
+        handler = ContextQueueHandler(maxsize=2)
+        for _ in range(5):
+            handler.handle(make_record())
+        assert handler.queue.qsize() == 2
+        assert handler.enqueued == 2
+        assert handler.dropped == 3
+
+    def test_block_policy_drops_records_after_timeout(self):
+        handler = ContextQueueHandler(
+            maxsize=1, policy=POLICY_BLOCK, timeout=0.01
+        )
+        handler.handle(make_record())
+        handler.handle(make_record())
+        assert handler.enqueued == 1
+        assert handler.dropped == 1
+
+    def test_coalesce_policy_reports_dropped_records(self):
+        handler = ContextQueueHandler(maxsize=2, policy=POLICY_COALESCE)
+        for _ in range(5):
+            handler.handle(make_record())
+        assert handler.dropped == 3
+        assert handler.coalesced == 3
+        handler.queue.get_nowait()
+        handler.queue.get_nowait()
+        handler.handle(make_record("after"))
+        summary = handler.queue.get_nowait()
+        assert summary.name == COALESCED_RECORD_LOGGER_NAME
+        assert summary.levelno == logging.WARNING
+        assert summary.getMessage().startswith("3 log records were dropped")
+        assert handler.queue.get_nowait().msg == "after"
+        assert handler.coalesced == 0
+
+
+class ContextQueueListenerTests(InitializedContextBase):
+    @fixture()
+    def target(self):
+        return RecordingHandler()
+
+    @fixture()
+    def queue(self):
+        return Queue()
+
+    def test_records_are_handled_within_their_contexts(
+        self, queue, target, store
+    ):
+        listener = ContextQueueListener(queue, target)
+        listener.start()
+        try:
+            handler = ContextQueueHandler(queue)
+            with context(user="alice"):
+                handler.handle(make_record("first"))
+            with context(user="bob"):
+                handler.handle(make_record("second"))
+            handler.handle(make_record("third"))
+        finally:
+            listener.stop()
+
+        assert [r.message for r in target.records] == [
+            "first",
+            "second",
+            "third",
+        ]
+        assert target.records[0].user == "alice"
+        assert target.records[1].user == "bob"
+        assert not hasattr(target.records[2], "user")
+        assert store.get() == {}
+
+    def test_request_threads_do_not_wait_for_slow_handlers(self, queue):
+        release = Event()
+
+        class SlowHandler(RecordingHandler):
+            def emit(self, record):
+                release.wait(5)
+                super().emit(record)
+
+        target = SlowHandler()
+        listener = ContextQueueListener(queue, target)
+        listener.start()
+        try:
+            handler = ContextQueueHandler(queue)
+            for _ in range(10):
+                handler.handle(make_record())
+            assert handler.enqueued == 10
+        finally:
+            release.set()
+            listener.stop()
+        assert len(target.records) == 10
@@ -0,0 +1,99 @@
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+from urllib.request import Request, urlopen
+
+from pytest import fixture
+
+from loggingex import propagation
+from loggingex.context import context
+from ..context.helpers import InitializedContextBase
+
+TRACEPARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+TRACE_CONTEXT = {
+    "trace_id": "4bf92f3577b34da6a3ce929d0e0e4736",
+    "span_id": "00f067aa0ba902b7",
+    "trace_flags": "01",
+    "trace_state": "congo=t61rcWkgMzE",
+}
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802
+        self.server.requests.append(self.headers)
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@fixture()
+def server():
+    server = HTTPServer(("127.0.0.1", 0), RecordingHandler)
+    server.requests = []
+    thread = Thread(target=server.serve_forever, args=(0.01,))
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+@fixture()
+def hook():
+    propagation.install()
+    yield
+    propagation.uninstall()
+
+
+def http_get(server, headers=None):
+    connection = HTTPConnection(*server.server_address)
+    try:
+        connection.request("GET", "/", headers=headers or {})
+        connection.getresponse().read()
+    finally:
+        connection.close()
+    return server.requests[-1]
+
+
+def test_install_and_uninstall_are_idempotent():
+    request = HTTPConnection.request
+    propagation.install()
+    propagation.install()
+    assert propagation.is_installed()
+    assert HTTPConnection.request is not request
+    propagation.uninstall()
+    propagation.uninstall()
+    assert not propagation.is_installed()
+    assert HTTPConnection.request is request
+
+
+class HTTPClientHookTests(InitializedContextBase):
+    def test_headers_are_not_added_without_hook(self, server):
+        with context(**TRACE_CONTEXT):
+            headers = http_get(server)
+        assert "traceparent" not in headers
+
+    def test_headers_are_added_from_context(self, server, hook):
+        with context(**TRACE_CONTEXT):
+            headers = http_get(server, {"X-Test": "1"})
+        assert headers["traceparent"] == TRACEPARENT
+        assert headers["tracestate"] == "congo=t61rcWkgMzE"
+        assert headers["X-Test"] == "1"
+
+    def test_headers_are_not_added_without_trace_context(self, server, hook):
+        headers = http_get(server)
+        assert "traceparent" not in headers
+
+    def test_explicit_headers_are_not_overridden(self, server, hook):
+        with context(**TRACE_CONTEXT):
+            headers = http_get(server, {"TraceParent": "explicit"})
+        assert headers.get_all("traceparent") == ["explicit"]
+        assert headers["tracestate"] == "congo=t61rcWkgMzE"
+
+    def test_urllib_requests_get_headers(self, server, hook):
+        url = "http://%s:%d/" % server.server_address
+        with context(**TRACE_CONTEXT):
+            urlopen(Request(url)).close()
+        assert server.requests[-1]["traceparent"] == TRACEPARENT
@@ -0,0 +1,81 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from pytest import mark
+
+from loggingex.propagation import (
+    RequestIdGenerator,
+    generate_request_id,
+    is_valid_request_id,
+)
+
+
+def test_request_ids_are_unique():
+    generator = RequestIdGenerator()
+    ids = [generator() for _ in range(1000)]
+    assert len(set(ids)) == len(ids)
+
+
+def test_request_ids_share_process_prefix():
+    generator = RequestIdGenerator()
+    prefix, counter = generator().split("-")
+    assert len(prefix) == 16
+    assert generator() == "%s-%x" % (prefix, int(counter, 16) + 1)
+
+
+def test_generators_have_different_prefixes():
+    first, second = RequestIdGenerator(), RequestIdGenerator()
+    assert first().split("-")[0] != second().split("-")[0]
+
+
+def test_reset_changes_prefix():
+    generator = RequestIdGenerator()
+    before = generator()
+    generator.reset()
+    assert generator().split("-")[0] != before.split("-")[0]
+
+
+def test_request_ids_are_unique_across_threads():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        ids = list(executor.map(lambda _: generate_request_id(), range(1000)))
+    assert len(set(ids)) == len(ids)
+
+
+def test_pid_is_checked_without_register_at_fork(mocker):
+    mocker.patch.object(os, "register_at_fork", None, create=True)
+    generator = RequestIdGenerator()
+    before = generator()
+    mocker.patch.object(os, "getpid", return_value=-1)
+    assert generator().split("-")[0] != before.split("-")[0]
+
+
+@mark.skipif(not hasattr(os, "fork"), reason="fork is not available")
+def test_forked_child_gets_new_prefix():
+    generator = RequestIdGenerator()
+    before = generator()
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        os.write(write, generator().encode())
+        os._exit(0)
+    os.waitpid(pid, 0)
+    child = os.read(read, 100).decode()
+    os.close(read)
+    os.close(write)
+    assert child.split("-")[0] != before.split("-")[0]
+
+
+@mark.parametrize(
+    "value,result",
+    [
+        (None, False),
+        ("", False),
+        ("abc-123", True),
+        ("a" * 128, True),
+        ("a" * 129, False),
+        ("a b", False),
+        ("a\nb", False),
+    ],
+)
+def test_is_valid_request_id(value, result):
+    assert is_valid_request_id(value) is result
@@ -0,0 +1,92 @@
+from pytest import mark
+
+from loggingex.context import LazyValue
+from loggingex.propagation import (
+    TraceParent,
+    format_traceparent,
+    get_trace_context,
+    get_trace_headers,
+    parse_traceparent,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+SPAN_ID = "00f067aa0ba902b7"
+TRACEPARENT = "00-%s-%s-01" % (TRACE_ID, SPAN_ID)
+
+
+def test_parse_traceparent():
+    assert parse_traceparent(TRACEPARENT) == TraceParent(
+        "00", TRACE_ID, SPAN_ID, "01"
+    )
+
+
+def test_parse_traceparent_strips_whitespace():
+    assert parse_traceparent(" %s " % TRACEPARENT).trace_id == TRACE_ID
+
+
+def test_parse_traceparent_of_future_version():
+    value = "cc-%s-%s-01-future" % (TRACE_ID, SPAN_ID)
+    assert parse_traceparent(value) == TraceParent(
+        "cc", TRACE_ID, SPAN_ID, "01"
+    )
+
+
+@mark.parametrize(
+    "value",
+    [
+        None,
+        "",
+        TRACEPARENT[:-1],
+        TRACEPARENT + "-",
+        TRACEPARENT.upper(),
+        TRACEPARENT.replace("-", "_"),
+        "ff" + TRACEPARENT[2:],
+        "cc-%s-%s-01x" % (TRACE_ID, SPAN_ID),
+        "00-%s-%s-01" % ("0" * 32, SPAN_ID),
+        "00-%s-%s-01" % (TRACE_ID, "0" * 16),
+        "00-%s-%s-0g" % (TRACE_ID, SPAN_ID),
+        "%s,%s" % (TRACEPARENT, TRACEPARENT),
+    ],
+)
+def test_parse_invalid_traceparent_returns_none(value):
+    assert parse_traceparent(value) is None
+
+
+def test_format_traceparent():
+    assert format_traceparent(TRACE_ID, SPAN_ID, "01") == TRACEPARENT
+
+
+def test_get_trace_context():
+    assert get_trace_context(TRACEPARENT, " congo=t61rcWkgMzE ") == {
+        "trace_id": TRACE_ID,
+        "span_id": SPAN_ID,
+        "trace_flags": "01",
+        "trace_state": "congo=t61rcWkgMzE",
+    }
+
+
+def test_get_trace_context_without_tracestate():
+    assert "trace_state" not in get_trace_context(TRACEPARENT, "")
+
+
+def test_get_trace_context_ignores_invalid_traceparent():
+    assert get_trace_context("invalid", "congo=t61rcWkgMzE") == {}
+
+
+def test_get_trace_headers():
+    context = get_trace_context(TRACEPARENT, "congo=t61rcWkgMzE")
+    assert get_trace_headers(context) == {
+        "traceparent": TRACEPARENT,
+        "tracestate": "congo=t61rcWkgMzE",
+    }
+
+
+def test_get_trace_headers_resolves_lazy_values():
+    context = {"trace_id": LazyValue(lambda: TRACE_ID), "span_id": SPAN_ID}
+    assert get_trace_headers(context) == {
+        "traceparent": "00-%s-%s-00" % (TRACE_ID, SPAN_ID)
+    }
+
+
+def test_get_trace_headers_without_trace_context():
+    assert get_trace_headers({"trace_id": TRACE_ID}) == {}
@@ -0,0 +1,161 @@
+from logging import getLogger
+from wsgiref.util import FileWrapper, setup_testing_defaults
+
+from pytest import fixture, raises
+from webtest import TestApp as WSGITestApp
+
+from loggingex.context import LoggingContextFilter
+from loggingex.wsgi import RequestContextMiddleware
+from loggingex.wsgi.access_log import (
+    ACCESS_LOGGER_NAME,
+    AccessLog,
+    get_request_line,
+)
+
+
+def make_app(chunks, headers=()):
+    def app(environ, start_response):
+        start_response("200 OK", list(headers))
+        return iter(chunks)
+
+    return app
+
+
+@fixture()
+def access_logger(caplog):
+    caplog.set_level("INFO", ACCESS_LOGGER_NAME)
+    logger = getLogger(ACCESS_LOGGER_NAME)
+    context_filter = LoggingContextFilter()
+    logger.addFilter(context_filter)
+    yield logger
+    logger.removeFilter(context_filter)
+
+
+def access_records(caplog):
+    return [r for r in caplog.records if r.name == ACCESS_LOGGER_NAME]
+
+
+@fixture()
+def dummyapp(access_logger):
+    app = make_app([b"Hello, ", b"World!"])
+    app = RequestContextMiddleware(app, headers=False, access_log=True)
+    return WSGITestApp(app)
+
+
+def test_get_request_line():
+    request_context = {
+        "request_method": "GET",
+        "request_script_name": "/app",
+        "request_path_info": "/path",
+        "request_query_string": "a=1",
+        "request_server_protocol": "HTTP/1.1",
+    }
+    assert get_request_line(request_context) == (
+        "GET",
+        "/app/path?a=1",
+        "HTTP/1.1",
+    )
+    assert get_request_line({}) == ("-", "/", "-")
+
+
+def test_access_log_is_not_logged_twice(access_logger, caplog):
+    access_log = AccessLog(access_logger, 20)
+    access_log.log({})
+    access_log.log({})
+    assert len(access_records(caplog)) == 1
+
+
+def test_access_log_is_not_logged_if_level_is_disabled(caplog):
+    caplog.set_level("WARNING", ACCESS_LOGGER_NAME)
+    app = make_app([b"Hello"])
+    app = RequestContextMiddleware(app, access_log=True)
+    WSGITestApp(app).get("/")
+    assert access_records(caplog) == []
+
+
+def test_single_access_record_is_logged(caplog, dummyapp):
+    dummyapp.get("/path?a=1")
+
+    records = access_records(caplog)
+    assert len(records) == 1
+    record = records[0]
+    assert record.getMessage().startswith('"GET /path?a=1 HTTP/1.0" 200 13 ')
+    assert record.response_status == 200
+    assert record.response_size == 13
+    assert record.response_time_ms >= 0
+    assert record.response_headers == []
+
+
+def test_access_record_has_request_context(caplog, dummyapp):
+    dummyapp.get("/path")
+    record = access_records(caplog)[0]
+    assert record.request_method == "GET"
+    assert record.request_path_info == "/path"
+
+
+def test_access_record_is_logged_with_request_id(caplog, access_logger):
+    app = make_app([b"x"], [("Content-Type", "text/plain")])
+    app = RequestContextMiddleware(app, access_log=True, request_id=True)
+    WSGITestApp(app).get("/", headers={"X-Request-ID": "abc-123"})
+    record = access_records(caplog)[0]
+    assert record.request_id == "abc-123"
+    assert record.response_headers == [("Content-Type", "text/plain")]
+
+
+def test_list_responses_are_counted(caplog, access_logger):
+    def app(environ, start_response):
+        start_response("404 Not Found", [])
+        return [b"Not", b"Found"]
+
+    app = RequestContextMiddleware(app, access_log=True)
+    WSGITestApp(app).get("/", status=404)
+    record = access_records(caplog)[0]
+    assert record.response_status == 404
+    assert record.response_size == 8
+
+
+def test_file_wrapper_responses_are_logged_right_away(caplog, access_logger):
+    def app(environ, start_response):
+        start_response("200 OK", [("Content-Length", "1234")])
+        return environ["wsgi.file_wrapper"](None)
+
+    environ = {"wsgi.file_wrapper": FileWrapper}
+    setup_testing_defaults(environ)
+    app = RequestContextMiddleware(app, access_log=True)
+    response = app(environ, lambda *args: None)
+
+    assert isinstance(response, FileWrapper)
+    record = access_records(caplog)[0]
+    assert record.response_size == 1234
+
+
+def test_function_file_wrapper_responses_are_logged_right_away(
+    caplog, access_logger
+):
+    filelike = [b"abc"]
+
+    def app(environ, start_response):
+        start_response("200 OK", [("Content-Length", "3")])
+        return environ["wsgi.file_wrapper"](filelike)
+
+    environ = {"wsgi.file_wrapper": lambda filelike, *args: filelike}
+    setup_testing_defaults(environ)
+    app = RequestContextMiddleware(app, access_log=True)
+    response = app(environ, lambda *args: None)
+
+    assert response is filelike
+    assert access_records(caplog)[0].response_size == 3
+
+
+def test_access_is_logged_when_application_raises(caplog, access_logger):
+    def app(environ, start_response):
+        raise RuntimeError("boom")
+
+    app = RequestContextMiddleware(app, access_log=True)
+    with raises(RuntimeError):
+        WSGITestApp(app).get("/fail")
+    records = access_records(caplog)
+    assert len(records) == 1
+    assert records[0].response_status == 500
+    assert records[0].response_size == 0
+    assert records[0].request_path_info == "/fail"
@@ -1,9 +1,10 @@
 from logging import Logger, getLogger
 
-from pytest import fixture
+from pytest import fixture, mark
 from webtest import TestApp as WSGITestApp
 
 from loggingex.context import LoggingContextFilter
+from loggingex.propagation import is_valid_request_id
 from loggingex.wsgi import RequestContextMiddleware
 
 
@@ -43,7 +44,10 @@ class DummyApp:
 def logger(caplog):
     caplog.set_level("DEBUG", "app")
     logger = getLogger("app")
-    logger.addFilter(LoggingContextFilter())
+    context_filter = LoggingContextFilter()
+    logger.addFilter(context_filter)
+    yield logger
+    logger.removeFilter(context_filter)
 
 
 @fixture()
@@ -61,7 +65,126 @@ def test_request_context_is_added_to_logging_records(caplog, logger, dummyapp):
     assert response.status_code == 200
     assert "Hello, World!" in response
 
+    assert caplog.records
     for record in caplog.records:
         assert record.name == logger.name
         assert record.request_method == "GET"
         assert record.request_path_info == "/"
+
+
+def test_request_context_headers_can_be_filtered(caplog, logger):
+    app = DummyApp({}, logger)
+    app = RequestContextMiddleware(
+        app, include_headers=["User-Agent", "Host"], exclude_headers=["Host"]
+    )
+    WSGITestApp(app).get("/", headers={"User-Agent": "test"}, status=404)
+
+    assert caplog.records
+    for record in caplog.records:
+        assert record.header_user_agent == "test"
+        assert not hasattr(record, "header_host")
+        assert not hasattr(record, "header_cookie")
+
+
+def test_request_uri_can_be_calculated_lazily(caplog, logger):
+    app = RequestContextMiddleware(DummyApp({}, logger), lazy_uri=True)
+    WSGITestApp(app).get("/foo", status=404)
+
+    assert caplog.records
+    for record in caplog.records:
+        assert record.request_uri == "http://localhost:80/foo"
+
+
+def test_trace_context_is_added_to_logging_records(caplog, logger):
+    app = RequestContextMiddleware(DummyApp({}, logger), trace_context=True)
+    traceparent = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    WSGITestApp(app).get("/", headers={"traceparent": traceparent}, status=404)
+
+    assert caplog.records
+    for record in caplog.records:
+        assert record.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+        assert record.span_id == "00f067aa0ba902b7"
+
+
+def test_request_id_is_generated(caplog, logger):
+    app = RequestContextMiddleware(DummyApp({}, logger), request_id=True)
+    response = WSGITestApp(app).get("/", status=404)
+
+    assert "X-Request-ID" not in response.headers
+    request_ids = {record.request_id for record in caplog.records}
+    assert len(request_ids) == 1
+    assert is_valid_request_id(request_ids.pop())
+
+
+def test_inbound_request_id_is_reused_and_echoed(caplog, logger):
+    app = RequestContextMiddleware(
+        DummyApp({}, logger), request_id=True, echo_request_id=True
+    )
+    headers = {"X-Request-ID": "abc-123"}
+    response = WSGITestApp(app).get("/", headers=headers, status=404)
+
+    assert response.headers["X-Request-ID"] == "abc-123"
+    assert caplog.records
+    for record in caplog.records:
+        assert record.request_id == "abc-123"
+
+
+def test_invalid_inbound_request_id_is_replaced(caplog, logger):
+    app = RequestContextMiddleware(
+        DummyApp({}, logger), request_id=True, echo_request_id=True
+    )
+    headers = {"X-Request-ID": "a" * 200}
+    response = WSGITestApp(app).get("/", headers=headers, status=404)
+
+    request_id = response.headers["X-Request-ID"]
+    assert request_id != "a" * 200
+    assert {record.request_id for record in caplog.records} == {request_id}
+
+
+def test_inbound_request_id_is_ignored_without_header(caplog, logger):
+    app = RequestContextMiddleware(
+        DummyApp({}, logger), request_id=True, request_id_header=None
+    )
+    headers = {"X-Request-ID": "abc-123"}
+    WSGITestApp(app).get("/", headers=headers, status=404)
+
+    assert caplog.records
+    for record in caplog.records:
+        assert record.request_id != "abc-123"
+
+
+def test_application_request_id_header_is_not_overridden(logger):
+    content = {"/": ("200 Ok", {"X-Request-Id": "app"}, ["Hello"])}
+    app = RequestContextMiddleware(
+        DummyApp(content, logger), request_id=True, echo_request_id=True
+    )
+    response = WSGITestApp(app).get("/")
+    assert response.headers.getall("X-Request-ID") == ["app"]
+
+
+@mark.parametrize(
+    "path,present,missing",
+    [
+        ("/healthz", (), ("request_method",)),
+        ("/api/users", ("header_user_agent",), ("wsgi_url_scheme",)),
+        ("/api/debug/1", ("header_user_agent", "wsgi_url_scheme"), ()),
+        ("/static/app.js", ("request_path_info",), ("header_user_agent",)),
+        ("/", ("request_path_info", "header_user_agent"), ()),
+    ],
+)
+def test_route_policies_select_context(caplog, logger, path, present, missing):
+    route_policies = {
+        "/health": "skip",
+        "/api": "headers",
+        "/api/debug": "wsgi",
+        "/static": "request",
+    }
+    app = RequestContextMiddleware(
+        DummyApp({}, logger), route_policies=route_policies
+    )
+    WSGITestApp(app).get(path, headers={"User-Agent": "test"}, status=404)
+
+    assert caplog.records
+    for record in caplog.records:
+        assert all(hasattr(record, name) for name in present)
+        assert not any(hasattr(record, name) for name in missing)
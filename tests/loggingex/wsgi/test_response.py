@@ -0,0 +1,150 @@
+from wsgiref.util import FileWrapper, setup_testing_defaults
+
+from pytest import raises
+
+from loggingex.context import ContextStore, context
+from loggingex.wsgi.request_context import RequestContextMiddleware
+from loggingex.wsgi.response import ContextResponse
+from loggingex.wsgi.util import (
+    RecordingFileWrapper,
+    is_file_wrapper,
+    record_file_wrapper,
+)
+from ..context.helpers import InitializedContextBase
+
+
+class RecordingIterable:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.contexts = []
+        self.closed_in = None
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.contexts.append(ContextStore().get())
+            yield chunk
+
+    def close(self):
+        self.closed_in = ContextStore().get()
+
+
+def make_app(result):
+    def app(environ, start_response):
+        start_response("200 OK", [])
+        return result
+
+    return app
+
+
+def call(app, **environ):
+    setup_testing_defaults(environ)
+    return app(environ, lambda *args: None)
+
+
+def test_is_file_wrapper():
+    environ = {"wsgi.file_wrapper": FileWrapper}
+    assert is_file_wrapper(environ, FileWrapper(None))
+    assert not is_file_wrapper(environ, [b""])
+    assert not is_file_wrapper({}, FileWrapper(None))
+
+
+def test_is_file_wrapper_with_function_file_wrapper():
+    # PEP 3333 only requires wsgi.file_wrapper to be callable (uWSGI uses a
+    # function), so its results are recorded
+    def file_wrapper(filelike, *args):
+        return FileWrapper(filelike)
+
+    environ = {"wsgi.file_wrapper": file_wrapper}
+    assert not is_file_wrapper(environ, FileWrapper(None))
+    record_file_wrapper(environ)
+    recording = environ["wsgi.file_wrapper"]
+    assert isinstance(recording, RecordingFileWrapper)
+    result = recording(None)
+    assert is_file_wrapper(environ, result)
+    assert not is_file_wrapper(environ, FileWrapper(None))
+    record_file_wrapper(environ)
+    assert environ["wsgi.file_wrapper"] is recording
+
+
+def test_record_file_wrapper_keeps_classes():
+    environ = {"wsgi.file_wrapper": FileWrapper}
+    record_file_wrapper(environ)
+    assert environ["wsgi.file_wrapper"] is FileWrapper
+    record_file_wrapper({})
+
+
+class ContextResponseTests(InitializedContextBase):
+    def test_chunks_are_produced_within_context(self, store):
+        iterable = RecordingIterable([b"a", b"b"])
+        ctx = {"user": "alice"}
+        response = ContextResponse(iterable, ctx)
+        outside = []
+        for _ in response:
+            outside.append(store.get())
+        assert iterable.contexts == [ctx, ctx]
+        assert outside == [{}, {}]
+
+    def test_close_is_forwarded_within_context(self, store):
+        iterable = RecordingIterable([b"a"])
+        ctx = {"user": "alice"}
+        ContextResponse(iterable, ctx).close()
+        assert iterable.closed_in is ctx
+        assert store.get() == {}
+
+    def test_close_without_original_close(self):
+        ContextResponse([b"a"], {}).close()
+
+    def test_context_is_restored_on_error(self, store):
+        def failing():
+            raise ValueError()
+            yield  # pragma: no cover
+
+        with raises(ValueError):
+            next(ContextResponse(failing(), {"user": "alice"}))
+        assert store.get() == {}
+
+
+class MiddlewareResponseTests(InitializedContextBase):
+    def test_lists_are_passed_through(self):
+        result = [b"a"]
+        assert call(RequestContextMiddleware(make_app(result))) is result
+
+    def test_file_wrappers_are_passed_through(self):
+        result = FileWrapper(None)
+        app = RequestContextMiddleware(make_app(result))
+        assert call(app, **{"wsgi.file_wrapper": FileWrapper}) is result
+
+    def test_function_file_wrappers_are_passed_through(self):
+        def app(environ, start_response):
+            start_response("200 OK", [])
+            return environ["wsgi.file_wrapper"](iterable)
+
+        iterable = RecordingIterable([b"a"])
+        app = RequestContextMiddleware(app, headers=False)
+        response = call(app, **{"wsgi.file_wrapper": lambda f, *args: f})
+        assert response is iterable
+
+    def test_function_file_wrappers_do_not_pass_other_results(self):
+        iterable = RecordingIterable([b"a"])
+        app = RequestContextMiddleware(make_app(iterable), headers=False)
+        response = call(app, **{"wsgi.file_wrapper": lambda f, *args: f})
+        assert response is not iterable
+        assert list(response) == [b"a"]
+        assert iterable.contexts[0]["request_method"] == "GET"
+
+    def test_iterables_are_iterated_and_closed_in_request_context(
+        self, store
+    ):
+        iterable = RecordingIterable([b"a", b"b"])
+        app = RequestContextMiddleware(make_app(iterable), headers=False)
+        with context(user="alice"):
+            response = call(app)
+        assert list(response) == [b"a", b"b"]
+        response.close()
+
+        request_context = iterable.contexts[0]
+        assert request_context["request_method"] == "GET"
+        assert request_context["user"] == "alice"
+        assert iterable.contexts == [request_context, request_context]
+        assert iterable.closed_in is request_context
+        assert store.get() == {}
@@ -0,0 +1,61 @@
+from pytest import mark, raises
+
+from loggingex.wsgi import InvalidRoutePolicyException
+from loggingex.wsgi.routes import (
+    PrefixTrie,
+    compile_route_policies,
+    get_policy_options,
+)
+
+
+@mark.parametrize(
+    "path,expected",
+    [
+        ("", "root"),
+        ("/", "root"),
+        ("/a", "a"),
+        ("/ab", "a"),
+        ("/a/b", "a/b"),
+        ("/a/bc/d", "a/b"),
+        ("/b", "root"),
+    ],
+)
+def test_prefix_trie_returns_value_of_longest_matching_prefix(path, expected):
+    trie = PrefixTrie({"": "root", "/a": "a", "/a/b": "a/b"})
+    assert trie.longest_match(path) == expected
+
+
+def test_prefix_trie_returns_default_when_nothing_matches():
+    trie = PrefixTrie({"/a": "a"})
+    assert trie.longest_match("/b", "default") == "default"
+    assert trie.longest_match("/", "default") == "default"
+
+
+def test_prefix_trie_is_false_when_empty():
+    assert not PrefixTrie()
+    assert PrefixTrie({"/": None})
+
+
+def test_compile_route_policies_accepts_valid_policies():
+    trie = compile_route_policies({"/a": "skip", "/b": "wsgi"})
+    assert trie.longest_match("/a") == "skip"
+    assert trie.longest_match("/b") == "wsgi"
+    assert not compile_route_policies(None)
+
+
+def test_compile_route_policies_rejects_invalid_policies():
+    with raises(InvalidRoutePolicyException):
+        compile_route_policies({"/a": "everything"})
+
+
+@mark.parametrize(
+    "policy,expected",
+    [
+        (None, "default"),
+        ("request", (False, False)),
+        ("headers", (True, False)),
+        ("wsgi", (True, True)),
+    ],
+)
+def test_get_policy_options(policy, expected):
+    assert get_policy_options(policy, "default") == expected
@@ -1,12 +1,25 @@
+from wsgiref import util
+
 from pytest import fixture, mark
 
+from loggingex.context import LazyValue
 from loggingex.wsgi.util import (
+    get_application_uri,
+    get_header_context_name,
+    get_header_environ_key,
+    get_header_lookup_table,
     get_request_headers,
     get_request_info,
+    get_request_trace_context,
+    get_request_uri,
+    get_server_info,
     get_wsgi_info,
+    get_wsgi_request_context,
     unicode,
 )
 
+TRACEPARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
 
 @fixture()
 def wsgi_environ():
@@ -83,3 +96,140 @@ def test_get_request_headers(wsgi_environ):
     assert info["header_x_forwarded_for"] == "111.222.112.221"
     assert info["header_x_forwarded_proto"] == "https"
     assert info["header_x_request_id"] == "1a2a3a4a5a6a7a8a"
+
+
+@mark.parametrize(
+    "header,key",
+    [
+        ("User-Agent", "HTTP_USER_AGENT"),
+        ("x-request-id", "HTTP_X_REQUEST_ID"),
+        ("host", "HTTP_HOST"),
+    ],
+)
+def test_get_header_environ_key(header, key):
+    assert get_header_environ_key(header) == key
+
+
+def test_get_header_context_name():
+    assert get_header_context_name("HTTP_X_FOO") == "header_x_foo"
+
+
+def test_get_header_lookup_table_is_memoized():
+    table = get_header_lookup_table(frozenset({"Host", "User-Agent"}))
+    assert table == (
+        ("HTTP_HOST", "header_host"),
+        ("HTTP_USER_AGENT", "header_user_agent"),
+    )
+    assert get_header_lookup_table(frozenset({"User-Agent", "Host"})) is table
+
+
+def test_get_request_headers_with_include(wsgi_environ):
+    info = get_request_headers(
+        wsgi_environ, include=["User-Agent", "X-Request-ID", "Missing"]
+    )
+    assert info == {
+        "header_user_agent": "UnitTest",
+        "header_x_request_id": "1a2a3a4a5a6a7a8a",
+    }
+
+
+def test_get_request_headers_exclude_overrides_include(wsgi_environ):
+    info = get_request_headers(
+        wsgi_environ,
+        include=["User-Agent", "X-Request-ID"],
+        exclude=["x-request-id"],
+    )
+    assert info == {"header_user_agent": "UnitTest"}
+
+
+def test_get_request_headers_with_exclude(wsgi_environ):
+    info = get_request_headers(
+        wsgi_environ, exclude=["X-Forwarded-For", "X-Forwarded-Proto"]
+    )
+    assert info == {
+        "header_user_agent": "UnitTest",
+        "header_host": "example.io",
+        "header_x_request_id": "1a2a3a4a5a6a7a8a",
+    }
+
+
+def test_get_wsgi_request_context_passes_header_filters(wsgi_environ):
+    info = get_wsgi_request_context(
+        wsgi_environ, include_headers=frozenset({"Host"})
+    )
+    assert info["request_method"] == "POST"
+    assert info["header_host"] == "example.io"
+    assert "header_user_agent" not in info
+
+
+def test_get_request_trace_context(wsgi_environ):
+    wsgi_environ["HTTP_TRACEPARENT"] = TRACEPARENT
+    wsgi_environ["HTTP_TRACESTATE"] = "congo=t61rcWkgMzE"
+    assert get_request_trace_context(wsgi_environ) == {
+        "trace_id": "4bf92f3577b34da6a3ce929d0e0e4736",
+        "span_id": "00f067aa0ba902b7",
+        "trace_flags": "01",
+        "trace_state": "congo=t61rcWkgMzE",
+    }
+
+
+@mark.parametrize("trace_context", [True, False])
+def test_get_wsgi_request_context_with_trace_context(
+    wsgi_environ, trace_context
+):
+    wsgi_environ["HTTP_TRACEPARENT"] = TRACEPARENT
+    info = get_wsgi_request_context(wsgi_environ, trace_context=trace_context)
+    assert ("trace_id" in info) is trace_context
+
+
+def test_get_server_info_is_memoized():
+    info = get_server_info("backend", "8000", b"HTTP/1.1")
+    assert info == ("backend", "8000", "HTTP/1.1")
+    assert get_server_info("backend", "8000", b"HTTP/1.1") is info
+
+
+@mark.parametrize(
+    "changes",
+    [
+        {},
+        {"HTTP_HOST": None},
+        {"HTTP_HOST": None, "wsgi.url_scheme": "http", "SERVER_PORT": "80"},
+        {"HTTP_HOST": None, "SERVER_PORT": "443"},
+        {"SCRIPT_NAME": "", "PATH_INFO": "/with space/ü"},
+        {"SCRIPT_NAME": "/a b", "QUERY_STRING": ""},
+    ],
+)
+def test_uris_are_same_as_wsgiref_uris(wsgi_environ, changes):
+    wsgi_environ.update(changes)
+    wsgi_environ = {k: v for k, v in wsgi_environ.items() if v is not None}
+    assert get_application_uri(wsgi_environ) == util.application_uri(
+        wsgi_environ
+    )
+    assert get_request_uri(wsgi_environ) == util.request_uri(wsgi_environ)
+
+
+def test_get_request_info_with_lazy_uri(wsgi_environ):
+    info = get_request_info(wsgi_environ, lazy_uri=True)
+    assert isinstance(info["request_uri"], LazyValue)
+    assert isinstance(info["request_application_uri"], LazyValue)
+    assert not info["request_uri"].resolved
+    assert info["request_uri"].resolve() == (
+        "https://example.io/foo/bar/baz?dummy=1"
+    )
+    assert info["request_application_uri"].resolve() == "https://example.io/foo"
+
+
+def test_lazy_uri_is_not_affected_by_later_environ_changes(wsgi_environ):
+    info = get_request_info(wsgi_environ, lazy_uri=True)
+    wsgi_environ.update(
+        {
+            "HTTP_HOST": "other.io",
+            "SCRIPT_NAME": "/foo/bar",
+            "PATH_INFO": "/baz",
+            "QUERY_STRING": "",
+        }
+    )
+    assert info["request_uri"].resolve() == (
+        "https://example.io/foo/bar/baz?dummy=1"
+    )
+    assert info["request_application_uri"].resolve() == "https://example.io/foo"